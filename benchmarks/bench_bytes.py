@@ -0,0 +1,84 @@
+"""Per-page cost of parsing response bytes vs a decoded ``response.text`` copy.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_bytes
+"""
+
+import timeit
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from src.grades import _parse_grade_table_lxml  # type: ignore[reportMissingImports]
+from src.html_backend import parse_document  # type: ignore[reportMissingImports]
+
+ROWS = 3000
+
+
+def build_grade_page(rows: int = ROWS) -> bytes:
+    body = "".join(
+        "<tr>"
+        f"<td>{index + 1}</td><td>2024-2025-{index % 2 + 1}</td>"
+        f"<td>KC{index:05d}</td><td>课程名称{index}（含实验）</td>"
+        f"<td>{60 + index % 40}</td><td>{1 + index % 4}</td>"
+        f"<td>{(index % 40) / 10:.1f}</td><td>考试</td><td>必修</td>"
+        "</tr>"
+        for index in range(rows)
+    )
+    html = (
+        '<html><head><meta charset="utf-8"></head><body><table id="dataList">'
+        "<tr><th>序号</th><th>学年学期</th><th>课程编号</th><th>课程名称</th>"
+        "<th>成绩</th><th>学分</th><th>绩点</th><th>考核方式</th><th>课程属性</th></tr>"
+        f"{body}</table></body></html>"
+    )
+    return html.encode("utf-8")
+
+
+def parse_text(content: bytes) -> Any:
+    """What fetchers did before: decode to ``response.text`` then parse."""
+    text = content.decode("utf-8")
+    return _parse_grade_table_lxml(text, None, None)
+
+
+def parse_bytes(content: bytes) -> Any:
+    return _parse_grade_table_lxml(content, None, None)
+
+
+def document_from_text(content: bytes) -> Any:
+    return parse_document(content.decode("utf-8"))
+
+
+def document_from_bytes(content: bytes) -> Any:
+    return parse_document(content)
+
+
+def measure_peak(parse: Callable[[bytes], Any], content: bytes) -> Tuple[int, Any]:
+    tracemalloc.start()
+    try:
+        result = parse(content)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, result
+
+
+def main(number: int = 10) -> None:
+    content = build_grade_page()
+    assert parse_bytes(content) == parse_text(content)
+
+    print(f"grade page: {len(content) / 1024:.0f} KiB, {ROWS} rows, {number} runs")
+    for label, parse, build in (
+        ("response.text", parse_text, document_from_text),
+        ("raw bytes", parse_bytes, document_from_bytes),
+    ):
+        elapsed = min(timeit.repeat(lambda: parse(content), number=number, repeat=3))
+        tree = min(timeit.repeat(lambda: build(content), number=number, repeat=3))
+        peak, _result = measure_peak(parse, content)
+        print(
+            f"{label:14s} {elapsed / number * 1000:8.2f} ms/page  "
+            f"(tree {tree / number * 1000:6.2f} ms)  peak {peak / 1024:6.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Cohort free slots: per-slot scans over ScheduleIndex vs CohortSchedule bitsets.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_free_slots
+"""
+
+import random
+import time
+from typing import Dict, List
+
+from src.free_slots import CohortSchedule  # type: ignore[reportMissingImports]
+from src.models import Course  # type: ignore[reportMissingImports]
+from src.schedule_index import ScheduleIndex  # type: ignore[reportMissingImports]
+
+WEEKS = 20
+SECTIONS = 12
+
+
+def build_schedules(students: int) -> Dict[str, List[Course]]:
+    rng = random.Random(42)
+    schedules = {}
+    for student in range(students):
+        courses = []
+        for index in range(12):
+            first = rng.randrange(1, SECTIONS, 2)
+            start = rng.randint(1, 4)
+            courses.append(
+                Course(
+                    f"课程{index}",
+                    day=str(rng.randint(1, 5)),
+                    sections=[f"{first}-{first + 1}"],
+                    weeks=[f"{start}-{start + 11}"],
+                )
+            )
+        schedules[f"s{student:04d}"] = courses
+    return schedules
+
+
+def scan_least_conflict(indexes: List[ScheduleIndex], limit: int):
+    counts = []
+    for week in range(1, WEEKS + 1):
+        for day in range(1, 8):
+            for section in range(1, SECTIONS + 1):
+                busy = sum(index.is_busy(week, day, section) for index in indexes)
+                counts.append((busy, week, day, section))
+    counts.sort()
+    return counts[:limit]
+
+
+def main() -> None:
+    for students in (200, 1000, 2000):
+        schedules = build_schedules(students)
+
+        started = time.perf_counter()
+        indexes = [
+            ScheduleIndex(courses, weeks=WEEKS) for courses in schedules.values()
+        ]
+        scan = scan_least_conflict(indexes, 10)
+        scan_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        cohort = CohortSchedule(schedules, weeks=WEEKS, sections=SECTIONS)
+        ranked = cohort.least_conflict(limit=10)
+        cohort.free_slots()
+        bitset_time = time.perf_counter() - started
+
+        assert [slot.busy for slot in ranked] == [row[0] for row in scan]
+        print(
+            f"{students:5d} students  per-slot scan {scan_time * 1000:8.1f} ms"
+            f"  bitsets {bitset_time * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
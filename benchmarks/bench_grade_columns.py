@@ -0,0 +1,157 @@
+"""Grade row extraction benchmark: per-row dict probing vs compiled columns.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_grade_columns
+"""
+
+import timeit
+from typing import Any, Dict, List, Optional
+
+from src.grades import (  # type: ignore[reportMissingImports]
+    _COURSE_NAME_KEYS,
+    _GradeColumns,
+    _extract_detail_url,
+    _normalize_term,
+    _split_year_term,
+    _to_float,
+)
+from src.models import Grade  # type: ignore[reportMissingImports]
+
+ROWS = 5000
+HEADERS = [
+    "序号",
+    "开课学期",
+    "课程编号",
+    "课程名称",
+    "分组名",
+    "成绩",
+    "成绩标识",
+    "学分",
+    "总学时",
+    "绩点",
+    "补重学期",
+    "考核方式",
+    "考试性质",
+    "课程属性",
+    "课程性质",
+]
+
+
+def _legacy_pick_value(row: Dict[str, str], keys: List[str]) -> Optional[str]:
+    for key in keys:
+        value = row.get(key)
+        if value:
+            return value
+    return None
+
+
+def legacy_build_grade(
+    headers: List[str],
+    values: List[str],
+    hrefs: List[str],
+    fallback_year: Any,
+    fallback_term: Any,
+) -> Optional[Grade]:
+    """Pre-compilation extractor: full row dict plus alias probing per row."""
+    row_dict: Dict[str, str] = {}
+    for index, value in enumerate(values):
+        key = (
+            headers[index]
+            if index < len(headers) and headers[index]
+            else f"col_{index + 1}"
+        )
+        row_dict[key] = value
+
+    detail_url = None
+    for href in hrefs:
+        detail_url = _extract_detail_url(href)
+        if detail_url:
+            break
+    if detail_url:
+        row_dict["detail_url"] = detail_url
+
+    course_name = _legacy_pick_value(row_dict, _COURSE_NAME_KEYS)
+    if not course_name:
+        return None
+
+    score = _legacy_pick_value(row_dict, ["成绩", "总评成绩", "最终成绩", "总成绩"])
+    credits = _to_float(_legacy_pick_value(row_dict, ["学分", "课程学分", "学分数"]))
+    grade_point = _to_float(
+        _legacy_pick_value(row_dict, ["绩点", "成绩绩点", "绩点值"])
+    )
+    year = _legacy_pick_value(row_dict, ["学年"])
+    term_value = _legacy_pick_value(row_dict, ["学期"])
+
+    year_term = _legacy_pick_value(row_dict, ["学年学期", "学年/学期"])
+    if year_term:
+        parsed_year, parsed_term = _split_year_term(year_term)
+        year = year or parsed_year
+        term_value = term_value or parsed_term
+
+    if not year and fallback_year is not None:
+        year = str(fallback_year).strip()
+    if not term_value and fallback_term is not None:
+        term_value = _normalize_term(fallback_term)
+
+    return Grade(
+        course_name=course_name,
+        score=score,
+        credits=credits,
+        grade_point=grade_point,
+        year=year,
+        term=term_value,
+        raw=row_dict,
+    )
+
+
+def build_rows(count: int = ROWS) -> List[List[str]]:
+    return [
+        [
+            str(index + 1),
+            f"20{20 + index % 4}-20{21 + index % 4}-{index % 2 + 1}",
+            f"KC{index:05d}",
+            f"课程{index}",
+            "",
+            str(60 + index % 40),
+            "",
+            f"{1 + index % 4}.0",
+            "32",
+            f"{(index % 40) / 10:.1f}",
+            "",
+            "考试",
+            "正常考试",
+            "必修",
+            "专业课",
+        ]
+        for index in range(count)
+    ]
+
+
+def run_legacy(rows: List[List[str]]) -> List[Optional[Grade]]:
+    return [legacy_build_grade(HEADERS, values, [], None, None) for values in rows]
+
+
+def run_compiled(rows: List[List[str]]) -> List[Optional[Grade]]:
+    columns = _GradeColumns(HEADERS)
+    return [columns.build(values, [], None, None) for values in rows]
+
+
+def main(number: int = 5) -> None:
+    rows = build_rows()
+    assert run_compiled(rows) == run_legacy(rows)
+
+    print(f"{len(rows)} rows x {len(HEADERS)} columns, {number} runs")
+    baseline = None
+    for label, run in (
+        ("per-row dict + alias probing", run_legacy),
+        ("compiled column indexes", run_compiled),
+    ):
+        elapsed = min(timeit.repeat(lambda: run(rows), number=number, repeat=3))
+        per_row = elapsed / number / len(rows) * 1e6
+        baseline = baseline or per_row
+        print(f"{label:30s} {per_row:7.2f} us/row  x{baseline / per_row:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
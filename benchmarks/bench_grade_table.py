@@ -0,0 +1,90 @@
+"""Cohort aggregates: Python loops over List[Grade] vs GradeTable.
+
+Run from the repository root (needs the ``analysis`` extra)::
+
+    python -m benchmarks.bench_grade_table
+"""
+
+import timeit
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from src.grade_table import GradeTable  # type: ignore[reportMissingImports]
+from src.models import Grade  # type: ignore[reportMissingImports]
+
+STUDENTS = 300
+GRADES_PER_STUDENT = 60
+
+
+def build_cohort() -> Dict[str, List[Grade]]:
+    cohort = {}
+    for student in range(STUDENTS):
+        grades = []
+        for index in range(GRADES_PER_STUDENT):
+            score = 45 + (student * 7 + index * 13) % 55
+            grades.append(
+                Grade(
+                    course_name=f"课程{index}",
+                    score=str(score),
+                    credits=float(1 + index % 4),
+                    grade_point=max(0.0, (score - 50) / 10),
+                    year=f"{2021 + index // 16}-{2022 + index // 16}",
+                    term=str(1 + (index // 8) % 2),
+                )
+            )
+        cohort[f"s{student:04d}"] = grades
+    return cohort
+
+
+def loop_aggregates(cohort: Dict[str, List[Grade]]):
+    by_student: Dict[str, Optional[float]] = {}
+    term_points: Dict[str, float] = defaultdict(float)
+    term_credits: Dict[str, float] = defaultdict(float)
+    failed = 0
+    for student, grades in cohort.items():
+        points = credits = 0.0
+        for grade in grades:
+            if grade.credits is None or grade.grade_point is None:
+                continue
+            points += float(grade.credits) * float(grade.grade_point)
+            credits += float(grade.credits)
+            label = f"{grade.year}-{grade.term}"
+            term_points[label] += float(grade.credits) * float(grade.grade_point)
+            term_credits[label] += float(grade.credits)
+            try:
+                failed += float(grade.score or "") < 60
+            except ValueError:
+                pass
+        by_student[student] = points / credits if credits else None
+    by_term = {label: term_points[label] / term_credits[label] for label in term_points}
+    return by_student, by_term, failed
+
+
+def table_aggregates(table: GradeTable):
+    return (
+        table.gpa_by_student(),
+        table.gpa_by_term(),
+        int(table.failed_mask().sum()),
+    )
+
+
+def main(number: int = 10) -> None:
+    cohort = build_cohort()
+    table = GradeTable.from_cohort(cohort)
+    rows = len(table)
+
+    print(f"{STUDENTS} students x {GRADES_PER_STUDENT} grades = {rows} rows")
+    loop = min(timeit.repeat(lambda: loop_aggregates(cohort), number=number, repeat=3))
+    build = min(
+        timeit.repeat(lambda: GradeTable.from_cohort(cohort), number=number, repeat=3)
+    )
+    vector = min(
+        timeit.repeat(lambda: table_aggregates(table), number=number, repeat=3)
+    )
+    print(f"python loops           {loop / number * 1000:8.2f} ms")
+    print(f"GradeTable build       {build / number * 1000:8.2f} ms")
+    print(f"GradeTable aggregates  {vector / number * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
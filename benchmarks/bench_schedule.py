@@ -0,0 +1,107 @@
+"""Schedule parser benchmark on a dense 7x6 timetable.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_schedule
+"""
+
+import re
+import timeit
+from typing import List
+
+from bs4 import BeautifulSoup
+
+from src.schedule import (  # type: ignore[reportMissingImports]
+    _parse_course_lines,
+    _parse_schedule_html_bs4,
+    _parse_schedule_html_lxml,
+)
+
+DAYS = 7
+SLOTS = 6
+ENTRIES_PER_CELL = 3
+
+
+def build_dense_schedule(
+    days: int = DAYS, slots: int = SLOTS, entries: int = ENTRIES_PER_CELL
+) -> str:
+    rows = []
+    for slot in range(1, slots + 1):
+        cells = []
+        for day in range(1, days + 1):
+            blocks = []
+            for entry in range(entries):
+                blocks.append(
+                    f"课程{day}-{slot}-{entry}<br/>"
+                    f'<font title="老师">教师{entry}</font><br/>'
+                    f'<font title="周次(节次)">{entry + 1}-16(周)'
+                    f"[{slot * 2 - 1:02d}-{slot * 2:02d}节]</font><br/>"
+                    f'<font title="教室">教{day}{slot}{entry}</font><br/>'
+                )
+            content = "---------------------<br/>".join(blocks)
+            cells.append(
+                f'<td><div class="kbcontent1">{content}</div>'
+                f'<div class="kbcontent">{content}</div></td>'
+            )
+        rows.append(f"<tr><th>第{slot}大节</th>{''.join(cells)}</tr>")
+    header = "".join(f"<th>星期{day}</th>" for day in range(1, days + 1))
+    return (
+        "<html><body><table>"
+        f"<tr><th></th>{header}</tr>{''.join(rows)}"
+        "</table></body></html>"
+    )
+
+
+def _legacy_parse_cell_entries(cell_html: str) -> List[List[str]]:
+    entries = []
+    for part in re.split(r"-{5,}", cell_html):
+        text = BeautifulSoup(part, "lxml").get_text("\n")
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        lines = [line.replace("\xa0", " ").strip() for line in lines if line]
+        if lines:
+            entries.append(lines)
+    return entries
+
+
+def legacy_parse_schedule_html(html: str):
+    """Pre-single-pass parser: one extra BeautifulSoup per cell fragment."""
+    soup = BeautifulSoup(html, "lxml")
+    courses = []
+    for row in soup.find_all("tr"):
+        if not row.find("th"):
+            continue
+        for day_index, cell in enumerate(row.find_all("td"), start=1):
+            content = cell.find("div", class_="kbcontent")
+            if not content:
+                continue
+            for lines in _legacy_parse_cell_entries(content.decode_contents()):
+                course = _parse_course_lines(lines, day_index)
+                if course:
+                    courses.append(course)
+    return courses
+
+
+def main(number: int = 20) -> None:
+    html = build_dense_schedule()
+    expected = legacy_parse_schedule_html(html)
+    assert _parse_schedule_html_bs4(html) == expected
+    assert _parse_schedule_html_lxml(html) == expected
+
+    print(
+        f"{DAYS}x{SLOTS} grid, {ENTRIES_PER_CELL} entries per cell, "
+        f"{len(expected)} courses, {number} runs"
+    )
+    baseline = None
+    for label, parse in (
+        ("legacy bs4 (per-fragment soup)", legacy_parse_schedule_html),
+        ("single-pass bs4", _parse_schedule_html_bs4),
+        ("single-pass lxml", _parse_schedule_html_lxml),
+    ):
+        elapsed = min(timeit.repeat(lambda: parse(html), number=number, repeat=3))
+        per_call = elapsed / number * 1000
+        baseline = baseline or per_call
+        print(f"{label:32s} {per_call:8.2f} ms/page  x{baseline / per_call:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
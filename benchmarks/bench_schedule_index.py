@@ -0,0 +1,82 @@
+"""Slot lookups: re-parsing Course ranges per query vs ScheduleIndex.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_schedule_index
+"""
+
+import timeit
+from typing import List
+
+from src.models import Course  # type: ignore[reportMissingImports]
+from src.schedule_index import ScheduleIndex  # type: ignore[reportMissingImports]
+
+WEEKS = 20
+SECTIONS = 12
+
+
+def build_courses() -> List[Course]:
+    courses = []
+    for index in range(40):
+        first = 1 + (index * 2) % SECTIONS
+        courses.append(
+            Course(
+                name=f"课程{index}",
+                day=str(1 + index % 7),
+                sections=[f"{first}-{min(first + 1, SECTIONS)}"],
+                weeks=["1-8", "10-16"] if index % 3 else [f"{1 + index % 4}-18"],
+            )
+        )
+    return courses
+
+
+def _in_ranges(tokens: List[str], value: int) -> bool:
+    for token in tokens:
+        start, _, end = token.partition("-")
+        if int(start) <= value <= int(end or start):
+            return True
+    return False
+
+
+def legacy_at(courses: List[Course], week: int, day: int, section: int):
+    return [
+        course
+        for course in courses
+        if course.day == str(day)
+        and _in_ranges(course.weeks, week)
+        and _in_ranges(course.sections, section)
+    ]
+
+
+def all_slots(lookup) -> int:
+    found = 0
+    for week in range(1, WEEKS + 1):
+        for day in range(1, 8):
+            for section in range(1, SECTIONS + 1):
+                found += len(lookup(week, day, section))
+    return found
+
+
+def main(number: int = 5) -> None:
+    courses = build_courses()
+    index = ScheduleIndex(courses)
+    assert all_slots(lambda *slot: legacy_at(courses, *slot)) == all_slots(index.at)
+
+    queries = WEEKS * 7 * SECTIONS
+    legacy = min(
+        timeit.repeat(
+            lambda: all_slots(lambda *slot: legacy_at(courses, *slot)),
+            number=number,
+            repeat=3,
+        )
+    )
+    indexed = min(timeit.repeat(lambda: all_slots(index.at), number=number, repeat=3))
+    build = min(timeit.repeat(lambda: ScheduleIndex(courses), number=number, repeat=3))
+    print(f"{len(courses)} courses, {queries} slot queries")
+    print(f"re-parse and scan  {legacy / number * 1000:8.2f} ms")
+    print(f"ScheduleIndex.at   {indexed / number * 1000:8.2f} ms")
+    print(f"index build        {build / number * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from src.client import (  # type: ignore[reportMissingImports]
+    _ClientBase,
+    _build_login_form,
+    _encrypt_password,
+    _extract_js_redirect,
+    _extract_login_params,
+    _is_expired_response,
+    _is_login_page,
+    random_user_agent,
+)
+from src.singleflight import AsyncSingleFlight  # type: ignore[reportMissingImports]
+
+
+class AsyncGSAUClient(_ClientBase):
+    """asyncio counterpart of GSAUClient backed by httpx.AsyncClient.
+
+    The saved session is restored lazily on the first request, so the
+    constructor never performs network I/O.
+    """
+
+    def __init__(
+        self, username=None, password=None, prompt=True, timeout=30, session_file=None
+    ):
+        self._prompt = prompt
+        self._timeout = timeout
+        self._username = username
+        self._password = password
+        self._session_file = Path(session_file) if session_file else None
+        self._saved_at = None
+        self._session_ttl = self.DEFAULT_SESSION_TTL
+        self._logged_in = False
+        self._restore_attempted = False
+        self._login_generation = 0
+        self._cache_account = None
+        self.flights = AsyncSingleFlight()
+        self._login_lock = asyncio.Lock()
+        self.session = httpx.AsyncClient(
+            headers={"User-Agent": random_user_agent()},
+            timeout=timeout,
+            trust_env=False,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    def _cookie_jar(self):
+        return self.session.cookies.jar
+
+    def _set_cookie(self, name, value):
+        self.session.cookies.set(name, value)
+
+    async def _validate_session(self):
+        try:
+            response = await self.session.get(
+                self.AUTH_TEST_URL, follow_redirects=False
+            )
+            if response.status_code == 302:
+                location = response.headers.get("Location", "")
+                return "authserver" not in location
+            if response.status_code == 200:
+                return "pwdLoginDiv" not in response.text
+            return False
+        except httpx.HTTPError:
+            return False
+
+    async def _try_restore_session(self):
+        self._restore_attempted = True
+        if not self._load_session():
+            return False
+        if self._session_is_fresh():
+            self._logged_in = True
+            return True
+        if await self._validate_session():
+            self._learn_session_ttl(valid=True)
+            self._logged_in = True
+            self._save_session()
+            return True
+        self.session.cookies.clear()
+        return False
+
+    async def _follow_js_redirects(self, response, max_steps=5):
+        current = response
+        steps = 0
+        while True:
+            js_url = _extract_js_redirect(current.text)
+            if not js_url:
+                break
+            steps += 1
+            if steps > max_steps:
+                break
+            current = await self.session.get(js_url, follow_redirects=True)
+            current.encoding = "utf-8"
+        return current
+
+    async def login(self):
+        username, password = self._resolve_credentials()
+        if not username or not password:
+            self._logged_in = False
+            return False
+
+        store = self._session_store()
+        await asyncio.to_thread(store.acquire)
+        try:
+            if self._adopt_concurrent_login(store):
+                self._logged_in = True
+                self._login_generation += 1
+                return True
+            return await self._cas_login(username, password)
+        finally:
+            store.release()
+
+    async def _cas_login(self, username, password):
+        entry_response = await self.session.get(
+            self.LOGIN_ENTRY_URL, follow_redirects=True
+        )
+        entry_response.encoding = "utf-8"
+        salt, execution = _extract_login_params(entry_response.text)
+        if not execution:
+            self._logged_in = False
+            return False
+
+        encrypted_password = _encrypt_password(password, salt)
+        form_data = _build_login_form(username, encrypted_password, execution)
+        login_response = await self.session.post(
+            self.LOGIN_POST_URL, data=form_data, follow_redirects=True
+        )
+        login_response.encoding = "utf-8"
+        final_response = await self._follow_js_redirects(login_response)
+        if _is_login_page(final_response.url, final_response.text):
+            self._logged_in = False
+            return False
+
+        test_response = await self.session.get(
+            self.AUTH_TEST_URL, follow_redirects=True
+        )
+        test_response.encoding = "utf-8"
+        if _is_login_page(test_response.url, test_response.text):
+            self._logged_in = False
+            return False
+
+        self._logged_in = True
+        self._login_generation += 1
+        self._username = username
+        self._password = password
+        self._save_session()
+        return True
+
+    async def ensure_login(self):
+        if self._logged_in:
+            return True
+        async with self._login_lock:
+            if self._logged_in:
+                return True
+            if not self._restore_attempted and await self._try_restore_session():
+                return True
+            return await self.login()
+
+    async def _relogin(self, generation):
+        async with self._login_lock:
+            if self._login_generation != generation and self._logged_in:
+                return True
+            self._learn_session_ttl(valid=False)
+            self.session.cookies.clear()
+            self._logged_in = False
+            return await self.login()
+
+    def _request_kwargs(self, kwargs):
+        follow = kwargs.pop("allow_redirects", True)
+        kwargs.setdefault("follow_redirects", follow)
+        return kwargs
+
+    async def _request(self, method, url, **kwargs):
+        if not await self.ensure_login():
+            raise RuntimeError("Login failed")
+        kwargs = self._request_kwargs(kwargs)
+        generation = self._login_generation
+        response = await self.session.request(method, url, **kwargs)
+        if not _is_expired_response(response):
+            return response
+        if not await self._relogin(generation):
+            raise RuntimeError("Login failed")
+        return await self.session.request(method, url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self._request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self._request("POST", url, **kwargs)
@@ -0,0 +1,266 @@
+"""Persistent on-disk HTTP response cache."""
+
+from datetime import date
+import hashlib
+import json
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from requests.structures import CaseInsensitiveDict
+
+from src.local_files import (  # type: ignore[reportMissingImports]
+    _config_file_path,
+    _connect_sqlite,
+)
+
+DEFAULT_CACHE_FILE = Path.home() / ".gsau_cache.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_SKIPPED_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "set-cookie",
+    "transfer-encoding",
+}
+DEFAULT_TTLS: Dict[str, int] = {
+    "/jsxsd/xskb/xskb_list.do": 6 * 60 * 60,
+    "/jsxsd/kscj/cjcx_list": 15 * 60,
+    "/jsxsd/kxzm/kxzm_manage": 7 * 24 * 60 * 60,
+}
+# Paths whose responses keep changing until the term named by this form field
+# is over; they are cached only for past terms.
+DEFAULT_TERM_FIELDS: Dict[str, str] = {"/jsxsd/kscj/cjcx_list": "kksj"}
+_TERM_ID = re.compile(r"^(\d{4})-\d{4}-([12])$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def _canonical_items(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, Mapping):
+        return sorted((str(key), str(item)) for key, item in value.items())
+    if isinstance(value, (bytes, bytearray)):
+        return hashlib.sha256(bytes(value)).hexdigest()
+    if isinstance(value, str):
+        return value
+    return sorted((str(key), str(item)) for key, item in value)
+
+
+def cache_key(
+    method: str, url: str, data: Any = None, params: Any = None, account: str = ""
+) -> str:
+    payload = json.dumps(
+        [
+            method.upper(),
+            url,
+            _canonical_items(params),
+            _canonical_items(data),
+            account,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def current_term(today: Optional[date] = None) -> Tuple[int, int]:
+    """(first year of the academic year, term) in progress on ``today``.
+
+    Term 1 runs from September to January, term 2 from February to August.
+    """
+    today = today or date.today()
+    if today.month >= 9:
+        return today.year, 1
+    if today.month == 1:
+        return today.year - 1, 1
+    return today.year - 1, 2
+
+
+def is_past_term(term_id: Any, today: Optional[date] = None) -> bool:
+    """Whether ``term_id`` like ``2023-2024-1`` ended before the current term."""
+    match = _TERM_ID.match(str(term_id or "").strip())
+    if not match:
+        return False
+    return (int(match.group(1)), int(match.group(2))) < current_term(today)
+
+
+def _charset_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+    content_type = CaseInsensitiveDict(headers).get("Content-Type") or ""
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            return value.strip().strip('"')
+    return None
+
+
+class CachedResponse:
+    """Minimal stand-in for ``requests.Response`` replayed from the cache."""
+
+    from_cache = True
+
+    def __init__(
+        self, url: str, status_code: int, headers: Dict[str, str], content: bytes
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding: Optional[str] = _charset_from_headers(headers)
+        self.history: list = []
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size or len(self.content)):
+            yield self.content[start : start + chunk_size]
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+def default_cache_path() -> Path:
+    return _config_file_path("cache", "GSAU_CACHE_FILE", DEFAULT_CACHE_FILE)
+
+
+class ResponseCache:
+    """SQLite-backed cache of successful responses with per-endpoint TTLs.
+
+    Only URLs whose path has a TTL in ``ttls`` are cached; paths listed in
+    ``term_fields`` are cached only when that form field names a past term,
+    so grades of the current term or of all terms are always fetched fresh.
+    Entries beyond
+    ``max_bytes`` are evicted least-recently-used first. Setting ``bypass``
+    skips lookups while still refreshing stored entries.
+    """
+
+    def __init__(
+        self,
+        path: Any = None,
+        ttls: Optional[Mapping[str, int]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        bypass: bool = False,
+        term_fields: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.path = Path(path) if path else default_cache_path()
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.term_fields = dict(
+            DEFAULT_TERM_FIELDS if term_fields is None else term_fields
+        )
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self._lock = threading.Lock()
+        self._conn = _connect_sqlite(self.path, _SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def ttl_for(self, url: str, data: Any = None) -> Optional[int]:
+        path = urlparse(url).path
+        ttl = self.ttls.get(path)
+        if ttl is None or ttl <= 0:
+            return None
+        field = self.term_fields.get(path)
+        if field is not None:
+            term_id = data.get(field) if isinstance(data, Mapping) else None
+            if not is_past_term(term_id):
+                return None
+        return ttl
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        if self.bypass:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            url, status, headers, body, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return CachedResponse(url, status, json.loads(headers), bytes(body))
+
+    def set(self, key: str, response: Any, ttl: int) -> None:
+        body = bytes(response.content or b"")
+        if len(body) > self.max_bytes:
+            return
+        headers = {
+            str(name): str(value)
+            for name, value in response.headers.items()
+            if str(name).lower() not in _SKIPPED_HEADERS
+        }
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status, headers, body, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    str(response.url),
+                    int(response.status_code),
+                    json.dumps(headers),
+                    body,
+                    len(body),
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        now = time.time()
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        victims = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
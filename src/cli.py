@@ -1,10 +1,19 @@
 import argparse
-from typing import Any, Callable
+from dataclasses import asdict
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List
 
+from src.cache import ResponseCache
 from src.client import GSAUClient
-from src.grades import get_grade_detail, get_grades
+from src.course_index import CourseIndex
+from src.free_slots import CohortSchedule, parse_number_ranges
+from src.grades import get_grade_detail, get_grade_details, get_grades
+from src.models import Course
+from src.pool import SessionPool
 from src.proofs import download_proof, get_proof_history, get_proof_templates
-from src.schedule import get_schedule, get_terms
+from src.schedule import get_all_schedules, get_schedule, get_schedule_page
+from src.store import LocalStore
 from src.utils import print_table, to_csv, to_json
 
 
@@ -24,7 +33,7 @@ def _write_output(text: str, output_path: str | None) -> None:
     print(text)
 
 
-def _add_common_options(parser: argparse.ArgumentParser) -> None:
+def _add_common_options(parser: argparse.ArgumentParser, no_cache: bool = True) -> None:
     parser.add_argument("--year", help="Academic year, e.g. 2024")
     parser.add_argument("--term", help="Term, e.g. 1 or 2")
     parser.add_argument(
@@ -34,6 +43,42 @@ def _add_common_options(parser: argparse.ArgumentParser) -> None:
         help="Output format",
     )
     parser.add_argument("--output", help="Write output to file")
+    _add_cache_option(parser, no_cache)
+
+
+def _add_cache_option(parser: argparse.ArgumentParser, no_cache: bool = True) -> None:
+    if no_cache:
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Ignore cached responses and fetch fresh data",
+        )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Answer from the local store without contacting the server",
+    )
+
+
+def _build_client(args: argparse.Namespace) -> GSAUClient:
+    if getattr(args, "offline", False):
+        return GSAUClient()
+    cache = ResponseCache(bypass=bool(getattr(args, "no_cache", False)))
+    return GSAUClient(cache=cache)
+
+
+def _account(client: GSAUClient) -> str:
+    return str(client._account_key())
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value!r}")
+    return number
 
 
 def _require_value(value: Any, label: str) -> None:
@@ -41,41 +86,121 @@ def _require_value(value: Any, label: str) -> None:
         raise ValueError(f"{label} is required")
 
 
+def _term_rows(schedules: Dict[Any, List[Course]]) -> List[Dict[str, Any]]:
+    return [
+        {"year": term.year, "term": term.term, **asdict(course)}
+        for term, courses in schedules.items()
+        for course in courses
+    ]
+
+
+def _handle_all_schedules(args: argparse.Namespace) -> str:
+    client = _build_client(args)
+    store = LocalStore()
+    account = _account(client)
+    if args.offline:
+        schedules = {
+            term: store.schedule(account, term.year, term.term)
+            for term in store.terms(account)
+        }
+    else:
+        schedules = get_all_schedules(client, max_workers=args.max_workers)
+        store.save_terms(account, list(schedules))
+        for term, courses in schedules.items():
+            store.save_schedule(account, term.year, term.term, courses)
+    return _format_output(_term_rows(schedules), args.format)
+
+
+def _handle_current_schedule(args: argparse.Namespace) -> str:
+    client = _build_client(args)
+    store = LocalStore()
+    account = _account(client)
+    page = get_schedule_page(client)
+    if page.current is None:
+        raise ValueError("无法确定当前学期，请指定 --year/--term")
+    store.save_terms(account, page.terms)
+    store.save_schedule(account, page.current.year, page.current.term, page.courses)
+    return _format_output(page.courses, args.format)
+
+
 def _handle_schedule(args: argparse.Namespace) -> str:
+    if args.all_terms:
+        return _handle_all_schedules(args)
+    if args.year is None and args.term is None and not args.offline:
+        return _handle_current_schedule(args)
     _require_value(args.year, "--year")
     _require_value(args.term, "--term")
-    client = GSAUClient()
-    data = get_schedule(client, args.year, args.term)
+    client = _build_client(args)
+    store = LocalStore()
+    if args.offline:
+        data = store.schedule(_account(client), args.year, args.term)
+    else:
+        data = get_schedule(client, args.year, args.term)
+        store.save_schedule(_account(client), args.year, args.term, data)
     return _format_output(data, args.format)
 
 
 def _handle_grades(args: argparse.Namespace) -> str:
-    client = GSAUClient()
-    data = get_grades(client, year=args.year, term=args.term)
+    client = _build_client(args)
+    store = LocalStore()
+    if args.offline:
+        if args.course_type or args.display:
+            raise ValueError("--course-type/--display are not available with --offline")
+        data = store.grades(
+            _account(client), args.year, args.term, course_name=args.course_name
+        )
+        return _format_output(data, args.format)
+
+    data = get_grades(
+        client,
+        year=args.year,
+        term=args.term,
+        course_type=args.course_type,
+        course_name=args.course_name,
+        display=args.display,
+    )
+    filtered = bool(args.course_type or args.course_name or args.display)
+    store.save_grades(
+        _account(client), data, args.year, args.term, replace=not filtered
+    )
     return _format_output(data, args.format)
 
 
 def _handle_grade_detail(args: argparse.Namespace) -> str:
-    client = GSAUClient()
+    client = _build_client(args)
     jxb_id = args.jxb_id
     course_name = args.course_name
     student_id = args.student_id
     student_name = args.student_name
+    store = LocalStore()
+    account = _account(client)
+
+    if args.offline:
+        return _format_output(_stored_grade_details(args, store, account), args.format)
+
+    if args.all_courses:
+        _require_value(args.year, "--year")
+        _require_value(args.term, "--term")
+        details = get_grade_details(client, args.year, args.term)
+        for detail in details.values():
+            store.save_grade_detail(account, args.year, args.term, detail)
+        return _format_output(list(details.values()), args.format)
 
     if not jxb_id:
         _require_value(args.course_name, "--course-name")
         _require_value(args.year, "--year")
         _require_value(args.term, "--term")
         grades = get_grades(client, year=args.year, term=args.term)
-        normalized_target = str(args.course_name).strip().lower()
-        matched = None
-        for grade in grades:
-            current = str(grade.course_name).strip().lower()
-            if current == normalized_target or normalized_target in current:
-                matched = grade
-                break
+        index = CourseIndex(grades)
+        matched = index.match(args.course_name)
         if not matched:
-            raise ValueError("未在该学期成绩中找到匹配课程，请检查 --course-name")
+            similar = [
+                grade.course_name for grade in index.candidates(args.course_name)
+            ]
+            hint = f"（相近课程：{'、'.join(similar[:5])}）" if similar else ""
+            raise ValueError(
+                f"未在该学期成绩中找到匹配课程，请检查 --course-name{hint}"
+            )
         jxb_id = matched.raw.get("detail_url")
         if not jxb_id:
             raise ValueError("匹配到课程但缺少详情链接，无法获取成绩详情")
@@ -93,24 +218,61 @@ def _handle_grade_detail(args: argparse.Namespace) -> str:
         student_id=student_id or "",
         student_name=student_name or "",
     )
+    store.save_grade_detail(account, args.year, args.term, data)
     return _format_output(data, args.format)
 
 
+def _stored_grade_details(
+    args: argparse.Namespace, store: LocalStore, account: str
+) -> Any:
+    if args.all_courses:
+        return store.grade_details(account, args.year, args.term)
+    _require_value(args.course_name, "--course-name")
+    matched = CourseIndex(store.grades(account, args.year, args.term)).match(
+        args.course_name
+    )
+    course_name = matched.course_name if matched else args.course_name
+    details = store.grade_details(account, args.year, args.term, course_name)
+    if not details:
+        raise ValueError("本地数据中没有该课程的成绩详情，请先在线查询一次")
+    return details[0]
+
+
 def _handle_terms(args: argparse.Namespace) -> str:
-    client = GSAUClient()
-    data = get_terms(client)
+    client = _build_client(args)
+    store = LocalStore()
+    if args.offline:
+        data = store.terms(_account(client))
+    else:
+        page = get_schedule_page(client)
+        data = page.terms
+        store.save_terms(_account(client), data)
+        if page.current is not None:
+            store.save_schedule(
+                _account(client), page.current.year, page.current.term, page.courses
+            )
     return _format_output(data, args.format)
 
 
 def _handle_proofs(args: argparse.Namespace) -> str:
-    client = GSAUClient()
-    data = get_proof_templates(client)
+    client = _build_client(args)
+    store = LocalStore()
+    if args.offline:
+        data = store.proof_templates(_account(client))
+    else:
+        data = get_proof_templates(client)
+        store.save_proof_templates(_account(client), data)
     return _format_output(data, args.format)
 
 
 def _handle_proof_history(args: argparse.Namespace) -> str:
-    client = GSAUClient()
-    data = get_proof_history(client)
+    client = _build_client(args)
+    store = LocalStore()
+    if args.offline:
+        data = store.proof_records(_account(client))
+    else:
+        data = get_proof_history(client)
+        store.save_proof_records(_account(client), data)
     return _format_output(data, args.format)
 
 
@@ -118,8 +280,11 @@ def _handle_proof_download(args: argparse.Namespace) -> str:
     if not args.id and not args.name:
         raise ValueError("--id or --name is required")
 
-    client = GSAUClient()
-    records = get_proof_history(client)
+    client = _build_client(args)
+    if args.offline:
+        records = LocalStore().proof_records(_account(client))
+    else:
+        records = get_proof_history(client)
 
     matched = None
     if args.id:
@@ -149,9 +314,65 @@ def _handle_proof_download(args: argparse.Namespace) -> str:
     return saved_path
 
 
+def _load_schedule_file(path: str) -> List[Course]:
+    with open(path, "r", encoding="utf-8") as handle:
+        items = json.load(handle)
+    return [Course(**item) for item in items]
+
+
+def _read_accounts(path: str) -> List[List[str]]:
+    accounts = []
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            username, _, password = line.partition(",")
+            accounts.append([username.strip(), password.strip()])
+    return accounts
+
+
+def _handle_free_slots(args: argparse.Namespace) -> str:
+    schedules: Dict[str, List[Course]] = {}
+    for path in args.schedule_file or []:
+        schedules[Path(path).stem] = _load_schedule_file(path)
+
+    if args.offline and args.accounts:
+        raise ValueError("--offline cannot be combined with --accounts")
+    if args.offline or args.accounts:
+        _require_value(args.year, "--year")
+        _require_value(args.term, "--term")
+    if args.offline:
+        schedules.update(LocalStore().schedules(args.year, args.term))
+    elif args.accounts:
+        store = LocalStore()
+        pool = SessionPool()
+        for username, password in _read_accounts(args.accounts):
+            pool.add_account(username, password)
+        fetched = pool.map(lambda client: get_schedule(client, args.year, args.term))
+        for username, courses in fetched.items():
+            store.save_schedule(username, args.year, args.term, courses)
+        schedules.update(fetched)
+
+    if not schedules:
+        raise ValueError("No schedules: pass --schedule-file, --accounts or --offline")
+
+    weeks = parse_number_ranges(args.weeks)
+    days = parse_number_ranges(args.days)
+    cohort = CohortSchedule(schedules, weeks=max([20] + (weeks or [])))
+    if args.least_conflict:
+        data = cohort.least_conflict(args.limit, weeks, days, args.length)
+    else:
+        data = cohort.free_slots(weeks, days, args.length)
+    return _format_output(data, args.format)
+
+
 def _handle_logout(args: argparse.Namespace) -> str:
     client = GSAUClient(prompt=False)
+    account = _account(client)
     client.clear_session()
+    ResponseCache().clear()
+    LocalStore().clear(account)
     return "Session cleared."
 
 
@@ -161,10 +382,30 @@ def _build_parser() -> argparse.ArgumentParser:
 
     schedule_parser = subparsers.add_parser("schedule", help="Fetch schedule")
     _add_common_options(schedule_parser)
+    schedule_parser.add_argument(
+        "--all-terms",
+        action="store_true",
+        help="Fetch the schedule of every available term concurrently",
+    )
+    schedule_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Concurrent term requests with --all-terms",
+    )
     schedule_parser.set_defaults(handler=_handle_schedule)
 
     grades_parser = subparsers.add_parser("grades", help="Fetch grades")
     _add_common_options(grades_parser)
+    grades_parser.add_argument(
+        "--course-type", help="Server-side course nature filter (kcxz code)"
+    )
+    grades_parser.add_argument(
+        "--course-name", help="Server-side course name filter (kcmc)"
+    )
+    grades_parser.add_argument(
+        "--display", help="Server-side display mode (xsfs), e.g. all or max"
+    )
     grades_parser.set_defaults(handler=_handle_grades)
 
     detail_parser = subparsers.add_parser("grade-detail", help="Fetch grade detail")
@@ -180,6 +421,12 @@ def _build_parser() -> argparse.ArgumentParser:
         "--student-id", help="Student id (required only when --jxb-id is plain id)"
     )
     detail_parser.add_argument("--student-name", help="Student name")
+    detail_parser.add_argument(
+        "--all",
+        dest="all_courses",
+        action="store_true",
+        help="Fetch details of every course in --year/--term with one grade list request",
+    )
     detail_parser.set_defaults(handler=_handle_grade_detail)
 
     terms_parser = subparsers.add_parser("terms", help="List terms")
@@ -190,6 +437,7 @@ def _build_parser() -> argparse.ArgumentParser:
         help="Output format",
     )
     terms_parser.add_argument("--output", help="Write output to file")
+    _add_cache_option(terms_parser)
     terms_parser.set_defaults(handler=_handle_terms)
 
     proofs_parser = subparsers.add_parser(
@@ -202,6 +450,7 @@ def _build_parser() -> argparse.ArgumentParser:
         help="Output format",
     )
     proofs_parser.add_argument("--output", help="Write output to file")
+    _add_cache_option(proofs_parser)
     proofs_parser.set_defaults(handler=_handle_proofs)
 
     history_parser = subparsers.add_parser(
@@ -214,6 +463,7 @@ def _build_parser() -> argparse.ArgumentParser:
         help="Output format",
     )
     history_parser.add_argument("--output", help="Write output to file")
+    _add_cache_option(history_parser)
     history_parser.set_defaults(handler=_handle_proof_history)
 
     download_parser = subparsers.add_parser(
@@ -222,8 +472,41 @@ def _build_parser() -> argparse.ArgumentParser:
     download_parser.add_argument("--id", help="Proof generation id")
     download_parser.add_argument("--name", help="Proof name from history")
     download_parser.add_argument("--output", help="Write downloaded proof to file")
+    download_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Look up the proof record in the local store (the download itself needs the server)",
+    )
     download_parser.set_defaults(handler=_handle_proof_download)
 
+    free_parser = subparsers.add_parser(
+        "free-slots", help="Find common free slots across many students' schedules"
+    )
+    # Pool clients keep their own sessions, so --no-cache would not apply.
+    _add_common_options(free_parser, no_cache=False)
+    free_parser.add_argument(
+        "--schedule-file",
+        action="append",
+        help="JSON from 'gau schedule --format json'; repeatable, named by file stem",
+    )
+    free_parser.add_argument(
+        "--accounts", help="File of 'username,password' lines to fetch schedules for"
+    )
+    free_parser.add_argument("--weeks", help="Weeks to consider, e.g. 1-16")
+    free_parser.add_argument("--days", help="Weekdays to consider, e.g. 1-5")
+    free_parser.add_argument(
+        "--length", type=_positive_int, default=1, help="Consecutive sections needed"
+    )
+    free_parser.add_argument(
+        "--least-conflict",
+        action="store_true",
+        help="List the slots with the fewest busy students instead",
+    )
+    free_parser.add_argument(
+        "--limit", type=int, default=10, help="Slots to list with --least-conflict"
+    )
+    free_parser.set_defaults(handler=_handle_free_slots)
+
     logout_parser = subparsers.add_parser("logout", help="Clear saved session")
     logout_parser.set_defaults(handler=_handle_logout)
 
@@ -1,19 +1,27 @@
 import base64
 import configparser
 import getpass
-import json
 import os
 import random
 import re
-import stat
+import threading
+import time
+from abc import ABC, abstractmethod
 from datetime import datetime
+from http.cookiejar import Cookie
 from pathlib import Path
 
 import requests
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad
 
+from src.cache import cache_key  # type: ignore[reportMissingImports]
+from src.local_files import _config_file_path  # type: ignore[reportMissingImports]
+from src.session_store import SessionStore  # type: ignore[reportMissingImports]
+from src.singleflight import SingleFlight  # type: ignore[reportMissingImports]
+
 AES_CHARS = "ABCDEFGHJKMNPQRSTWXYZabcdefhijkmnprstwxyz2345678"
+SESSION_FORMAT_VERSION = 2
 
 
 def random_user_agent():
@@ -56,8 +64,94 @@ def _extract_login_params(html):
     return salt, execution
 
 
-class GSAUClient:
-    """Core client for GSAU CAS login and requests."""
+def _cookie_to_dict(cookie):
+    return {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "domain_specified": cookie.domain_specified,
+        "path": cookie.path,
+        "path_specified": cookie.path_specified,
+        "expires": cookie.expires,
+        "secure": cookie.secure,
+        "http_only": cookie.has_nonstandard_attr("HttpOnly"),
+        "discard": cookie.discard,
+    }
+
+
+def _cookie_from_dict(data):
+    domain = str(data.get("domain") or "")
+    rest = {"HttpOnly": None} if data.get("http_only") else {}
+    return Cookie(
+        version=0,
+        name=str(data["name"]),
+        value=data.get("value"),
+        port=None,
+        port_specified=False,
+        domain=domain,
+        domain_specified=bool(data.get("domain_specified", bool(domain))),
+        domain_initial_dot=domain.startswith("."),
+        path=str(data.get("path") or "/"),
+        path_specified=bool(data.get("path_specified", True)),
+        secure=bool(data.get("secure", False)),
+        expires=data.get("expires"),
+        discard=bool(data.get("discard", data.get("expires") is None)),
+        comment=None,
+        comment_url=None,
+        rest=rest,
+    )
+
+
+def _parse_saved_at(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _extract_js_redirect(html):
+    match = re.search(r"window\.location\.href='([^']+)'", html)
+    if match:
+        return match.group(1)
+    return None
+
+
+def _build_login_form(username, encrypted_password, execution):
+    return {
+        "username": username,
+        "password": encrypted_password,
+        "captcha": "",
+        "_eventId": "submit",
+        "cllt": "userNameLogin",
+        "dllt": "generalLogin",
+        "lt": "",
+        "execution": execution,
+    }
+
+
+def _is_login_page(url, html):
+    return "authserver" in str(url) or "pwdLoginDiv" in html
+
+
+def _is_expired_response(response, check_body=True):
+    for item in list(response.history) + [response]:
+        if item.status_code in (301, 302, 303, 307, 308):
+            if "authserver" in item.headers.get("Location", ""):
+                return True
+    if "authserver" in str(response.url):
+        return True
+    if not check_body:
+        return False
+    content_type = response.headers.get("Content-Type", "")
+    if content_type and "html" not in content_type:
+        return False
+    return b"pwdLoginDiv" in response.content
+
+
+class _ClientBase(ABC):
+    """Credential and session-file handling shared by the sync and async clients."""
 
     LOGIN_ENTRY_URL = "https://jwgl.gsau.edu.cn/"
     LOGIN_POST_URL = (
@@ -66,104 +160,118 @@ class GSAUClient:
     )
     AUTH_TEST_URL = "https://jwgl.gsau.edu.cn/jsxsd/framework/xsMain.jsp"
     DEFAULT_SESSION_FILE = Path.home() / ".gsau_session"
+    DEFAULT_SESSION_TTL = 30 * 60
+    MIN_SESSION_TTL = 60
 
-    def __init__(self, username=None, password=None, prompt=True, timeout=30):
-        self._prompt = prompt
-        self._timeout = timeout
-        self._username = username
-        self._password = password
-        self._logged_in = False
-        self.session = requests.Session()
-        self.session.trust_env = False
-        self.session.headers.update({"User-Agent": random_user_agent()})
-        self._try_restore_session()
+    @abstractmethod
+    def _cookie_jar(self):
+        """The ``http.cookiejar.CookieJar`` backing the HTTP session."""
 
-    def _session_file_path(self):
-        env_path = os.getenv("GSAU_SESSION_FILE", "")
-        if env_path:
-            return Path(env_path)
+    @abstractmethod
+    def _set_cookie(self, name, value):
+        """Set a cookie on the HTTP session from a legacy name/value pair."""
 
-        config = configparser.ConfigParser()
-        repo_root = Path(__file__).resolve().parents[1]
-        cwd = Path.cwd()
-        candidates = [
-            cwd / "config.ini",
-            repo_root / "config.ini",
-        ]
-        for candidate in candidates:
-            if candidate.exists():
-                config.read(candidate, encoding="utf-8")
-                if config.has_section("session"):
-                    config_path = config.get("session", "file", fallback="").strip()
-                    if config_path:
-                        return Path(config_path).expanduser()
-                break
+    def _session_file_path(self):
+        if self._session_file:
+            return self._session_file
+        return _config_file_path(
+            "session", "GSAU_SESSION_FILE", self.DEFAULT_SESSION_FILE
+        )
 
-        return self.DEFAULT_SESSION_FILE
+    def _session_store(self):
+        return SessionStore(self._session_file_path())
 
     def _save_session(self):
-        session_file = self._session_file_path()
-        cookies_dict = {}
-        for cookie in self.session.cookies:
-            cookies_dict[cookie.name] = cookie.value
+        now = time.time()
+        cookies = [
+            _cookie_to_dict(cookie)
+            for cookie in self._cookie_jar()
+            if not cookie.is_expired(now)
+        ]
 
+        self._saved_at = datetime.now()
         data = {
-            "cookies": cookies_dict,
-            "saved_at": datetime.now().isoformat(),
+            "version": SESSION_FORMAT_VERSION,
+            "cookies": cookies,
+            "saved_at": self._saved_at.isoformat(),
+            "ttl": self._session_ttl,
             "username": self._username[:4] + "***" if self._username else "",
         }
-
-        session_file.parent.mkdir(parents=True, exist_ok=True)
-        session_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
-
-        if os.name != "nt":
-            session_file.chmod(stat.S_IRUSR | stat.S_IWUSR)
+        self._session_store().write(data)
 
     def _load_session(self):
-        session_file = self._session_file_path()
-        if not session_file.exists():
+        data = self._session_store().read()
+        if data is None:
             return False
+        return self._apply_session_data(data)
 
+    def _apply_session_data(self, data):
         try:
-            data = json.loads(session_file.read_text(encoding="utf-8"))
             cookies = data.get("cookies", {})
             if not cookies:
                 return False
 
-            for name, value in cookies.items():
-                self.session.cookies.set(name, value)
+            if isinstance(cookies, dict):
+                for name, value in cookies.items():
+                    self._set_cookie(name, value)
+            else:
+                now = time.time()
+                jar = self._cookie_jar()
+                restored = 0
+                for item in cookies:
+                    cookie = _cookie_from_dict(item)
+                    if cookie.is_expired(now):
+                        continue
+                    jar.set_cookie(cookie)
+                    restored += 1
+                if not restored:
+                    return False
+            self._saved_at = _parse_saved_at(data.get("saved_at"))
+            ttl = data.get("ttl")
+            if isinstance(ttl, (int, float)) and ttl > 0:
+                self._session_ttl = int(ttl)
             return True
-        except (json.JSONDecodeError, KeyError, OSError):
+        except (KeyError, TypeError, AttributeError):
             return False
 
-    def clear_session(self):
-        session_file = self._session_file_path()
-        if session_file.exists():
-            session_file.unlink()
-        self._logged_in = False
-
-    def _validate_session(self):
-        try:
-            response = self.session.get(
-                self.AUTH_TEST_URL, allow_redirects=False, timeout=self._timeout
-            )
-            if response.status_code == 302:
-                location = response.headers.get("Location", "")
-                return "authserver" not in location
-            if response.status_code == 200:
-                return "pwdLoginDiv" not in response.text
+    def _adopt_concurrent_login(self, store):
+        """Reuse cookies that another process saved while we waited for the lock."""
+        data = store.read()
+        if not data:
             return False
-        except requests.RequestException:
+        saved_at = _parse_saved_at(data.get("saved_at"))
+        if saved_at is None:
             return False
-
-    def _try_restore_session(self):
-        if not self._load_session():
+        if self._saved_at is not None and saved_at <= self._saved_at:
             return False
-        if self._validate_session():
-            self._logged_in = True
-            return True
-        self.session.cookies.clear()
-        return False
+        ttl = data.get("ttl") or self._session_ttl
+        if (datetime.now() - saved_at).total_seconds() >= ttl:
+            return False
+        self._cookie_jar().clear()
+        return self._apply_session_data(data)
+
+    def _session_age(self):
+        if self._saved_at is None:
+            return None
+        return (datetime.now() - self._saved_at).total_seconds()
+
+    def _session_is_fresh(self):
+        age = self._session_age()
+        return age is not None and 0 <= age < self._session_ttl
+
+    def _learn_session_ttl(self, valid):
+        """Stretch the TTL when an old session still works, shrink it on expiry."""
+        age = self._session_age()
+        if age is None or age < 0:
+            return
+        if valid and age > self._session_ttl:
+            self._session_ttl = int(age)
+        elif not valid and age < self._session_ttl:
+            self._session_ttl = max(self.MIN_SESSION_TTL, int(age * 0.8))
+
+    def clear_session(self):
+        self._session_store().clear()
+        self._logged_in = False
 
     def _prompt_credentials(self):
         username = ""
@@ -220,17 +328,87 @@ class GSAUClient:
             password = password or prompt_pass
         return username, password
 
+    def _account_key(self):
+        if self._cache_account is None:
+            self._cache_account = (
+                self._username
+                or self._env_credentials()[0]
+                or self._config_credentials()[0]
+                or str(self._session_file_path())
+            )
+        return self._cache_account
+
+
+class GSAUClient(_ClientBase):
+    """Core client for GSAU CAS login and requests."""
+
+    def __init__(
+        self,
+        username=None,
+        password=None,
+        prompt=True,
+        timeout=30,
+        session_file=None,
+        cache=None,
+    ):
+        self._prompt = prompt
+        self._timeout = timeout
+        self._username = username
+        self._password = password
+        self._session_file = Path(session_file) if session_file else None
+        self._saved_at = None
+        self._session_ttl = self.DEFAULT_SESSION_TTL
+        self._logged_in = False
+        self._needs_validation = False
+        self._cache_account = None
+        self.cache = cache
+        self.flights = SingleFlight()
+        self._login_generation = 0
+        self._login_lock = threading.RLock()
+        self.session = requests.Session()
+        self.session.trust_env = False
+        self.session.headers.update({"User-Agent": random_user_agent()})
+        self._try_restore_session()
+
+    def _cookie_jar(self):
+        return self.session.cookies
+
+    def _set_cookie(self, name, value):
+        self.session.cookies.set(name, value)
+
+    def _validate_session(self):
+        try:
+            response = self.session.get(
+                self.AUTH_TEST_URL, allow_redirects=False, timeout=self._timeout
+            )
+            if response.status_code == 302:
+                location = response.headers.get("Location", "")
+                return "authserver" not in location
+            if response.status_code == 200:
+                return "pwdLoginDiv" not in response.text
+            return False
+        except requests.RequestException:
+            return False
+
+    def _try_restore_session(self):
+        if not self._load_session():
+            return False
+        if self._session_is_fresh():
+            self._logged_in = True
+            return True
+        self._needs_validation = True
+        return False
+
     def _follow_js_redirects(self, response, max_steps=5):
         current = response
         steps = 0
         while True:
-            match = re.search(r"window\.location\.href='([^']+)'", current.text)
-            if not match:
+            js_url = _extract_js_redirect(current.text)
+            if not js_url:
                 break
             steps += 1
             if steps > max_steps:
                 break
-            js_url = match.group(1)
             current = self.session.get(
                 js_url, allow_redirects=True, timeout=self._timeout
             )
@@ -243,6 +421,15 @@ class GSAUClient:
             self._logged_in = False
             return False
 
+        store = self._session_store()
+        with store.lock():
+            if self._adopt_concurrent_login(store):
+                self._logged_in = True
+                self._login_generation += 1
+                return True
+            return self._cas_login(username, password)
+
+    def _cas_login(self, username, password):
         entry_response = self.session.get(
             self.LOGIN_ENTRY_URL, allow_redirects=True, timeout=self._timeout
         )
@@ -253,16 +440,7 @@ class GSAUClient:
             return False
 
         encrypted_password = _encrypt_password(password, salt)
-        form_data = {
-            "username": username,
-            "password": encrypted_password,
-            "captcha": "",
-            "_eventId": "submit",
-            "cllt": "userNameLogin",
-            "dllt": "generalLogin",
-            "lt": "",
-            "execution": execution,
-        }
+        form_data = _build_login_form(username, encrypted_password, execution)
         login_response = self.session.post(
             self.LOGIN_POST_URL,
             data=form_data,
@@ -271,7 +449,7 @@ class GSAUClient:
         )
         login_response.encoding = "utf-8"
         final_response = self._follow_js_redirects(login_response)
-        if "authserver" in final_response.url or "pwdLoginDiv" in final_response.text:
+        if _is_login_page(final_response.url, final_response.text):
             self._logged_in = False
             return False
 
@@ -279,11 +457,12 @@ class GSAUClient:
             self.AUTH_TEST_URL, allow_redirects=True, timeout=self._timeout
         )
         test_response.encoding = "utf-8"
-        if "authserver" in test_response.url or "pwdLoginDiv" in test_response.text:
+        if _is_login_page(test_response.url, test_response.text):
             self._logged_in = False
             return False
 
         self._logged_in = True
+        self._login_generation += 1
         self._username = username
         self._password = password
         self._save_session()
@@ -292,14 +471,64 @@ class GSAUClient:
     def ensure_login(self):
         if self._logged_in:
             return True
-        return self.login()
+        with self._login_lock:
+            if self._logged_in:
+                return True
+            if self._needs_validation:
+                self._needs_validation = False
+                if self._validate_session():
+                    self._learn_session_ttl(valid=True)
+                    self._logged_in = True
+                    self._save_session()
+                    return True
+                self.session.cookies.clear()
+            return self.login()
+
+    def _relogin(self, generation):
+        with self._login_lock:
+            if self._login_generation != generation and self._logged_in:
+                return True
+            self._learn_session_ttl(valid=False)
+            self.session.cookies.clear()
+            self._logged_in = False
+            return self.login()
+
+    def _request(self, method, url, bypass_cache=False, **kwargs):
+        ttl = None
+        key = None
+        if self.cache is not None and not kwargs.get("stream"):
+            ttl = self.cache.ttl_for(url, kwargs.get("data"))
+        if ttl:
+            key = cache_key(
+                method,
+                url,
+                data=kwargs.get("data"),
+                params=kwargs.get("params"),
+                account=self._account_key(),
+            )
+            if not bypass_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
 
-    def get(self, url, **kwargs):
+        response = self._send(method, url, **kwargs)
+        if key and response.status_code == 200:
+            self.cache.set(key, response, ttl)
+        return response
+
+    def _send(self, method, url, **kwargs):
         if not self.ensure_login():
             raise RuntimeError("Login failed")
-        return self.session.get(url, **kwargs)
+        generation = self._login_generation
+        response = self.session.request(method, url, **kwargs)
+        if not _is_expired_response(response, check_body=not kwargs.get("stream")):
+            return response
+        if not self._relogin(generation):
+            raise RuntimeError("Login failed")
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self._request("GET", url, **kwargs)
 
     def post(self, url, **kwargs):
-        if not self.ensure_login():
-            raise RuntimeError("Login failed")
-        return self.session.post(url, **kwargs)
+        return self._request("POST", url, **kwargs)
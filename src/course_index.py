@@ -0,0 +1,119 @@
+"""Course-name lookup index for grade lists."""
+
+from collections import defaultdict
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from src.models import Grade  # type: ignore[reportMissingImports]
+
+SIMILARITY_THRESHOLD = 0.6
+
+
+def normalize_course_name(name: str) -> str:
+    """Width/case-insensitive form without whitespace or punctuation."""
+    text = unicodedata.normalize("NFKC", str(name or "")).casefold()
+    return "".join(char for char in text if unicodedata.category(char)[0] not in "PZSC")
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[index : index + 2] for index in range(len(text) - 1)}
+
+
+class CourseIndex:
+    """Exact and n-gram indexes over one grade list, built once for many lookups.
+
+    Lookups are tiered: normalized equality, then containment either way,
+    then bigram Dice similarity above ``SIMILARITY_THRESHOLD``. Only the best
+    non-empty tier is considered; within it candidates rank by similarity,
+    then grade-list order, and a ``jxb_hint`` found in a candidate's
+    ``detail_url`` wins ties. ``match`` stops after containment, since
+    similar names such as 大学英语3/大学英语4 are different courses; the
+    similarity tier only feeds ``candidates`` as suggestions.
+    """
+
+    def __init__(self, grades: Sequence[Grade]) -> None:
+        self.grades = list(grades)
+        self._names: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._by_char: Dict[str, Set[int]] = defaultdict(set)
+        self._by_bigram: Dict[str, Set[int]] = defaultdict(set)
+        self._single_char: Dict[str, Set[int]] = defaultdict(set)
+        for position, grade in enumerate(self.grades):
+            name = normalize_course_name(grade.course_name)
+            grams = _bigrams(name)
+            self._names.append(name)
+            self._grams.append(grams)
+            if not name:
+                continue
+            self._exact[name].append(position)
+            for char in name:
+                self._by_char[char].add(position)
+            for gram in grams:
+                self._by_bigram[gram].add(position)
+            if len(name) == 1:
+                self._single_char[name].add(position)
+
+    def _postings(self, target: str, grams: Set[str]) -> Tuple[Set[int], Set[int]]:
+        """Rows that may contain ``target`` and rows sharing any n-gram with it."""
+        if len(target) == 1:
+            hits = self._by_char.get(target, set())
+            return set(hits), set(hits)
+        lists = sorted((self._by_bigram.get(gram, set()) for gram in grams), key=len)
+        containing = set(lists[0]).intersection(*lists[1:]) if lists else set()
+        sharing: Set[int] = set()
+        for postings in lists:
+            sharing |= postings
+        for char in set(target):
+            sharing |= self._single_char.get(char, set())
+        return containing, sharing
+
+    def _similarity(self, grams: Set[str], position: int) -> float:
+        other = self._grams[position]
+        if not grams or not other:
+            return 0.0
+        return 2.0 * len(grams & other) / (len(grams) + len(other))
+
+    def candidates(self, course_name: str) -> List[Grade]:
+        """Ranked matches from the best tier for ``course_name``, similar names included."""
+        return [
+            self.grades[position]
+            for position in self._ranked(course_name, similar=True)
+        ]
+
+    def _ranked(self, course_name: str, similar: bool = False) -> List[int]:
+        target = normalize_course_name(course_name)
+        if not target:
+            return []
+        exact = self._exact.get(target)
+        if exact:
+            return list(exact)
+
+        grams = _bigrams(target)
+        containing, sharing = self._postings(target, grams)
+        contained: List[Tuple[float, int]] = []
+        close: List[Tuple[float, int]] = []
+        for position in sharing:
+            name = self._names[position]
+            score = self._similarity(grams, position)
+            if (position in containing and target in name) or name in target:
+                contained.append((score, position))
+            elif similar and score >= SIMILARITY_THRESHOLD:
+                close.append((score, position))
+
+        ranked = contained or close
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [position for _score, position in ranked]
+
+    def match(
+        self, course_name: str, jxb_hint: Optional[str] = None
+    ) -> Optional[Grade]:
+        ranked = self._ranked(course_name)
+        if not ranked:
+            return None
+        if jxb_hint:
+            for position in ranked:
+                detail_url = str(self.grades[position].raw.get("detail_url", ""))
+                if jxb_hint in detail_url.strip():
+                    return self.grades[position]
+        return self.grades[ranked[0]]
@@ -0,0 +1,155 @@
+"""Common free time across many students' schedules via slot bitsets."""
+
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.models import Course, Slot  # type: ignore[reportMissingImports]
+from src.schedule_index import (  # type: ignore[reportMissingImports]
+    DAYS,
+    ScheduleIndex,
+    mask_values,
+    range_mask,
+)
+
+DEFAULT_SECTIONS = 12
+
+
+class CohortSchedule:
+    """One week x day x section bitset per student, combined bitwise.
+
+    Slot ``(week, day, section)`` is bit
+    ``((week - 1) * DAYS + day - 1) * sections + section - 1``. Free slots are
+    the complement of the OR of every student's bitset; per-slot busy counts
+    come from a bit-sliced counter, so both scale linearly with students and
+    never loop over individual slots per student.
+    """
+
+    def __init__(
+        self,
+        schedules: Optional[Mapping[str, Sequence[Course]]] = None,
+        weeks: int = 20,
+        sections: int = DEFAULT_SECTIONS,
+    ) -> None:
+        self.weeks = weeks
+        self.sections = sections
+        self.students: List[str] = []
+        self.busy: List[int] = []
+        for student, courses in (schedules or {}).items():
+            self.add(student, courses)
+
+    def _bit(self, week: int, day: int, section: int) -> int:
+        return ((week - 1) * DAYS + day - 1) * self.sections + section - 1
+
+    def _slot(self, bit: int) -> Tuple[int, int, int]:
+        cell, section = divmod(bit, self.sections)
+        week, day = divmod(cell, DAYS)
+        return week + 1, day + 1, section + 1
+
+    def add(self, student: str, courses: Sequence[Course]) -> None:
+        index = ScheduleIndex(courses, weeks=self.weeks)
+        section_limit = (1 << (self.sections + 1)) - 2
+        bits = 0
+        for day in range(1, DAYS + 1):
+            row = index.occupancy[day]
+            for week in range(1, self.weeks + 1):
+                mask = row[week] & section_limit
+                if mask:
+                    bits |= (mask >> 1) << self._bit(week, day, 1)
+        self.students.append(student)
+        self.busy.append(bits)
+
+    def _candidates(
+        self,
+        weeks: Optional[Iterable[int]],
+        days: Optional[Iterable[int]],
+        length: int,
+    ) -> int:
+        """Bitset of slots that may start a ``length``-section meeting."""
+        if not 1 <= length <= self.sections:
+            raise ValueError(f"length must be between 1 and {self.sections}")
+        week_list = list(weeks) if weeks is not None else range(1, self.weeks + 1)
+        day_list = list(days) if days is not None else range(1, DAYS + 1)
+        starts = (1 << (self.sections - length + 1)) - 1
+        mask = 0
+        for week in week_list:
+            if not 1 <= week <= self.weeks:
+                continue
+            for day in day_list:
+                if 1 <= day <= DAYS:
+                    mask |= starts << self._bit(week, day, 1)
+        return mask
+
+    def _spans(self, bits: int, length: int) -> int:
+        """Mark a slot busy when any of the ``length`` sections from it is."""
+        spanned = bits
+        for offset in range(1, length):
+            spanned |= bits >> offset
+        return spanned
+
+    def _slots(self, mask: int) -> List[Tuple[int, int, int]]:
+        slots = []
+        while mask:
+            low = mask & -mask
+            slots.append(self._slot(low.bit_length() - 1))
+            mask ^= low
+        return slots
+
+    def free_slots(
+        self,
+        weeks: Optional[Iterable[int]] = None,
+        days: Optional[Iterable[int]] = None,
+        length: int = 1,
+    ) -> List[Slot]:
+        """Slots starting ``length`` consecutive sections where everyone is free."""
+        union = 0
+        for bits in self.busy:
+            union |= bits
+        free = self._candidates(weeks, days, length) & ~self._spans(union, length)
+        return [Slot(*slot) for slot in self._slots(free)]
+
+    def least_conflict(
+        self,
+        limit: int = 10,
+        weeks: Optional[Iterable[int]] = None,
+        days: Optional[Iterable[int]] = None,
+        length: int = 1,
+    ) -> List[Slot]:
+        """The ``limit`` slots with the fewest busy students, earliest first on ties."""
+        candidates = self._candidates(weeks, days, length)
+        planes: List[int] = []
+        for bits in self.busy:
+            carry = self._spans(bits, length) & candidates
+            for level, plane in enumerate(planes):
+                if not carry:
+                    break
+                planes[level], carry = plane ^ carry, plane & carry
+            if carry:
+                planes.append(carry)
+
+        ranked: List[Slot] = []
+        remaining = candidates
+        for count in range(len(self.busy) + 1):
+            if not remaining or len(ranked) >= limit:
+                break
+            exact = remaining
+            for level, plane in enumerate(planes):
+                exact &= plane if count >> level & 1 else ~plane
+            if count >> len(planes):
+                exact = 0
+            remaining &= ~exact
+            for week, day, section in self._slots(exact)[: limit - len(ranked)]:
+                students = self._busy_at(self._bit(week, day, section), length)
+                ranked.append(Slot(week, day, section, count, students))
+        return ranked
+
+    def _busy_at(self, bit: int, length: int) -> List[str]:
+        span = ((1 << length) - 1) << bit
+        return [
+            student for student, bits in zip(self.students, self.busy) if bits & span
+        ]
+
+
+def parse_number_ranges(text: Optional[str]) -> Optional[List[int]]:
+    """``"1-16"``/``"1,3,5"`` option values as a number list; None when empty."""
+    if not text or not str(text).strip():
+        return None
+    return mask_values(range_mask(str(text).replace("、", ",").split(",")))
@@ -0,0 +1,310 @@
+"""Incremental grade synchronization with change detection."""
+
+import hashlib
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.grades import (  # type: ignore[reportMissingImports]
+    DEFAULT_DETAIL_WORKERS,
+    _build_term_id,
+    _fetch_target_details,
+    get_grades,
+)
+from src.local_files import (  # type: ignore[reportMissingImports]
+    _config_file_path,
+    _connect_sqlite,
+)
+from src.models import (  # type: ignore[reportMissingImports]
+    Grade,
+    GradeChange,
+    SyncResult,
+)
+
+DEFAULT_SYNC_FILE = Path.home() / ".gsau_sync.sqlite3"
+# Grade-list column telling a regular exam from a resit of the same course.
+EXAM_KIND_COLUMN = "考试性质"
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS grade_state (
+    account TEXT NOT NULL,
+    course_name TEXT NOT NULL,
+    year TEXT NOT NULL,
+    term TEXT NOT NULL,
+    detail_url TEXT NOT NULL,
+    exam_kind TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    score TEXT,
+    credits REAL,
+    grade_point REAL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (account, course_name, year, term, detail_url, exam_kind, ordinal)
+);
+CREATE TABLE IF NOT EXISTS sync_runs (
+    account TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (account, scope)
+);
+"""
+
+_GradeKey = Tuple[str, str, str, str, str, int]
+_GradeState = Tuple[Optional[str], Optional[float], Optional[float]]
+
+
+def default_sync_path() -> Path:
+    return _config_file_path("sync", "GSAU_SYNC_FILE", DEFAULT_SYNC_FILE)
+
+
+def _grade_keys(grades: List[Grade]) -> List[_GradeKey]:
+    """Row keys in list order.
+
+    Course, year, term, detail url and exam kind identify a row; rows that
+    still share all of them (a resit listed without an exam kind, say) are
+    told apart by their ordinal among those duplicates.
+    """
+    counts: Dict[Tuple[str, ...], int] = {}
+    keys: List[_GradeKey] = []
+    for grade in grades:
+        base = (
+            grade.course_name,
+            grade.year or "",
+            grade.term or "",
+            str(grade.raw.get("detail_url", "")).strip(),
+            str(grade.raw.get(EXAM_KIND_COLUMN, "") or "").strip(),
+        )
+        ordinal = counts.get(base, 0)
+        counts[base] = ordinal + 1
+        keys.append((*base, ordinal))
+    return keys
+
+
+def _grade_state(grade: Grade) -> _GradeState:
+    return (grade.score, grade.credits, grade.grade_point)
+
+
+def _digest(rows: List[Tuple[_GradeKey, _GradeState]]) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for row in sorted(rows, key=repr):
+        hasher.update(repr(row).encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _account_of(client: Any) -> str:
+    account_key = getattr(client, "_account_key", None)
+    return str(account_key()) if callable(account_key) else str(id(client))
+
+
+class GradeSync:
+    """Last known grade set per account, diffed against each fresh fetch.
+
+    Rows are keyed by course name, year, term, detail url and exam kind,
+    plus an ordinal among rows that share all of those. A sync reports rows
+    that appeared (``added``) or whose score, credits or grade point moved
+    (``changed``), and fetches grade details only for the added rows that
+    carry a detail link. The first sync of each account and scope (a
+    year/term, or all terms) records a baseline without fetching details.
+    When the fetched list hashes the same as last time the per-row diff and
+    all writes are skipped, and ``min_interval`` skips the request entirely
+    for recently synced scopes.
+    """
+
+    def __init__(
+        self,
+        path: Any = None,
+        min_interval: float = 0.0,
+        fetch_details: bool = True,
+        max_workers: int = DEFAULT_DETAIL_WORKERS,
+    ) -> None:
+        self.path = Path(path) if path else default_sync_path()
+        self.min_interval = min_interval
+        self.fetch_details = fetch_details
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        # Sync state is only a baseline; an older layout is dropped and the
+        # next sync records a fresh one.
+        self._conn = _connect_sqlite(
+            self.path,
+            _SCHEMA,
+            _SCHEMA_VERSION,
+            stale_tables=("grade_state", "sync_runs"),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _last_run(self, account: str, scope: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT digest, synced_at FROM sync_runs WHERE account = ? AND scope = ?",
+                (account, scope),
+            ).fetchone()
+
+    def _states(self, account: str) -> Dict[_GradeKey, _GradeState]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT course_name, year, term, detail_url, exam_kind, ordinal, "
+                "score, credits, grade_point FROM grade_state WHERE account = ?",
+                (account,),
+            ).fetchall()
+        return {tuple(row[:6]): tuple(row[6:]) for row in rows}  # type: ignore[misc]
+
+    def _record(
+        self,
+        account: str,
+        scope: str,
+        digest: str,
+        rows: List[Tuple[_GradeKey, _GradeState]],
+        now: float,
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO grade_state "
+                "(account, course_name, year, term, detail_url, exam_kind, ordinal, "
+                "score, credits, grade_point, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(account, *key, *state, now) for key, state in rows],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_runs (account, scope, digest, synced_at) "
+                "VALUES (?, ?, ?, ?)",
+                (account, scope, digest, now),
+            )
+
+    def sync(
+        self,
+        client: Any,
+        year: Any = None,
+        term: Any = None,
+        account: Optional[str] = None,
+    ) -> SyncResult:
+        account = account or _account_of(client)
+        scope = _build_term_id(year, term)
+        now = time.time()
+        last_run = self._last_run(account, scope)
+        if last_run and self.min_interval > 0 and now - last_run[1] < self.min_interval:
+            return SyncResult(account, fetched=False)
+
+        grades = get_grades(client, year=year, term=term)
+        rows = list(zip(_grade_keys(grades), map(_grade_state, grades)))
+        digest = _digest(rows)
+        if last_run and last_run[0] == digest:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE sync_runs SET synced_at = ? WHERE account = ? AND scope = ?",
+                    (now, account, scope),
+                )
+            return SyncResult(account)
+
+        states = self._states(account)
+        result = SyncResult(account, initial=last_run is None)
+        touched: List[Tuple[_GradeKey, _GradeState]] = []
+        for grade, (key, state) in zip(grades, rows):
+            previous = states.get(key)
+            if previous is None:
+                result.added.append(GradeChange(grade))
+            elif previous != state:
+                score, credits, grade_point = previous
+                result.changed.append(
+                    GradeChange(
+                        grade,
+                        previous=Grade(
+                            course_name=grade.course_name,
+                            score=score,
+                            credits=credits,
+                            grade_point=grade_point,
+                            year=grade.year,
+                            term=grade.term,
+                        ),
+                    )
+                )
+            else:
+                continue
+            states[key] = state
+            touched.append((key, state))
+
+        if self.fetch_details and not result.initial:
+            self._attach_details(client, result.added)
+        self._record(account, scope, digest, touched, now)
+        return result
+
+    def _attach_details(self, client: Any, changes: List[GradeChange]) -> None:
+        linked = [
+            change for change in changes if change.grade.raw.get("detail_url", "")
+        ]
+        targets = [
+            (change.grade.course_name, str(change.grade.raw["detail_url"]).strip())
+            for change in linked
+        ]
+        details = _fetch_target_details(client, targets, self.max_workers)
+        for change, detail in zip(linked, details):
+            change.detail = detail
+
+    def sync_pool(
+        self,
+        pool: Any,
+        year: Any = None,
+        term: Any = None,
+        usernames: Optional[Iterable[str]] = None,
+    ) -> Dict[str, SyncResult]:
+        """Sync every account of a SessionPool under its concurrency limit."""
+        return pool.map(
+            lambda client: self.sync(client, year=year, term=term), usernames
+        )
+
+    def known_grades(self, account: str) -> List[Grade]:
+        """Grades recorded for ``account`` as of its last sync."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT course_name, year, term, detail_url, exam_kind, score, credits, "
+                "grade_point FROM grade_state WHERE account = ? "
+                "ORDER BY year, term, course_name, exam_kind, ordinal",
+                (account,),
+            ).fetchall()
+        return [
+            Grade(
+                course_name=course_name,
+                score=score,
+                credits=credits,
+                grade_point=grade_point,
+                year=year or None,
+                term=term or None,
+                raw={
+                    key: value
+                    for key, value in (
+                        ("detail_url", detail_url),
+                        (EXAM_KIND_COLUMN, exam_kind),
+                    )
+                    if value
+                },
+            )
+            for (
+                course_name,
+                year,
+                term,
+                detail_url,
+                exam_kind,
+                score,
+                credits,
+                grade_point,
+            ) in rows
+        ]
+
+    def forget(self, account: Optional[str] = None) -> None:
+        """Drop stored state for one account, or for every account."""
+        with self._lock, self._conn:
+            if account is None:
+                self._conn.execute("DELETE FROM grade_state")
+                self._conn.execute("DELETE FROM sync_runs")
+            else:
+                self._conn.execute(
+                    "DELETE FROM grade_state WHERE account = ?", (account,)
+                )
+                self._conn.execute(
+                    "DELETE FROM sync_runs WHERE account = ?", (account,)
+                )
@@ -0,0 +1,209 @@
+"""Columnar grade container with vectorized GPA and credit aggregates."""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.models import Grade  # type: ignore[reportMissingImports]
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None  # type: ignore[assignment]
+
+PASSING_SCORE = 60.0
+FAILING_LABELS = frozenset({"不及格", "不合格"})
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "GradeTable requires numpy; install it with `uv sync --extra analysis`"
+        )
+
+
+def _parse_score(score: str) -> Tuple[float, bool, bool]:
+    """Numeric value (NaN if textual), whether present, and failing label."""
+    text = score.strip()
+    try:
+        value = float(text)
+    except ValueError:
+        value = float("nan")
+    return value, bool(text), text in FAILING_LABELS
+
+
+def _term_label(year: Optional[str], term: Optional[str]) -> str:
+    year_text = (year or "").strip()
+    term_text = (term or "").strip()
+    if year_text and term_text:
+        return f"{year_text}-{term_text}"
+    return year_text
+
+
+def _categorical(labels: Sequence[str], raw_codes: List[int]) -> Tuple[List[str], Any]:
+    """Sort the distinct ``labels`` and remap ``raw_codes`` into that order."""
+    categories, remap = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    codes = remap.reshape(-1).astype(np.intp)[np.asarray(raw_codes, dtype=np.intp)]
+    return [str(label) for label in categories], codes
+
+
+def _ratio(numerator: Any, denominator: Any) -> Any:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _to_mapping(labels: List[str], values: Any) -> Dict[str, Optional[float]]:
+    return {
+        label: (None if np.isnan(value) else float(value))
+        for label, value in zip(labels, values)
+    }
+
+
+class GradeTable:
+    """Grades stored column-wise for fast cohort-wide aggregates.
+
+    ``credits``, ``grade_points`` and ``scores`` are float arrays with NaN for
+    missing values; ``term_codes`` and ``student_codes`` index into ``terms``
+    and ``students`` (both sorted, so term codes are chronological).
+    """
+
+    def __init__(
+        self, grades: Iterable[Grade], students: Optional[Sequence[str]] = None
+    ) -> None:
+        _require_numpy()
+        self.grades: List[Grade] = list(grades)
+        count = len(self.grades)
+        if students is None:
+            students = [""] * count
+        elif len(students) != count:
+            raise ValueError("students must have one entry per grade")
+
+        credits: List[float] = []
+        grade_points: List[float] = []
+        parsed_scores: List[Tuple[float, bool, bool]] = []
+        score_cache: Dict[str, Tuple[float, bool, bool]] = {}
+        term_index: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        term_codes: List[int] = []
+        nan = float("nan")
+        for grade in self.grades:
+            credits.append(nan if grade.credits is None else grade.credits)
+            grade_points.append(nan if grade.grade_point is None else grade.grade_point)
+            score = grade.score or ""
+            parsed = score_cache.get(score)
+            if parsed is None:
+                parsed = score_cache[score] = _parse_score(score)
+            parsed_scores.append(parsed)
+            term_codes.append(
+                term_index.setdefault((grade.year, grade.term), len(term_index))
+            )
+
+        student_index: Dict[str, int] = {}
+        student_codes = [
+            student_index.setdefault(student, len(student_index))
+            for student in students
+        ]
+
+        self.course_names = [grade.course_name for grade in self.grades]
+        self.credits = np.array(credits, dtype=np.float64)
+        self.grade_points = np.array(grade_points, dtype=np.float64)
+        score_columns = np.array(parsed_scores, dtype=np.float64).reshape(count, 3)
+        self.scores = score_columns[:, 0]
+        self._has_score = score_columns[:, 1].astype(bool)
+        self._failing_label = score_columns[:, 2].astype(bool)
+        self.terms, self.term_codes = _categorical(
+            [_term_label(year, term) for year, term in term_index], term_codes
+        )
+        self.students, self.student_codes = _categorical(
+            list(student_index), student_codes
+        )
+
+    @classmethod
+    def from_grades(cls, grades: Iterable[Grade]) -> "GradeTable":
+        return cls(grades)
+
+    @classmethod
+    def from_cohort(cls, cohort: Mapping[str, Iterable[Grade]]) -> "GradeTable":
+        """Build one table from ``{student: grades}``, e.g. ``SessionPool.map``."""
+        grades: List[Grade] = []
+        students: List[str] = []
+        for student, student_grades in cohort.items():
+            for grade in student_grades:
+                grades.append(grade)
+                students.append(str(student))
+        return cls(grades, students=students)
+
+    def __len__(self) -> int:
+        return len(self.grades)
+
+    def _weighted(self) -> Tuple[Any, Any]:
+        valid = np.isfinite(self.credits) & np.isfinite(self.grade_points)
+        weights = np.where(valid, self.credits, 0.0)
+        points = np.where(valid, self.credits * self.grade_points, 0.0)
+        return points, weights
+
+    def _by(self, codes: Any, size: int, weights: Any) -> Any:
+        return np.bincount(codes, weights=weights, minlength=size)
+
+    def failed_mask(self) -> Any:
+        """Rows with a numeric score below 60 or a failing grade label."""
+        with np.errstate(invalid="ignore"):
+            below = self.scores < PASSING_SCORE
+        return below | self._failing_label
+
+    def failed(self) -> List[Grade]:
+        return [self.grades[index] for index in np.flatnonzero(self.failed_mask())]
+
+    def pass_rate(self) -> Optional[float]:
+        """Share of rows with any score (numeric or label) that did not fail."""
+        total = int(self._has_score.sum())
+        if not total:
+            return None
+        return 1.0 - float(self.failed_mask().sum()) / total
+
+    def credit_sum(self, passed_only: bool = False) -> float:
+        credits = np.nan_to_num(self.credits)
+        if passed_only:
+            credits = np.where(self.failed_mask(), 0.0, credits)
+        return float(credits.sum())
+
+    def credits_by_term(self) -> Dict[str, float]:
+        totals = self._by(self.term_codes, len(self.terms), np.nan_to_num(self.credits))
+        return {label: float(total) for label, total in zip(self.terms, totals)}
+
+    def gpa(self) -> Optional[float]:
+        """Credit-weighted GPA over every row with credits and a grade point."""
+        points, weights = self._weighted()
+        total = weights.sum()
+        return float(points.sum() / total) if total > 0 else None
+
+    def gpa_by_term(self) -> Dict[str, Optional[float]]:
+        points, weights = self._weighted()
+        size = len(self.terms)
+        return _to_mapping(
+            self.terms,
+            _ratio(
+                self._by(self.term_codes, size, points),
+                self._by(self.term_codes, size, weights),
+            ),
+        )
+
+    def cumulative_gpa(self) -> Dict[str, Optional[float]]:
+        """GPA over all terms up to and including each term, in term order."""
+        points, weights = self._weighted()
+        size = len(self.terms)
+        return _to_mapping(
+            self.terms,
+            _ratio(
+                np.cumsum(self._by(self.term_codes, size, points)),
+                np.cumsum(self._by(self.term_codes, size, weights)),
+            ),
+        )
+
+    def gpa_by_student(self) -> Dict[str, Optional[float]]:
+        points, weights = self._weighted()
+        size = len(self.students)
+        return _to_mapping(
+            self.students,
+            _ratio(
+                self._by(self.student_codes, size, points),
+                self._by(self.student_codes, size, weights),
+            ),
+        )
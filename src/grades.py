@@ -1,15 +1,41 @@
 """Grade fetching helpers."""
 
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import re
 from urllib.parse import parse_qsl
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from src.models import Grade, GradeDetail  # type: ignore[reportMissingImports]
+from src.course_index import CourseIndex  # type: ignore[reportMissingImports]
+from src.html_backend import (  # type: ignore[reportMissingImports]
+    Markup,
+    make_soup,
+    node_text,
+    parse_document,
+    response_body,
+    select_parser,
+)
+from src.models import (  # type: ignore[reportMissingImports]
+    Grade,
+    GradeDetail,
+    RowLayout,
+    RowView,
+)
+from src.parse_cache import cached_parse  # type: ignore[reportMissingImports]
+from src.singleflight import (  # type: ignore[reportMissingImports]
+    coalesce,
+    coalesce_async,
+    flight_key,
+)
 
 BASE_URL = "https://jwgl.gsau.edu.cn"
+DEFAULT_DETAIL_WORKERS = 4
+DEFAULT_PAGE_WORKERS = 4
+DEFAULT_SHOW_COUNT = 100
 
 
 def _build_url(path: str) -> str:
@@ -102,40 +128,10 @@ def _split_year_term(value: str) -> Tuple[Optional[str], Optional[str]]:
     return year, term
 
 
-def _pick_value(row: Dict[str, str], keys: List[str]) -> Optional[str]:
-    for key in keys:
-        value = row.get(key)
-        if value:
-            return value
-    return None
-
-
 def _match_grade_by_course_name(
     grades: List[Grade], course_name: str, jxb_hint: Optional[str] = None
 ) -> Optional[Grade]:
-    target = _clean_text(course_name)
-    if not target:
-        return None
-    exact: List[Grade] = []
-    fuzzy: List[Grade] = []
-    for grade in grades:
-        current = _clean_text(grade.course_name)
-        if not current:
-            continue
-        if current == target:
-            exact.append(grade)
-        elif target in current or current in target:
-            fuzzy.append(grade)
-
-    candidates = exact or fuzzy
-    if not candidates:
-        return None
-    if jxb_hint:
-        for grade in candidates:
-            detail_url = str(grade.raw.get("detail_url", "")).strip()
-            if jxb_hint in detail_url:
-                return grade
-    return candidates[0]
+    return CourseIndex(grades).match(course_name, jxb_hint=jxb_hint)
 
 
 def _resolve_detail_url_from_grades(
@@ -144,7 +140,26 @@ def _resolve_detail_url_from_grades(
     if year is None or term is None:
         return None
     grades = get_grades(client, year=year, term=term)
-    matched = _match_grade_by_course_name(grades, course_name, jxb_hint=jxb_hint)
+    return _detail_url_from_match(grades, course_name, jxb_hint)
+
+
+async def _resolve_detail_url_from_grades_async(
+    client, year: Any, term: Any, course_name: str, jxb_hint: Optional[str] = None
+) -> Optional[str]:
+    if year is None or term is None:
+        return None
+    grades = await get_grades_async(client, year=year, term=term)
+    return _detail_url_from_match(grades, course_name, jxb_hint)
+
+
+def _detail_url_from_match(
+    grades: List[Grade],
+    course_name: str,
+    jxb_hint: Optional[str],
+    index: Optional[CourseIndex] = None,
+) -> Optional[str]:
+    index = index or CourseIndex(grades)
+    matched = index.match(course_name, jxb_hint=jxb_hint)
     if not matched:
         return None
     detail_url = str(matched.raw.get("detail_url", "")).strip()
@@ -164,12 +179,152 @@ def _extract_detail_url(raw_href: str) -> Optional[str]:
     return None
 
 
-def _parse_grade_table(
-    html: str, fallback_year: Any, fallback_term: Any
+_COURSE_NAME_KEYS = [
+    "课程名称",
+    "课程",
+    "课程名",
+    "课程名称/环节",
+    "课程名称(环节)",
+    "课程名称（环节）",
+    "课程名/环节",
+]
+_SCORE_KEYS = ["成绩", "总评成绩", "最终成绩", "总成绩"]
+_CREDIT_KEYS = ["学分", "课程学分", "学分数"]
+_GRADE_POINT_KEYS = ["绩点", "成绩绩点", "绩点值"]
+_YEAR_TERM_KEYS = ["学年学期", "学年/学期"]
+
+_Candidates = Tuple[Tuple[int, ...], ...]
+_Picker = Callable[[List[str]], Optional[str]]
+
+
+def _pick_nothing(values: List[str]) -> Optional[str]:
+    return None
+
+
+def _column_picker(candidates: _Candidates) -> _Picker:
+    if not candidates:
+        return _pick_nothing
+    if len(candidates) == 1 and len(candidates[0]) == 1:
+        ((index,),) = candidates
+
+        def pick_single(values: List[str]) -> Optional[str]:
+            return (values[index] or None) if index < len(values) else None
+
+        return pick_single
+
+    def pick_first(values: List[str]) -> Optional[str]:
+        count = len(values)
+        for indexes in candidates:
+            for index in indexes:
+                if index < count:
+                    if values[index]:
+                        return values[index]
+                    break
+        return None
+
+    return pick_first
+
+
+class _GradeColumns:
+    """Header aliases resolved once per table into fixed column indexes.
+
+    Picking a field matches a lookup on the header->value row dict: each
+    alias maps to the indexes carrying that key (last one first, as a dict
+    keeps the last duplicate), and the first non-empty alias wins.
+    """
+
+    __slots__ = (
+        "keys",
+        "layouts",
+        "course_name",
+        "score",
+        "credits",
+        "grade_point",
+        "year",
+        "term",
+        "year_term",
+    )
+
+    def __init__(self, headers: List[str]) -> None:
+        self.keys = [
+            header or f"col_{index + 1}" for index, header in enumerate(headers)
+        ]
+        self.layouts: Dict[int, RowLayout] = {}
+        positions: Dict[str, List[int]] = {}
+        for index, key in enumerate(self.keys):
+            positions.setdefault(key, []).insert(0, index)
+
+        def compile_aliases(aliases: List[str]) -> _Picker:
+            return _column_picker(
+                tuple(
+                    tuple(positions[alias]) for alias in aliases if alias in positions
+                )
+            )
+
+        self.course_name = compile_aliases(_COURSE_NAME_KEYS)
+        self.score = compile_aliases(_SCORE_KEYS)
+        self.credits = compile_aliases(_CREDIT_KEYS)
+        self.grade_point = compile_aliases(_GRADE_POINT_KEYS)
+        self.year = compile_aliases(["学年"])
+        self.term = compile_aliases(["学期"])
+        self.year_term = compile_aliases(_YEAR_TERM_KEYS)
+
+    def layout(self, width: int) -> RowLayout:
+        layout = self.layouts.get(width)
+        if layout is None:
+            keys = self.keys[:width]
+            keys.extend(f"col_{index + 1}" for index in range(len(keys), width))
+            layout = self.layouts[width] = RowLayout(keys)
+        return layout
+
+    def build(
+        self,
+        values: List[str],
+        hrefs: List[str],
+        fallback_year: Any,
+        fallback_term: Any,
+    ) -> Optional[Grade]:
+        course_name = self.course_name(values)
+        if not course_name:
+            return None
+
+        year = self.year(values)
+        term_value = self.term(values)
+        year_term = self.year_term(values)
+        if year_term:
+            parsed_year, parsed_term = _split_year_term(year_term)
+            year = year or parsed_year
+            term_value = term_value or parsed_term
+
+        if not year and fallback_year is not None:
+            year = str(fallback_year).strip()
+        if not term_value and fallback_term is not None:
+            term_value = _normalize_term(fallback_term)
+
+        extra: Tuple[Tuple[str, str], ...] = ()
+        for href in hrefs:
+            detail_url = _extract_detail_url(href)
+            if detail_url:
+                extra = (("detail_url", detail_url),)
+                break
+
+        return Grade(
+            course_name=course_name,
+            score=self.score(values),
+            credits=_to_float(self.credits(values)),
+            grade_point=_to_float(self.grade_point(values)),
+            year=year,
+            term=term_value,
+            raw=RowView(self.layout(len(values)), tuple(values), extra),
+        )
+
+
+def _parse_grade_table_bs4(
+    html: Markup, fallback_year: Any, fallback_term: Any
 ) -> List[Grade]:
     if not html:
         return []
-    soup = BeautifulSoup(html, "lxml")
+    soup = make_soup(html)
     table = None
     for candidate in soup.find_all("table"):
         if candidate.find("tr"):
@@ -187,93 +342,130 @@ def _parse_grade_table(
     if not any(headers):
         return []
 
+    columns = _GradeColumns(headers)
     grades: List[Grade] = []
     for row in rows[1:]:
         cells = row.find_all(["th", "td"])
         if not cells:
             continue
         values = [_clean_text(cell.get_text(" ", strip=True)) for cell in cells]
-        row_dict: Dict[str, str] = {}
-        for index, value in enumerate(values):
-            key = (
-                headers[index]
-                if index < len(headers) and headers[index]
-                else f"col_{index + 1}"
-            )
-            row_dict[key] = value
+        hrefs = [link["href"] for link in row.find_all("a", href=True)]
+        grade = columns.build(values, hrefs, fallback_year, fallback_term)
+        if grade:
+            grades.append(grade)
 
-        detail_url = None
-        for link in row.find_all("a", href=True):
-            detail_url = _extract_detail_url(link["href"])
-            if detail_url:
-                break
-        if detail_url:
-            row_dict["detail_url"] = detail_url
+    return grades
 
-        course_name = _pick_value(
-            row_dict,
-            [
-                "课程名称",
-                "课程",
-                "课程名",
-                "课程名称/环节",
-                "课程名称(环节)",
-                "课程名称（环节）",
-                "课程名/环节",
-            ],
-        )
-        if not course_name:
-            continue
 
-        score = _pick_value(row_dict, ["成绩", "总评成绩", "最终成绩", "总成绩"])
-        credits = _to_float(_pick_value(row_dict, ["学分", "课程学分", "学分数"]))
-        grade_point = _to_float(_pick_value(row_dict, ["绩点", "成绩绩点", "绩点值"]))
-        year = _pick_value(row_dict, ["学年"])
-        term_value = _pick_value(row_dict, ["学期"])
+_CELLS = etree.XPath(".//*[self::th or self::td]")
+_LINK_HREFS = etree.XPath(".//a/@href", smart_strings=False)
 
-        year_term = _pick_value(row_dict, ["学年学期", "学年/学期"])
-        if year_term:
-            parsed_year, parsed_term = _split_year_term(year_term)
-            year = year or parsed_year
-            term_value = term_value or parsed_term
 
-        if not year and fallback_year is not None:
-            year = str(fallback_year).strip()
-        if not term_value and fallback_term is not None:
-            term_value = _normalize_term(fallback_term)
+def _parse_grade_table_lxml(
+    html: Markup, fallback_year: Any, fallback_term: Any
+) -> List[Grade]:
+    doc = parse_document(html)
+    if doc is None:
+        return []
+    table = None
+    for candidate in doc.iter("table"):
+        if next(candidate.iter("tr"), None) is not None:
+            table = candidate
+            break
+    if table is None:
+        return []
 
-        grades.append(
-            Grade(
-                course_name=course_name,
-                score=score,
-                credits=credits,
-                grade_point=grade_point,
-                year=year,
-                term=term_value,
-                raw=row_dict,
-            )
-        )
+    rows = list(table.iter("tr"))
+    headers = [_clean_text(node_text(cell)) for cell in _CELLS(rows[0])]
+    if not any(headers):
+        return []
+
+    columns = _GradeColumns(headers)
+    grades: List[Grade] = []
+    for row in rows[1:]:
+        cells = _CELLS(row)
+        if not cells:
+            continue
+        values = [_clean_text(node_text(cell)) for cell in cells]
+        grade = columns.build(values, _LINK_HREFS(row), fallback_year, fallback_term)
+        if grade:
+            grades.append(grade)
 
     return grades
 
 
-def _parse_breakdown_table(html: str) -> Dict[str, Any]:
-    breakdown: Dict[str, Any] = {}
-    if not html:
-        return breakdown
+def _iter_grade_table_chunks(
+    chunks: Iterable[bytes], fallback_year: Any, fallback_term: Any
+) -> Iterator[Grade]:
+    """Incrementally parse the grade table, yielding each row once it closes.
+
+    Mirrors ``_parse_grade_table_lxml``: the table holding the first ``<tr>``
+    is the grade table and its first row is the header. Processed rows are
+    cleared from the tree so memory stays bounded by the chunk size.
+    """
+    parser = etree.HTMLPullParser(events=("end",), tag="tr", encoding="utf-8")
+    table = None
+    headers: Optional[List[str]] = None
+    columns: Optional[_GradeColumns] = None
+
+    def _drain() -> Iterator[Grade]:
+        nonlocal table, headers, columns
+        for _event, row in parser.read_events():
+            if table is None:
+                table = next(row.iterancestors("table"), None)
+                if table is None:
+                    continue
+            elif table not in row.iterancestors("table"):
+                continue
+
+            if headers is None:
+                headers = [_clean_text(node_text(cell)) for cell in _CELLS(row)]
+                if any(headers):
+                    columns = _GradeColumns(headers)
+            elif columns is not None:
+                cells = _CELLS(row)
+                if cells:
+                    values = [_clean_text(node_text(cell)) for cell in cells]
+                    grade = columns.build(
+                        values, _LINK_HREFS(row), fallback_year, fallback_term
+                    )
+                    if grade:
+                        yield grade
 
-    soup = BeautifulSoup(html, "lxml")
-    tables = soup.find_all("table")
-    for table in tables:
-        rows = table.find_all("tr")
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parser.feed(chunk)
+        yield from _drain()
+        if headers is not None and columns is None:
+            return
+    parser.close()
+    yield from _drain()
+
+
+@cached_parse("grades")
+def _parse_grade_table(
+    html: Markup, fallback_year: Any, fallback_term: Any
+) -> List[Grade]:
+    parse = select_parser(
+        {"bs4": _parse_grade_table_bs4, "lxml": _parse_grade_table_lxml}
+    )
+    return parse(html, fallback_year, fallback_term)
+
+
+def _breakdown_from_tables(tables: List[List[List[str]]]) -> Dict[str, Any]:
+    breakdown: Dict[str, Any] = {}
+    for rows in tables:
         if len(rows) < 2:
             continue
-        header_cells = rows[0].find_all(["th", "td"])
-        headers = [_clean_text(cell.get_text(" ", strip=True)) for cell in header_cells]
+        headers = rows[0]
         if sum(1 for header in headers if header) < 2:
             continue
-        value_cells = rows[1].find_all(["th", "td"])
-        values = [_clean_text(cell.get_text(" ", strip=True)) for cell in value_cells]
+        values = rows[1]
         for index, header in enumerate(headers):
             if not header:
                 continue
@@ -285,11 +477,9 @@ def _parse_breakdown_table(html: str) -> Dict[str, Any]:
     if not tables:
         return breakdown
 
-    for row in tables[0].find_all("tr"):
-        cells = row.find_all(["th", "td"])
-        if not cells:
+    for texts in tables[0]:
+        if not texts:
             continue
-        texts = [_clean_text(cell.get_text(" ", strip=True)) for cell in cells]
         index = 0
         while index + 1 < len(texts):
             key = texts[index]
@@ -300,31 +490,187 @@ def _parse_breakdown_table(html: str) -> Dict[str, Any]:
     return breakdown
 
 
-def get_grades(
-    client, year: Any = None, term: Any = None, page: int = 1, show_count: int = 100
-) -> List[Grade]:
-    payload = {
+def _parse_breakdown_table_bs4(html: Markup) -> Dict[str, Any]:
+    if not html:
+        return {}
+    soup = make_soup(html)
+    tables = [
+        [
+            [
+                _clean_text(cell.get_text(" ", strip=True))
+                for cell in row.find_all(["th", "td"])
+            ]
+            for row in table.find_all("tr")
+        ]
+        for table in soup.find_all("table")
+    ]
+    return _breakdown_from_tables(tables)
+
+
+def _parse_breakdown_table_lxml(html: Markup) -> Dict[str, Any]:
+    doc = parse_document(html)
+    if doc is None:
+        return {}
+    tables = [
+        [
+            [_clean_text(node_text(cell)) for cell in _CELLS(row)]
+            for row in table.iter("tr")
+        ]
+        for table in doc.iter("table")
+    ]
+    return _breakdown_from_tables(tables)
+
+
+def _parse_breakdown_table(html: Markup) -> Dict[str, Any]:
+    parse = select_parser(
+        {"bs4": _parse_breakdown_table_bs4, "lxml": _parse_breakdown_table_lxml}
+    )
+    return parse(html)
+
+
+def _grades_payload(
+    year: Any,
+    term: Any,
+    course_type: Any = None,
+    course_name: Any = None,
+    display: Any = None,
+) -> Dict[str, str]:
+    """cjcx_list form: term plus the server-side course nature/name/display filters."""
+    return {
         "kksj": _build_term_id(year, term),
-        "kcxz": "",
-        "kcmc": "",
-        "xsfs": "",
+        "kcxz": _clean_text(course_type),
+        "kcmc": _clean_text(course_name),
+        "xsfs": _clean_text(display),
     }
-    response = client.post(_build_url("/jsxsd/kscj/cjcx_list"), data=payload)
-    response.encoding = "utf-8"
-    html = response.text or ""
-    return _parse_grade_table(html, year, term)
 
 
-def get_grade_detail(
-    client,
-    *,
+def _page_payload(
+    payload: Dict[str, str], page: Optional[int], show_count: int
+) -> Dict[str, str]:
+    paged = dict(payload)
+    if page is not None:
+        paged["pageIndex"] = str(page)
+    paged["showCount"] = str(show_count)
+    return paged
+
+
+_PAGE_COUNT_TEXT = (r"第\s*\d+\s*/\s*(\d+)\s*页", r"共\s*(\d+)\s*页")
+_RECORD_COUNT_TEXT = r"共\s*(\d+)\s*条"
+_PAGE_COUNT_PATTERNS = {
+    str: tuple(re.compile(text) for text in _PAGE_COUNT_TEXT),
+    bytes: tuple(re.compile(text.encode("utf-8")) for text in _PAGE_COUNT_TEXT),
+}
+_RECORD_COUNT_PATTERN = {
+    str: re.compile(_RECORD_COUNT_TEXT),
+    bytes: re.compile(_RECORD_COUNT_TEXT.encode("utf-8")),
+}
+# Longest pager text the stream scanner must see whole across chunk borders.
+_PAGER_OVERLAP = 64
+
+
+def _pager_counts(html: Markup) -> Tuple[Optional[int], Optional[int]]:
+    """(page count, record count) from the pager text, searched without decoding."""
+    kind = str if isinstance(html, str) else bytes
+    pages = records = None
+    for pattern in _PAGE_COUNT_PATTERNS[kind]:
+        match = pattern.search(html)
+        if match:
+            pages = int(match.group(1))
+            break
+    match = _RECORD_COUNT_PATTERN[kind].search(html)
+    if match:
+        records = int(match.group(1))
+    return pages, records
+
+
+def _pages_from_counts(
+    pages: Optional[int], records: Optional[int], show_count: int
+) -> Optional[int]:
+    if pages is not None:
+        return max(1, pages)
+    if records is not None and show_count > 0:
+        return max(1, -(-records // show_count))
+    return None
+
+
+def _page_count(html: Markup, show_count: int) -> Optional[int]:
+    """Total pages from the pager text, or None when the page has no pager."""
+    if not html:
+        return None
+    return _pages_from_counts(*_pager_counts(html), show_count)
+
+
+class _PagerScanner:
+    """Reads the pager from a streamed body, keeping only a short tail between chunks."""
+
+    def __init__(self, show_count: int) -> None:
+        self.show_count = show_count
+        self._pages: Optional[int] = None
+        self._records: Optional[int] = None
+        self._tail = b""
+
+    def feed(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+            if self._pages is not None:
+                continue
+            window = self._tail + bytes(chunk)
+            pages, records = _pager_counts(window)
+            self._pages = pages
+            if self._records is None:
+                self._records = records
+            self._tail = window[-_PAGER_OVERLAP:]
+
+    @property
+    def pages(self) -> Optional[int]:
+        return _pages_from_counts(self._pages, self._records, self.show_count)
+
+
+# Row-number columns, renumbered per page, so left out of repeat detection.
+_INDEX_COLUMNS = frozenset({"序号"})
+
+
+def _grade_key(grade: Grade) -> Tuple[Any, ...]:
+    columns = tuple(
+        (str(name), str(value))
+        for name, value in grade.raw.items()
+        if name not in _INDEX_COLUMNS
+    )
+    return (grade.year, grade.term, grade.course_name, grade.score, columns)
+
+
+class _RepeatFilter:
+    """Drops rows a later page repeats from earlier pages.
+
+    Rows are never dropped within one page: a regular exam and a resit can
+    be identical rows. A page's row counts only suppress as many copies of a
+    row on later pages as the busiest earlier page held.
+    """
+
+    def __init__(self) -> None:
+        self._seen: Counter = Counter()
+        self._page: Counter = Counter()
+
+    def fresh(self, grade: Grade) -> bool:
+        key = _grade_key(grade)
+        self._page[key] += 1
+        return self._page[key] > self._seen[key]
+
+    def end_page(self) -> None:
+        self._seen |= self._page
+        self._page = Counter()
+
+
+def _new_rows(page_grades: List[Grade], seen: _RepeatFilter) -> List[Grade]:
+    """Rows not repeated from an earlier page, in page order."""
+    fresh = [grade for grade in page_grades if seen.fresh(grade)]
+    seen.end_page()
+    return fresh
+
+
+def _parse_jxb_id(
     jxb_id: Any,
-    year: Any,
-    term: Any,
-    course_name: str,
-    student_id: Any,
-    student_name: str,
-) -> GradeDetail:
+) -> Tuple[Optional[str], Optional[Dict[str, str]], Optional[str]]:
     detail_url: Optional[str] = None
     params: Optional[Dict[str, str]] = None
     jxb_hint: Optional[str] = None
@@ -341,7 +687,347 @@ def get_grade_detail(
             detail_url = _extract_detail_url(jxb_text)
         elif "=" in jxb_text:
             params = {key: value for key, value in parse_qsl(jxb_text) if key}
+    return detail_url, params, jxb_hint
+
+
+def _detail_request(
+    detail_url: Optional[str],
+    params: Optional[Dict[str, str]],
+    jxb_id: Any,
+    student_id: Any,
+) -> Tuple[str, Optional[Dict[str, str]]]:
+    if detail_url:
+        return _build_url(detail_url), None
+    if params is None:
+        jxb_value = "" if jxb_id is None else str(jxb_id).strip()
+        student_value = "" if student_id is None else str(student_id).strip()
+        if not jxb_value or not student_value:
+            raise ValueError(
+                "无法自动定位成绩详情，请提供可用的 --jxb-id，或提供 --course-name/--year/--term 用于自动匹配"
+            )
+        params = {
+            "xs0101id": student_value,
+            "jx0404id": jxb_value,
+        }
+    return _build_url("/jsxsd/kscj/pscj_list.do"), params
+
+
+def _grade_detail_from_response(response, course_name: str) -> GradeDetail:
+    response.encoding = "utf-8"
+    html = response.text or ""
+    breakdown = _parse_breakdown_table(html)
+    return GradeDetail(
+        course_name=str(course_name).strip(), breakdown=breakdown, raw_html=html
+    )
+
+
+def _fetch_grade_detail(
+    client, url: str, params: Optional[Dict[str, str]], course_name: str
+) -> GradeDetail:
+    def _fetch() -> GradeDetail:
+        if params is None:
+            response = client.get(url)
+        else:
+            response = client.get(url, params=params)
+        return _grade_detail_from_response(response, course_name)
+
+    key = flight_key(client, "grade_detail", url, params, course_name)
+    return coalesce(client, key, _fetch)
+
+
+async def _fetch_grade_detail_async(
+    client, url: str, params: Optional[Dict[str, str]], course_name: str
+) -> GradeDetail:
+    async def _fetch() -> GradeDetail:
+        if params is None:
+            response = await client.get(url)
+        else:
+            response = await client.get(url, params=params)
+        return _grade_detail_from_response(response, course_name)
+
+    key = flight_key(client, "grade_detail", url, params, course_name)
+    return await coalesce_async(client, key, _fetch)
+
+
+_GradePage = Tuple[List[Grade], Optional[int]]
+
+
+def _fetch_grade_page(
+    client, payload: Dict[str, str], year: Any, term: Any, page: int, show_count: int
+) -> _GradePage:
+    url = _build_url("/jsxsd/kscj/cjcx_list")
+    data = _page_payload(payload, page, show_count)
+
+    def _fetch() -> _GradePage:
+        response = client.post(url, data=data)
+        body = response_body(response)
+        return _parse_grade_table(body, year, term), _page_count(body, show_count)
+
+    return coalesce(client, flight_key(client, "grades", url, data, year, term), _fetch)
+
+
+async def _fetch_grade_page_async(
+    client, payload: Dict[str, str], year: Any, term: Any, page: int, show_count: int
+) -> _GradePage:
+    url = _build_url("/jsxsd/kscj/cjcx_list")
+    data = _page_payload(payload, page, show_count)
+
+    async def _fetch() -> _GradePage:
+        response = await client.post(url, data=data)
+        body = response_body(response)
+        return _parse_grade_table(body, year, term), _page_count(body, show_count)
 
+    key = flight_key(client, "grades", url, data, year, term)
+    return await coalesce_async(client, key, _fetch)
+
+
+def iter_grade_pages(
+    client,
+    year: Any = None,
+    term: Any = None,
+    show_count: int = DEFAULT_SHOW_COUNT,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    *,
+    course_type: Any = None,
+    course_name: Any = None,
+    display: Any = None,
+) -> Iterator[Grade]:
+    """Yield every row of a paged grade list in page order, skipping page repeats.
+
+    The first page's pager tells how many pages there are; the rest are
+    fetched concurrently and yielded as soon as each page in order is ready.
+    Without a pager, pages are walked one by one while they come back full
+    and still contain unseen rows.
+    """
+    payload = _grades_payload(year, term, course_type, course_name, display)
+    first, pages = _fetch_grade_page(client, payload, year, term, 1, show_count)
+    seen = _RepeatFilter()
+    yield from _new_rows(first, seen)
+
+    if pages is None:
+        page_grades = first
+        page = 1
+        while len(page_grades) >= show_count > 0:
+            page += 1
+            page_grades, _pages = _fetch_grade_page(
+                client, payload, year, term, page, show_count
+            )
+            fresh = _new_rows(page_grades, seen)
+            if not fresh:
+                break
+            yield from fresh
+        return
+
+    if pages <= 1:
+        return
+
+    def _fetch(page: int) -> List[Grade]:
+        return _fetch_grade_page(client, payload, year, term, page, show_count)[0]
+
+    workers = max(1, min(max_workers, pages - 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for page_grades in executor.map(_fetch, range(2, pages + 1)):
+            yield from _new_rows(page_grades, seen)
+
+
+def get_grades(
+    client,
+    year: Any = None,
+    term: Any = None,
+    page: Optional[int] = None,
+    show_count: int = DEFAULT_SHOW_COUNT,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    *,
+    course_type: Any = None,
+    course_name: Any = None,
+    display: Any = None,
+) -> List[Grade]:
+    """Grades for one server page, or for every page when ``page`` is None.
+
+    ``course_type`` (kcxz), ``course_name`` (kcmc) and ``display`` (xsfs) are
+    sent as server-side filters, so only matching rows are transferred.
+    """
+    payload = _grades_payload(year, term, course_type, course_name, display)
+    if page is not None:
+        return _fetch_grade_page(client, payload, year, term, page, show_count)[0]
+
+    def _fetch() -> List[Grade]:
+        return list(
+            iter_grade_pages(
+                client,
+                year,
+                term,
+                show_count=show_count,
+                max_workers=max_workers,
+                course_type=course_type,
+                course_name=course_name,
+                display=display,
+            )
+        )
+
+    url = _build_url("/jsxsd/kscj/cjcx_list")
+    key = flight_key(
+        client, "grade_pages", url, _page_payload(payload, None, show_count), year, term
+    )
+    return coalesce(client, key, _fetch)
+
+
+def iter_grades(
+    client,
+    year: Any = None,
+    term: Any = None,
+    chunk_size: int = 16 * 1024,
+    show_count: int = DEFAULT_SHOW_COUNT,
+    *,
+    course_type: Any = None,
+    course_name: Any = None,
+    display: Any = None,
+) -> Iterator[Grade]:
+    """Stream the grade list, yielding each Grade as soon as its row is parsed.
+
+    Pages are streamed one after another, so memory stays bounded by a chunk.
+    The first page's pager tells how many pages to request; without one, the
+    next page is requested while the last came back full with unseen rows.
+    Rows a later page repeats from an earlier one are yielded once.
+    """
+    payload = _grades_payload(year, term, course_type, course_name, display)
+    seen = _RepeatFilter()
+    total: Optional[int] = None
+    page = 1
+    while True:
+        scanner = _PagerScanner(show_count)
+        rows = fresh = 0
+        for grade in _stream_grade_page(
+            client,
+            _page_payload(payload, page, show_count),
+            year,
+            term,
+            chunk_size,
+            scanner,
+        ):
+            rows += 1
+            if seen.fresh(grade):
+                fresh += 1
+                yield grade
+        seen.end_page()
+        if page == 1:
+            total = scanner.pages
+        if total is not None:
+            if page >= total:
+                return
+        elif not (rows >= show_count > 0 and fresh):
+            return
+        page += 1
+
+
+def _stream_grade_page(
+    client,
+    data: Dict[str, str],
+    year: Any,
+    term: Any,
+    chunk_size: int,
+    scanner: _PagerScanner,
+) -> Iterator[Grade]:
+    response = client.post(_build_url("/jsxsd/kscj/cjcx_list"), data=data, stream=True)
+    try:
+        if hasattr(response, "iter_content"):
+            chunks = response.iter_content(chunk_size=chunk_size)
+        else:
+            body = response_body(response)
+            chunks = [body.encode("utf-8") if isinstance(body, str) else body]
+        yield from _iter_grade_table_chunks(scanner.feed(chunks), year, term)
+    finally:
+        close = getattr(response, "close", None)
+        if callable(close):
+            close()
+
+
+async def get_grades_async(
+    client,
+    year: Any = None,
+    term: Any = None,
+    page: Optional[int] = None,
+    show_count: int = DEFAULT_SHOW_COUNT,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    *,
+    course_type: Any = None,
+    course_name: Any = None,
+    display: Any = None,
+) -> List[Grade]:
+    payload = _grades_payload(year, term, course_type, course_name, display)
+    if page is not None:
+        result = await _fetch_grade_page_async(
+            client, payload, year, term, page, show_count
+        )
+        return result[0]
+
+    url = _build_url("/jsxsd/kscj/cjcx_list")
+    key = flight_key(
+        client, "grade_pages", url, _page_payload(payload, None, show_count), year, term
+    )
+    return await coalesce_async(
+        client,
+        key,
+        lambda: _collect_grade_pages_async(
+            client, payload, year, term, show_count, max_workers
+        ),
+    )
+
+
+async def _collect_grade_pages_async(
+    client,
+    payload: Dict[str, str],
+    year: Any,
+    term: Any,
+    show_count: int,
+    max_workers: int,
+) -> List[Grade]:
+    first, pages = await _fetch_grade_page_async(
+        client, payload, year, term, 1, show_count
+    )
+    seen = _RepeatFilter()
+    grades = _new_rows(first, seen)
+
+    if pages is None:
+        page_grades = first
+        page = 1
+        while len(page_grades) >= show_count > 0:
+            page += 1
+            page_grades, _pages = await _fetch_grade_page_async(
+                client, payload, year, term, page, show_count
+            )
+            fresh = _new_rows(page_grades, seen)
+            if not fresh:
+                break
+            grades.extend(fresh)
+        return grades
+
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _fetch(page: int) -> List[Grade]:
+        async with semaphore:
+            result = await _fetch_grade_page_async(
+                client, payload, year, term, page, show_count
+            )
+            return result[0]
+
+    rest = await asyncio.gather(*(_fetch(page) for page in range(2, pages + 1)))
+    for page_grades in rest:
+        grades.extend(_new_rows(page_grades, seen))
+    return grades
+
+
+def get_grade_detail(
+    client,
+    *,
+    jxb_id: Any,
+    year: Any,
+    term: Any,
+    course_name: str,
+    student_id: Any,
+    student_name: str,
+) -> GradeDetail:
+    detail_url, params, jxb_hint = _parse_jxb_id(jxb_id)
     if not detail_url and params is None:
         detail_url = _resolve_detail_url_from_grades(
             client,
@@ -351,25 +1037,111 @@ def get_grade_detail(
             jxb_hint=jxb_hint,
         )
 
-    if detail_url:
-        response = client.get(_build_url(detail_url))
-    else:
-        if params is None:
-            jxb_value = "" if jxb_id is None else str(jxb_id).strip()
-            student_value = "" if student_id is None else str(student_id).strip()
-            if not jxb_value or not student_value:
-                raise ValueError(
-                    "无法自动定位成绩详情，请提供可用的 --jxb-id，或提供 --course-name/--year/--term 用于自动匹配"
-                )
-            params = {
-                "xs0101id": student_value,
-                "jx0404id": jxb_value,
-            }
-        response = client.get(_build_url("/jsxsd/kscj/pscj_list.do"), params=params)
+    url, params = _detail_request(detail_url, params, jxb_id, student_id)
+    return _fetch_grade_detail(client, url, params, course_name)
 
-    response.encoding = "utf-8"
-    html = response.text or ""
-    breakdown = _parse_breakdown_table(html)
-    return GradeDetail(
-        course_name=str(course_name).strip(), breakdown=breakdown, raw_html=html
-    )
+
+async def get_grade_detail_async(
+    client,
+    *,
+    jxb_id: Any,
+    year: Any,
+    term: Any,
+    course_name: str,
+    student_id: Any,
+    student_name: str,
+) -> GradeDetail:
+    detail_url, params, jxb_hint = _parse_jxb_id(jxb_id)
+    if not detail_url and params is None:
+        detail_url = await _resolve_detail_url_from_grades_async(
+            client,
+            year=year,
+            term=term,
+            course_name=course_name,
+            jxb_hint=jxb_hint,
+        )
+
+    url, params = _detail_request(detail_url, params, jxb_id, student_id)
+    return await _fetch_grade_detail_async(client, url, params, course_name)
+
+
+def _detail_targets(
+    grades: List[Grade], courses: Optional[Iterable[str]]
+) -> List[Tuple[str, str]]:
+    """(course key, detail url) pairs; unmatched or link-less courses are skipped."""
+    targets: List[Tuple[str, str]] = []
+    seen = set()
+    if courses is None:
+        for grade in grades:
+            detail_url = str(grade.raw.get("detail_url", "")).strip()
+            if detail_url and grade.course_name not in seen:
+                seen.add(grade.course_name)
+                targets.append((grade.course_name, detail_url))
+        return targets
+
+    index = CourseIndex(grades)
+    for course in courses:
+        if course in seen:
+            continue
+        seen.add(course)
+        detail_url = _detail_url_from_match(grades, course, None, index=index)
+        if detail_url:
+            targets.append((course, detail_url))
+    return targets
+
+
+def get_grade_details(
+    client,
+    year: Any,
+    term: Any,
+    courses: Optional[Iterable[str]] = None,
+    max_workers: int = DEFAULT_DETAIL_WORKERS,
+) -> Dict[str, GradeDetail]:
+    """Fetch the grade list once, then every course's breakdown concurrently.
+
+    Returns ``{course: GradeDetail}`` keyed by the requested names in their
+    order, or by every graded course with a detail link when ``courses`` is
+    None. Courses without a match or a detail link are left out.
+    """
+    grades = get_grades(client, year=year, term=term)
+    targets = _detail_targets(grades, courses)
+    details = _fetch_target_details(client, targets, max_workers)
+    return {course: detail for (course, _url), detail in zip(targets, details)}
+
+
+def _fetch_target_details(
+    client, targets: List[Tuple[str, str]], max_workers: int
+) -> List[GradeDetail]:
+    """Details for (course, detail url) pairs on a bounded pool, in target order."""
+    if not targets:
+        return []
+
+    def _fetch(target: Tuple[str, str]) -> GradeDetail:
+        course, detail_url = target
+        return _fetch_grade_detail(client, _build_url(detail_url), None, course)
+
+    workers = max(1, min(max_workers, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_fetch, targets))
+
+
+async def get_grade_details_async(
+    client,
+    year: Any,
+    term: Any,
+    courses: Optional[Iterable[str]] = None,
+    max_workers: int = DEFAULT_DETAIL_WORKERS,
+) -> Dict[str, GradeDetail]:
+    grades = await get_grades_async(client, year=year, term=term)
+    targets = _detail_targets(grades, courses)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _fetch(target: Tuple[str, str]) -> GradeDetail:
+        course, detail_url = target
+        async with semaphore:
+            return await _fetch_grade_detail_async(
+                client, _build_url(detail_url), None, course
+            )
+
+    details = await asyncio.gather(*(_fetch(target) for target in targets))
+    return {course: detail for (course, _url), detail in zip(targets, details)}
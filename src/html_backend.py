@@ -0,0 +1,87 @@
+"""HTML parser backend selection and lxml helpers."""
+
+import os
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+BACKENDS = ("lxml", "bs4")
+DEFAULT_BACKEND = "lxml"
+
+T = TypeVar("T")
+Markup = Union[str, bytes, bytearray, memoryview]
+
+_backend: Optional[str] = None
+_HTML_PARSER = lxml.html.HTMLParser()
+_BYTES_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+_TEXT_NODES = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style)]", smart_strings=False
+)
+
+
+def get_parser_backend() -> str:
+    if _backend is not None:
+        return _backend
+    env_backend = os.getenv("GSAU_PARSER_BACKEND", "").strip().lower()
+    if env_backend in BACKENDS:
+        return env_backend
+    return DEFAULT_BACKEND
+
+
+def set_parser_backend(name: Optional[str]) -> None:
+    """Select ``"lxml"`` or ``"bs4"``; ``None`` restores the default/env choice."""
+    global _backend
+    if name is not None and name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    _backend = name
+
+
+def select_parser(parsers: Dict[str, Callable[..., T]]) -> Callable[..., T]:
+    return parsers[get_parser_backend()]
+
+
+def response_body(response: Any) -> Markup:
+    """Undecoded response body, falling back to ``text`` when there is none."""
+    content = getattr(response, "content", None)
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return content
+    if hasattr(response, "encoding"):
+        response.encoding = "utf-8"
+    return getattr(response, "text", None) or ""
+
+
+def parse_document(html: Markup) -> Optional[Any]:
+    """Parse a page with lxml; byte input is decoded as UTF-8 by libxml2."""
+    if not html:
+        return None
+    if not isinstance(html, str):
+        return etree.fromstring(html, _BYTES_PARSER)
+    try:
+        return etree.fromstring(html, _HTML_PARSER)
+    except ValueError:
+        return etree.fromstring(html.encode("utf-8"), _BYTES_PARSER)
+
+
+def make_soup(html: Markup) -> BeautifulSoup:
+    if isinstance(html, str):
+        return BeautifulSoup(html, "lxml")
+    return BeautifulSoup(bytes(html), "lxml", from_encoding="utf-8")
+
+
+def text_nodes(element: Any) -> List[str]:
+    return _TEXT_NODES(element)
+
+
+def node_text(element: Any, separator: str = " ") -> str:
+    """Equivalent of BeautifulSoup's ``get_text(separator, strip=True)``."""
+    return separator.join(
+        stripped
+        for stripped in (text.strip() for text in _TEXT_NODES(element))
+        if stripped
+    )
+
+
+def has_class(element: Any, name: str) -> bool:
+    return name in (element.get("class") or "").split()
@@ -0,0 +1,55 @@
+"""Config-resolved local file paths and the SQLite files kept under them."""
+
+import configparser
+import os
+from pathlib import Path
+import sqlite3
+import stat
+from typing import Iterable
+
+
+def _config_file_path(section: str, env_var: str, default: Path) -> Path:
+    """``env_var``, else ``[section] file`` from config.ini, else ``default``.
+
+    config.ini is looked up in the working directory, then the repo root;
+    only the first one found is read.
+    """
+    env_path = os.getenv(env_var, "")
+    if env_path:
+        return Path(env_path).expanduser()
+
+    config = configparser.ConfigParser()
+    repo_root = Path(__file__).resolve().parents[1]
+    for candidate in (Path.cwd() / "config.ini", repo_root / "config.ini"):
+        if candidate.exists():
+            config.read(candidate, encoding="utf-8")
+            if config.has_section(section):
+                config_path = config.get(section, "file", fallback="").strip()
+                if config_path:
+                    return Path(config_path).expanduser()
+            break
+    return default
+
+
+def _connect_sqlite(
+    path: Path,
+    schema: str,
+    version: int = 0,
+    stale_tables: Iterable[str] = (),
+) -> sqlite3.Connection:
+    """Open ``path`` for use across threads, create ``schema`` and make it private.
+
+    When ``version`` is set and the file's ``user_version`` differs,
+    ``stale_tables`` are dropped first so ``schema`` recreates them in their
+    current layout. Callers guard the connection with their own lock.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    if version and conn.execute("PRAGMA user_version").fetchone()[0] != version:
+        for table in stale_tables:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+    conn.executescript(schema)
+    if os.name != "nt":
+        path.chmod(stat.S_IRUSR | stat.S_IWUSR)
+    return conn
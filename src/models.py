@@ -1,8 +1,100 @@
+import copy
+import sys
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 
-@dataclass
+class RowLayout:
+    """Column key -> index map shared by every row of one table width.
+
+    Keys are interned and, like a dict built column by column, a repeated
+    key resolves to its last column while keeping its first position.
+    """
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: Sequence[str]) -> None:
+        index: Dict[str, int] = {}
+        for position, key in enumerate(keys):
+            index[sys.intern(key)] = position
+        self.index = index
+        self.keys = tuple(index)
+
+
+class RowView(MutableMapping):
+    """Lazy ``raw`` mapping over a shared RowLayout and the row's value tuple.
+
+    Reads never build a dict; the first write materializes a private copy.
+    """
+
+    __slots__ = ("_layout", "_values", "_extra", "_data")
+
+    def __init__(
+        self,
+        layout: RowLayout,
+        values: Tuple[Any, ...],
+        extra: Tuple[Tuple[str, Any], ...] = (),
+    ) -> None:
+        self._layout = layout
+        self._values = values
+        self._extra = extra
+        self._data: Optional[Dict[str, Any]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if self._data is not None:
+            return self._data[key]
+        for extra_key, value in self._extra:
+            if extra_key == key:
+                return value
+        return self._values[self._layout.index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        if self._data is not None:
+            return iter(self._data)
+        return self._iter_keys()
+
+    def _iter_keys(self) -> Iterator[str]:
+        yield from self._layout.keys
+        for key, _value in self._extra:
+            if key not in self._layout.index:
+                yield key
+
+    def __len__(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+        return len(self._layout.keys) + sum(
+            1 for key, _value in self._extra if key not in self._layout.index
+        )
+
+    def __contains__(self, key: object) -> bool:
+        if self._data is not None:
+            return key in self._data
+        return key in self._layout.index or any(
+            extra_key == key for extra_key, _value in self._extra
+        )
+
+    def _materialize(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = {key: self[key] for key in self._iter_keys()}
+            self._values = ()
+            self._extra = ()
+        return self._data
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._materialize()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._materialize()[key]
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return copy.deepcopy(dict(self), memo)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+@dataclass(slots=True)
 class Course:
     name: str
     teacher: Optional[str] = None
@@ -13,7 +105,7 @@ class Course:
     time: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Grade:
     course_name: str
     score: Optional[str] = None
@@ -21,24 +113,31 @@ class Grade:
     grade_point: Optional[float] = None
     year: Optional[str] = None
     term: Optional[str] = None
-    raw: Dict[str, Any] = field(default_factory=dict)
+    raw: MutableMapping = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class GradeDetail:
     course_name: str
     breakdown: Dict[str, Any] = field(default_factory=dict)
     raw_html: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Term:
     year: str
     term: str
     label: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
+class SchedulePage:
+    terms: List[Term] = field(default_factory=list)
+    courses: List[Course] = field(default_factory=list)
+    current: Optional[Term] = None
+
+
+@dataclass(slots=True)
 class ProofTemplate:
     name: str
     manage_id: Optional[str] = None
@@ -46,7 +145,7 @@ class ProofTemplate:
     raw: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProofRecord:
     name: str
     generated_at: Optional[str] = None
@@ -55,3 +154,28 @@ class ProofRecord:
     generation_id: Optional[str] = None
     manage_id: Optional[str] = None
     raw: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class GradeChange:
+    grade: Grade
+    previous: Optional[Grade] = None
+    detail: Optional[GradeDetail] = None
+
+
+@dataclass(slots=True)
+class SyncResult:
+    account: str
+    added: List[GradeChange] = field(default_factory=list)
+    changed: List[GradeChange] = field(default_factory=list)
+    fetched: bool = True
+    initial: bool = False
+
+
+@dataclass(slots=True)
+class Slot:
+    week: int
+    day: int
+    section: int
+    busy: int = 0
+    students: List[str] = field(default_factory=list)
@@ -0,0 +1,95 @@
+"""Content-hash keyed cache of parsed results."""
+
+from collections import OrderedDict
+import functools
+import hashlib
+import pickle
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.html_backend import get_parser_backend  # type: ignore[reportMissingImports]
+
+T = TypeVar("T")
+
+
+def _digest(body: Any) -> Optional[bytes]:
+    if isinstance(body, str):
+        body = body.encode("utf-8", errors="surrogatepass")
+    elif isinstance(body, memoryview):
+        body = body.tobytes()
+    if not isinstance(body, (bytes, bytearray)) or not body:
+        return None
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+class ParseCache:
+    """LRU map from (parser, backend, body hash, arguments) to pickled results.
+
+    The active HTML backend is part of the key, so switching backends never
+    serves results built by the other one. Results are stored pickled so every hit returns fresh model objects that
+    callers may mutate without affecting the cache.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_parse(
+        self, kind: str, body: Any, parse: Callable[..., T], *args: Any
+    ) -> T:
+        digest = _digest(body)
+        if digest is None or self.max_entries <= 0:
+            return parse(body, *args)
+        key = (kind, get_parser_backend(), digest, repr(args))
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if blob is not None:
+            return pickle.loads(blob)
+
+        result = parse(body, *args)
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = blob
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": sum(len(blob) for blob in self._entries.values()),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+PARSE_CACHE = ParseCache()
+
+
+def cached_parse(kind: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Route a ``parse(body, *args)`` function through ``PARSE_CACHE``."""
+
+    def decorator(parse: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(parse)
+        def wrapper(body: Any, *args: Any) -> T:
+            return PARSE_CACHE.get_or_parse(kind, body, parse, *args)
+
+        wrapper.uncached = parse  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,148 @@
+"""Multi-account session pool."""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.client import GSAUClient  # type: ignore[reportMissingImports]
+
+DEFAULT_SESSION_DIR = Path.home() / ".gsau_sessions"
+
+
+def _session_file_name(username: str) -> str:
+    safe = re.sub(r"[^0-9A-Za-z_.-]", "_", username)
+    return f"{safe}.session"
+
+
+class _Account:
+    def __init__(self, username: str, password: str, session_file: Path) -> None:
+        self.username = username
+        self.password = password
+        self.session_file = session_file
+        self.lock = threading.Lock()
+        self.client: Optional[GSAUClient] = None
+
+
+class SessionPool:
+    """Holds many GSAU accounts, each with its own cookie jar and session file.
+
+    Clients are created lazily and handed out through ``acquire``; at most
+    ``max_concurrency`` clients are in use at any time across all accounts.
+    """
+
+    def __init__(
+        self,
+        session_dir: Any = None,
+        max_concurrency: int = 4,
+        timeout: int = 30,
+        client_factory: Callable[..., GSAUClient] = GSAUClient,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.session_dir = Path(session_dir) if session_dir else DEFAULT_SESSION_DIR
+        self.max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._client_factory = client_factory
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._accounts: Dict[str, _Account] = {}
+        self._lock = threading.Lock()
+
+    def add_account(self, username: str, password: str) -> None:
+        username = str(username).strip()
+        if not username:
+            raise ValueError("username is required")
+        with self._lock:
+            existing = self._accounts.get(username)
+            if existing:
+                existing.password = password
+                return
+            session_file = self.session_dir / _session_file_name(username)
+            self._accounts[username] = _Account(username, password, session_file)
+
+    def remove_account(self, username: str) -> None:
+        with self._lock:
+            self._accounts.pop(username, None)
+
+    @property
+    def usernames(self) -> List[str]:
+        with self._lock:
+            return list(self._accounts)
+
+    def _account(self, username: str) -> _Account:
+        with self._lock:
+            account = self._accounts.get(username)
+        if account is None:
+            raise KeyError(f"Unknown account: {username}")
+        return account
+
+    def _client_for(self, account: _Account) -> GSAUClient:
+        if account.client is None:
+            account.client = self._client_factory(
+                username=account.username,
+                password=account.password,
+                prompt=False,
+                timeout=self._timeout,
+                session_file=account.session_file,
+            )
+        return account.client
+
+    @contextmanager
+    def acquire(self, username: str) -> Iterator[GSAUClient]:
+        account = self._account(username)
+        with self._semaphore:
+            with account.lock:
+                client = self._client_for(account)
+                if not client.ensure_login():
+                    raise RuntimeError(f"Login failed for {username}")
+            yield client
+
+    def refresh_stale(self, usernames: Optional[Iterable[str]] = None) -> List[str]:
+        """Re-login only the accounts whose saved session no longer validates.
+
+        Returns the usernames that had to log in again.
+        """
+        targets = list(usernames) if usernames is not None else self.usernames
+
+        def _refresh(username: str) -> Optional[str]:
+            account = self._account(username)
+            with self._semaphore, account.lock:
+                client = self._client_for(account)
+                if getattr(client, "_needs_validation", False):
+                    # A session past its TTL is validated by ensure_login,
+                    # which only logs in again when the check fails.
+                    generation = client._login_generation
+                    if not client.ensure_login():
+                        raise RuntimeError(f"Login failed for {username}")
+                    if client._login_generation == generation:
+                        return None
+                    return username
+                if client._logged_in and client._validate_session():
+                    return None
+                client.session.cookies.clear()
+                client._logged_in = False
+                if not client.login():
+                    raise RuntimeError(f"Login failed for {username}")
+                return username
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = list(executor.map(_refresh, targets))
+        return [username for username in results if username]
+
+    def map(
+        self,
+        func: Callable[[GSAUClient], Any],
+        usernames: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """Run ``func(client)`` for each account under the concurrency limit."""
+        targets = list(usernames) if usernames is not None else self.usernames
+
+        def _run(username: str) -> Any:
+            with self.acquire(username) as client:
+                return func(client)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = list(executor.map(_run, targets))
+        return dict(zip(targets, results))
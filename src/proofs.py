@@ -1,13 +1,24 @@
 """Proof generation helpers."""
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import os
 import re
 from urllib.parse import unquote, urlparse
 
-from bs4 import BeautifulSoup
-
+from src.html_backend import (  # type: ignore[reportMissingImports]
+    Markup,
+    make_soup,
+    node_text,
+    parse_document,
+    response_body,
+    select_parser,
+)
 from src.models import ProofRecord, ProofTemplate  # type: ignore[reportMissingImports]
+from src.singleflight import (  # type: ignore[reportMissingImports]
+    coalesce,
+    coalesce_async,
+    flight_key,
+)
 
 BASE_URL = "https://jwgl.gsau.edu.cn"
 
@@ -69,10 +80,8 @@ def _extract_filename(content_disposition: str) -> Optional[str]:
     return None
 
 
-def get_proof_templates(client) -> List[ProofTemplate]:
-    response = client.get(_build_url("/jsxsd/kxzm/kxzm_manage"))
-    response.encoding = "utf-8"
-    soup = BeautifulSoup(response.text or "", "lxml")
+def _parse_proof_templates_bs4(html: Markup) -> List[ProofTemplate]:
+    soup = make_soup(html or "")
     table = soup.find("table")
     if not table:
         return []
@@ -110,10 +119,8 @@ def get_proof_templates(client) -> List[ProofTemplate]:
     return templates
 
 
-def get_proof_history(client) -> List[ProofRecord]:
-    response = client.get(_build_url("/jsxsd/kxzm/kxzm_generationsView"))
-    response.encoding = "utf-8"
-    soup = BeautifulSoup(response.text or "", "lxml")
+def _parse_proof_history_bs4(html: Markup) -> List[ProofRecord]:
+    soup = make_soup(html or "")
     table = soup.find("table")
     if not table:
         return []
@@ -160,8 +167,113 @@ def get_proof_history(client) -> List[ProofRecord]:
     return records
 
 
-def download_proof(client, download_url, output_path=None):
-    response = client.get(_build_url(download_url))
+def _first_table(html: Markup) -> Optional[Any]:
+    doc = parse_document(html)
+    if doc is None:
+        return None
+    return next(doc.iter("table"), None)
+
+
+def _parse_proof_templates_lxml(html: Markup) -> List[ProofTemplate]:
+    table = _first_table(html)
+    if table is None:
+        return []
+
+    templates: List[ProofTemplate] = []
+    for row in table.iter("tr"):
+        cells = list(row.iter("td"))
+        if len(cells) < 3:
+            continue
+
+        name = _clean_text(node_text(cells[1]))
+        if not name:
+            continue
+
+        action_path = None
+        action_links = cells[2].xpath(".//a[@onclick]")
+        if action_links:
+            action_path = _extract_operate_path(action_links[0].get("onclick", ""))
+
+        raw: Dict[str, str] = {
+            "index": _clean_text(node_text(cells[0])),
+            "name": name,
+            "action_text": _clean_text(node_text(cells[2])),
+        }
+
+        templates.append(
+            ProofTemplate(
+                name=name,
+                manage_id=_extract_query_value(action_path, "manageid"),
+                action=action_path,
+                raw=raw,
+            )
+        )
+
+    return templates
+
+
+def _parse_proof_history_lxml(html: Markup) -> List[ProofRecord]:
+    table = _first_table(html)
+    if table is None:
+        return []
+
+    records: List[ProofRecord] = []
+    for row in table.iter("tr"):
+        cells = list(row.iter("td"))
+        if len(cells) < 6:
+            continue
+
+        name = _clean_text(node_text(cells[1]))
+        if not name:
+            continue
+
+        preview_path = None
+        download_path = None
+        for link in cells[5].iter("a"):
+            href = link.get("href", "")
+            onclick = link.get("onclick", "")
+            preview_path = preview_path or _extract_open_window_path(href)
+            download_path = download_path or _extract_operate_path(onclick)
+
+        raw: Dict[str, str] = {
+            "index": _clean_text(node_text(cells[0])),
+            "name": name,
+            "generated_at": _clean_text(node_text(cells[2])),
+            "generator": _clean_text(node_text(cells[3])),
+            "status": _clean_text(node_text(cells[4])),
+            "actions": _clean_text(node_text(cells[5])),
+        }
+
+        records.append(
+            ProofRecord(
+                name=name,
+                generated_at=raw["generated_at"] or None,
+                preview_url=preview_path,
+                download_url=download_path,
+                generation_id=_extract_query_value(preview_path, "generationid"),
+                manage_id=_extract_query_value(download_path, "manageid"),
+                raw=raw,
+            )
+        )
+
+    return records
+
+
+def _parse_proof_templates(html: Markup) -> List[ProofTemplate]:
+    parse = select_parser(
+        {"bs4": _parse_proof_templates_bs4, "lxml": _parse_proof_templates_lxml}
+    )
+    return parse(html)
+
+
+def _parse_proof_history(html: Markup) -> List[ProofRecord]:
+    parse = select_parser(
+        {"bs4": _parse_proof_history_bs4, "lxml": _parse_proof_history_lxml}
+    )
+    return parse(html)
+
+
+def _resolve_output_path(response, download_url, output_path) -> str:
     filename = _extract_filename(response.headers.get("Content-Disposition", ""))
     if not filename:
         parsed = urlparse(download_url or "")
@@ -169,11 +281,75 @@ def download_proof(client, download_url, output_path=None):
 
     if output_path:
         if os.path.isdir(output_path):
-            final_path = os.path.join(output_path, filename)
-        else:
-            final_path = output_path
-    else:
-        final_path = filename
+            return os.path.join(output_path, filename)
+        return output_path
+    return filename
+
+
+def get_proof_templates(client) -> List[ProofTemplate]:
+    url = _build_url("/jsxsd/kxzm/kxzm_manage")
+
+    def _fetch() -> List[ProofTemplate]:
+        response = client.get(url)
+        return _parse_proof_templates(response_body(response))
+
+    return coalesce(client, flight_key(client, "proof_templates", url), _fetch)
+
+
+async def get_proof_templates_async(client) -> List[ProofTemplate]:
+    url = _build_url("/jsxsd/kxzm/kxzm_manage")
+
+    async def _fetch() -> List[ProofTemplate]:
+        response = await client.get(url)
+        return _parse_proof_templates(response_body(response))
+
+    key = flight_key(client, "proof_templates", url)
+    return await coalesce_async(client, key, _fetch)
+
+
+def get_proof_history(client) -> List[ProofRecord]:
+    url = _build_url("/jsxsd/kxzm/kxzm_generationsView")
+
+    def _fetch() -> List[ProofRecord]:
+        response = client.get(url)
+        return _parse_proof_history(response_body(response))
+
+    return coalesce(client, flight_key(client, "proof_history", url), _fetch)
+
+
+async def get_proof_history_async(client) -> List[ProofRecord]:
+    url = _build_url("/jsxsd/kxzm/kxzm_generationsView")
+
+    async def _fetch() -> List[ProofRecord]:
+        response = await client.get(url)
+        return _parse_proof_history(response_body(response))
+
+    key = flight_key(client, "proof_history", url)
+    return await coalesce_async(client, key, _fetch)
+
+
+def download_proof(client, download_url, output_path=None, chunk_size=64 * 1024):
+    response = client.get(_build_url(download_url), stream=True)
+    try:
+        final_path = _resolve_output_path(response, download_url, output_path)
+        with open(final_path, "wb") as file_handle:
+            if hasattr(response, "iter_content"):
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        file_handle.write(chunk)
+            else:
+                file_handle.write(response.content)
+    finally:
+        close = getattr(response, "close", None)
+        if callable(close):
+            close()
+
+    return final_path
+
+
+async def download_proof_async(client, download_url, output_path=None):
+    response = await client.get(_build_url(download_url))
+    final_path = _resolve_output_path(response, download_url, output_path)
 
     with open(final_path, "wb") as file_handle:
         file_handle.write(response.content)
@@ -1,14 +1,36 @@
 """Schedule fetching helpers."""
 
-from typing import Any, List, Optional, Tuple
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import re
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from src.models import Course, Term  # type: ignore[reportMissingImports]
+from src.html_backend import (  # type: ignore[reportMissingImports]
+    Markup,
+    make_soup,
+    node_text,
+    parse_document,
+    response_body,
+    select_parser,
+    text_nodes,
+)
+from src.models import (  # type: ignore[reportMissingImports]
+    Course,
+    SchedulePage,
+    Term,
+)
+from src.parse_cache import cached_parse  # type: ignore[reportMissingImports]
+from src.singleflight import (  # type: ignore[reportMissingImports]
+    coalesce,
+    coalesce_async,
+    flight_key,
+)
 
 BASE_URL = "https://jwgl.gsau.edu.cn"
+DEFAULT_TERM_WORKERS = 4
 
 
 def _build_url(path: str) -> str:
@@ -45,14 +67,24 @@ def _dedupe(items: List[str]) -> List[str]:
     return result
 
 
-def _parse_cell_entries(cell_html: str) -> List[List[str]]:
-    entries = []
-    for part in re.split(r"-{5,}", cell_html):
-        text = BeautifulSoup(part, "lxml").get_text("\n")
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        lines = [line.replace("\xa0", " ").strip() for line in lines if line]
-        if lines:
-            entries.append(lines)
+_ENTRY_SEPARATOR = re.compile(r"-{5,}")
+
+
+def _entries_from_texts(texts: Iterable[str]) -> List[List[str]]:
+    entries: List[List[str]] = []
+    current: List[str] = []
+    for text in texts:
+        for index, piece in enumerate(_ENTRY_SEPARATOR.split(text)):
+            if index:
+                if current:
+                    entries.append(current)
+                current = []
+            for line in piece.splitlines():
+                line = line.strip()
+                if line:
+                    current.append(line.replace("\xa0", " ").strip())
+    if current:
+        entries.append(current)
     return entries
 
 
@@ -112,8 +144,11 @@ def _parse_course_lines(lines: List[str], day: int) -> Optional[Course]:
     )
 
 
-def _parse_schedule_html(html: str) -> List[Course]:
-    soup = BeautifulSoup(html, "lxml")
+def _parse_schedule_html_bs4(html: Markup) -> List[Course]:
+    return _courses_from_soup(make_soup(html))
+
+
+def _courses_from_soup(soup) -> List[Course]:
     courses: List[Course] = []
     for row in soup.find_all("tr"):
         header = row.find("th")
@@ -126,14 +161,49 @@ def _parse_schedule_html(html: str) -> List[Course]:
             content = cell.find("div", class_="kbcontent")
             if not content:
                 continue
-            cell_html = content.decode_contents()
-            for lines in _parse_cell_entries(cell_html):
+            for lines in _entries_from_texts(content.strings):
                 course = _parse_course_lines(lines, day_index)
                 if course:
                     courses.append(course)
     return courses
 
 
+_KBCONTENT = etree.XPath(
+    ".//div[contains(concat(' ', normalize-space(@class), ' '), ' kbcontent ')]"
+)
+
+
+def _parse_schedule_html_lxml(html: Markup) -> List[Course]:
+    doc = parse_document(html)
+    if doc is None:
+        return []
+    return _courses_from_doc(doc)
+
+
+def _courses_from_doc(doc) -> List[Course]:
+    courses: List[Course] = []
+    for row in doc.iter("tr"):
+        if next(row.iter("th"), None) is None:
+            continue
+        for day_index, cell in enumerate(row.iter("td"), start=1):
+            contents = _KBCONTENT(cell)
+            if not contents:
+                continue
+            for lines in _entries_from_texts(text_nodes(contents[0])):
+                course = _parse_course_lines(lines, day_index)
+                if course:
+                    courses.append(course)
+    return courses
+
+
+@cached_parse("schedule")
+def _parse_schedule_html(html: Markup) -> List[Course]:
+    parse = select_parser(
+        {"bs4": _parse_schedule_html_bs4, "lxml": _parse_schedule_html_lxml}
+    )
+    return parse(html)
+
+
 def _split_term_value(value: str) -> Tuple[str, str]:
     parts = [part for part in value.split("-") if part]
     if len(parts) >= 3:
@@ -143,14 +213,19 @@ def _split_term_value(value: str) -> Tuple[str, str]:
     return value, ""
 
 
-def _parse_term_options(html: str) -> List[Term]:
-    soup = BeautifulSoup(html, "lxml")
+def _parse_term_options_bs4(html: Markup) -> List[Term]:
+    return _terms_from_soup(make_soup(html))[0]
+
+
+def _terms_from_soup(soup) -> Tuple[List[Term], Optional[Term]]:
+    """Term options and the selected (current) one, if any."""
     select = soup.find("select", attrs={"name": "xnxq01id"}) or soup.find(
         "select", id="xnxq01id"
     )
     if not select:
-        return []
+        return [], None
     results: List[Term] = []
+    current: Optional[Term] = None
     for option in select.find_all("option"):
         value = str(option.get("value", "")).strip()
         if not value:
@@ -158,20 +233,220 @@ def _parse_term_options(html: str) -> List[Term]:
         year_value, term_value = _split_term_value(value)
         label = option.get_text(strip=True) or None
         results.append(Term(year=year_value, term=term_value, label=label))
-    return results
+        if option.has_attr("selected"):
+            current = results[-1]
+    return results, current
 
 
-def get_schedule(client, year: Any, term: Any) -> List[Course]:
+def _parse_term_options_lxml(html: Markup) -> List[Term]:
+    doc = parse_document(html)
+    if doc is None:
+        return []
+    return _terms_from_doc(doc)[0]
+
+
+def _terms_from_doc(doc) -> Tuple[List[Term], Optional[Term]]:
+    """Term options and the selected (current) one, if any."""
+    selects = doc.xpath("//select[@name='xnxq01id']") or doc.xpath(
+        "//select[@id='xnxq01id']"
+    )
+    if not selects:
+        return [], None
+    results: List[Term] = []
+    current: Optional[Term] = None
+    for option in selects[0].iter("option"):
+        value = (option.get("value") or "").strip()
+        if not value:
+            continue
+        year_value, term_value = _split_term_value(value)
+        label = node_text(option, "") or None
+        results.append(Term(year=year_value, term=term_value, label=label))
+        if option.get("selected") is not None:
+            current = results[-1]
+    return results, current
+
+
+@cached_parse("terms")
+def _parse_term_options(html: Markup) -> List[Term]:
+    parse = select_parser(
+        {"bs4": _parse_term_options_bs4, "lxml": _parse_term_options_lxml}
+    )
+    return parse(html)
+
+
+def _parse_schedule_page_bs4(html: Markup) -> SchedulePage:
+    soup = make_soup(html)
+    terms, current = _terms_from_soup(soup)
+    return SchedulePage(terms, _courses_from_soup(soup), current)
+
+
+def _parse_schedule_page_lxml(html: Markup) -> SchedulePage:
+    doc = parse_document(html)
+    if doc is None:
+        return SchedulePage([], [])
+    terms, current = _terms_from_doc(doc)
+    return SchedulePage(terms, _courses_from_doc(doc), current)
+
+
+@cached_parse("schedule_page")
+def _parse_schedule_page(html: Markup) -> SchedulePage:
+    parse = select_parser(
+        {"bs4": _parse_schedule_page_bs4, "lxml": _parse_schedule_page_lxml}
+    )
+    return parse(html)
+
+
+def _schedule_payload(year: Any, term: Any) -> Dict[str, str]:
     term_id = _build_term_id(year, term)
-    payload = {"xnxq01id": term_id} if term_id else {}
-    response = client.post(_build_url("/jsxsd/xskb/xskb_list.do"), data=payload)
-    if hasattr(response, "encoding"):
-        response.encoding = "utf-8"
-    return _parse_schedule_html(response.text)
+    return {"xnxq01id": term_id} if term_id else {}
+
+
+def get_schedule(client, year: Any, term: Any) -> List[Course]:
+    url = _build_url("/jsxsd/xskb/xskb_list.do")
+    payload = _schedule_payload(year, term)
+
+    def _fetch() -> List[Course]:
+        response = client.post(url, data=payload)
+        return _parse_schedule_html(response_body(response))
+
+    return coalesce(client, flight_key(client, "schedule", url, payload), _fetch)
+
+
+async def get_schedule_async(client, year: Any, term: Any) -> List[Course]:
+    url = _build_url("/jsxsd/xskb/xskb_list.do")
+    payload = _schedule_payload(year, term)
+
+    async def _fetch() -> List[Course]:
+        response = await client.post(url, data=payload)
+        return _parse_schedule_html(response_body(response))
+
+    key = flight_key(client, "schedule", url, payload)
+    return await coalesce_async(client, key, _fetch)
+
+
+def _with_current(page: SchedulePage, payload: Dict[str, str]) -> SchedulePage:
+    """Fall back to the posted term when the page marks no option selected."""
+    if not payload or page.current is not None:
+        return page
+    current = next(
+        (
+            option
+            for option in page.terms
+            if _build_term_id(option.year, option.term) == payload["xnxq01id"]
+        ),
+        None,
+    )
+    return SchedulePage(page.terms, page.courses, current)
+
+
+def get_schedule_page(client, year: Any = None, term: Any = None) -> SchedulePage:
+    """Terms and courses parsed from one schedule page response.
+
+    Without ``year``/``term`` the page is fetched with a GET, which the server
+    answers with the current term selected, so ``current`` and ``courses``
+    describe that term. With them, the term is posted as in ``get_schedule``.
+    """
+    url = _build_url("/jsxsd/xskb/xskb_list.do")
+    payload = _schedule_payload(year, term)
+
+    def _fetch() -> SchedulePage:
+        if payload:
+            response = client.post(url, data=payload)
+        else:
+            response = client.get(url)
+        return _with_current(_parse_schedule_page(response_body(response)), payload)
+
+    return coalesce(client, flight_key(client, "schedule_page", url, payload), _fetch)
+
+
+async def get_schedule_page_async(
+    client, year: Any = None, term: Any = None
+) -> SchedulePage:
+    url = _build_url("/jsxsd/xskb/xskb_list.do")
+    payload = _schedule_payload(year, term)
+
+    async def _fetch() -> SchedulePage:
+        if payload:
+            response = await client.post(url, data=payload)
+        else:
+            response = await client.get(url)
+        return _with_current(_parse_schedule_page(response_body(response)), payload)
+
+    key = flight_key(client, "schedule_page", url, payload)
+    return await coalesce_async(client, key, _fetch)
 
 
 def get_terms(client) -> List[Term]:
-    response = client.get(_build_url("/jsxsd/xskb/xskb_list.do"))
-    if hasattr(response, "encoding"):
-        response.encoding = "utf-8"
-    return _parse_term_options(response.text)
+    url = _build_url("/jsxsd/xskb/xskb_list.do")
+
+    def _fetch() -> List[Term]:
+        response = client.get(url)
+        return _parse_term_options(response_body(response))
+
+    return coalesce(client, flight_key(client, "terms", url), _fetch)
+
+
+async def get_terms_async(client) -> List[Term]:
+    url = _build_url("/jsxsd/xskb/xskb_list.do")
+
+    async def _fetch() -> List[Term]:
+        response = await client.get(url)
+        return _parse_term_options(response_body(response))
+
+    return await coalesce_async(client, flight_key(client, "terms", url), _fetch)
+
+
+def get_all_schedules(
+    client,
+    terms: Optional[Iterable[Term]] = None,
+    max_workers: int = DEFAULT_TERM_WORKERS,
+) -> Dict[Term, List[Course]]:
+    """Schedules for ``terms`` (every available term when None).
+
+    Terms are fetched concurrently on a bounded pool sharing the client's
+    session; the result keeps the term order. When the terms come from the
+    server, the current term's courses are taken from that same page.
+    """
+    known: Dict[Term, List[Course]] = {}
+    if terms is None:
+        page = get_schedule_page(client)
+        terms = page.terms
+        if page.current is not None:
+            known[page.current] = page.courses
+    term_list = list(dict.fromkeys(terms))
+    if not term_list:
+        return {}
+    missing = [term for term in term_list if term not in known]
+
+    def _fetch(term: Term) -> List[Course]:
+        return get_schedule(client, term.year, term.term)
+
+    if missing:
+        workers = max(1, min(max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            known.update(zip(missing, executor.map(_fetch, missing)))
+    return {term: known[term] for term in term_list}
+
+
+async def get_all_schedules_async(
+    client,
+    terms: Optional[Iterable[Term]] = None,
+    max_workers: int = DEFAULT_TERM_WORKERS,
+) -> Dict[Term, List[Course]]:
+    known: Dict[Term, List[Course]] = {}
+    if terms is None:
+        page = await get_schedule_page_async(client)
+        terms = page.terms
+        if page.current is not None:
+            known[page.current] = page.courses
+    term_list = list(dict.fromkeys(terms))
+    missing = [term for term in term_list if term not in known]
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _fetch(term: Term) -> List[Course]:
+        async with semaphore:
+            return await get_schedule_async(client, term.year, term.term)
+
+    schedules = await asyncio.gather(*(_fetch(term) for term in missing))
+    known.update(zip(missing, schedules))
+    return {term: known[term] for term in term_list}
@@ -0,0 +1,140 @@
+"""Week/section occupancy bitmaps over a parsed schedule."""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.models import Course  # type: ignore[reportMissingImports]
+
+DAYS = 7
+DEFAULT_WEEKS = 20
+
+
+@lru_cache(maxsize=1024)
+def _token_mask(token: str) -> int:
+    start, _, end = token.partition("-")
+    try:
+        first = int(start)
+        last = int(end) if end else first
+    except ValueError:
+        return 0
+    if first > last:
+        first, last = last, first
+    if first < 1:
+        return 0
+    return ((1 << (last - first + 1)) - 1) << first
+
+
+def range_mask(tokens: Iterable[str]) -> int:
+    """Bitmask of the numbers in tokens like ``"1-16"`` or ``"3"``; bit n is n."""
+    mask = 0
+    for token in tokens:
+        mask |= _token_mask(str(token).strip())
+    return mask
+
+
+def mask_values(mask: int) -> List[int]:
+    """Numbers whose bits are set in ``mask``, ascending."""
+    values = []
+    while mask:
+        low = mask & -mask
+        values.append(low.bit_length() - 1)
+        mask ^= low
+    return values
+
+
+def _day_of(course: Course) -> Optional[int]:
+    try:
+        day = int(str(course.day).strip())
+    except (TypeError, ValueError):
+        return None
+    return day if 1 <= day <= DAYS else None
+
+
+class ScheduleIndex:
+    """Courses compiled into per-day week and section bitmasks.
+
+    Weeks, days and sections are 1-based, matching the strings in
+    ``Course.weeks``/``Course.sections`` and ``Course.day``. A course without
+    week ranges is taken to meet every week. ``occupancy[day][week]`` is the
+    bitmask of busy sections, so busy checks are a list lookup and a shift.
+    """
+
+    def __init__(self, courses: Sequence[Course], weeks: Optional[int] = None) -> None:
+        self.courses = list(courses)
+        self.week_masks: List[int] = []
+        self.section_masks: List[int] = []
+        self.days: List[Optional[int]] = []
+        parsed = [range_mask(course.weeks) for course in self.courses]
+        self.weeks = weeks or max(
+            [DEFAULT_WEEKS] + [mask.bit_length() - 1 for mask in parsed]
+        )
+        every_week = ((1 << self.weeks) - 1) << 1
+        self.occupancy: List[List[int]] = [
+            [0] * (self.weeks + 1) for _day in range(DAYS + 1)
+        ]
+        self._by_day: Dict[int, List[int]] = {day: [] for day in range(1, DAYS + 1)}
+
+        for position, course in enumerate(self.courses):
+            week_mask = (parsed[position] or every_week) & every_week
+            section_mask = range_mask(course.sections)
+            day = _day_of(course)
+            self.week_masks.append(week_mask)
+            self.section_masks.append(section_mask)
+            self.days.append(day)
+            if day is None or not section_mask:
+                continue
+            self._by_day[day].append(position)
+            row = self.occupancy[day]
+            for week in mask_values(week_mask):
+                row[week] |= section_mask
+
+    def sections_busy(self, week: int, day: int) -> int:
+        """Bitmask of occupied sections on ``day`` of ``week``."""
+        if not (1 <= day <= DAYS and 1 <= week <= self.weeks):
+            return 0
+        return self.occupancy[day][week]
+
+    def is_busy(self, week: int, day: int, section: int) -> bool:
+        return bool(self.sections_busy(week, day) >> section & 1)
+
+    def at(self, week: int, day: int, section: int) -> List[Course]:
+        """Courses meeting in ``section`` on ``day`` of ``week``."""
+        if not self.is_busy(week, day, section):
+            return []
+        week_bit, section_bit = 1 << week, 1 << section
+        return [
+            self.courses[position]
+            for position in self._by_day[day]
+            if self.week_masks[position] & week_bit
+            and self.section_masks[position] & section_bit
+        ]
+
+    def week_view(self, week: int) -> Dict[int, List[Course]]:
+        """Courses meeting in ``week``, by day and ordered by first section."""
+        week_bit = 1 << week
+        view: Dict[int, List[Course]] = {}
+        for day, positions in self._by_day.items():
+            meeting = [
+                position
+                for position in positions
+                if self.week_masks[position] & week_bit
+            ]
+            meeting.sort(
+                key=lambda position: self.section_masks[position]
+                & -self.section_masks[position]
+            )
+            view[day] = [self.courses[position] for position in meeting]
+        return view
+
+    def conflicts(self) -> List[Tuple[Course, Course]]:
+        """Pairs of courses sharing a day, a week and a section."""
+        pairs: List[Tuple[Course, Course]] = []
+        for positions in self._by_day.values():
+            for offset, first in enumerate(positions):
+                for second in positions[offset + 1 :]:
+                    if (
+                        self.week_masks[first] & self.week_masks[second]
+                        and self.section_masks[first] & self.section_masks[second]
+                    ):
+                        pairs.append((self.courses[first], self.courses[second]))
+        return pairs
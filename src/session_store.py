@@ -0,0 +1,118 @@
+"""Cross-process safe session file storage."""
+
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import stat
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None  # type: ignore[assignment]
+
+
+def atomic_write_text(path: Path, text: str, private: bool = False) -> None:
+    """Write ``text`` to a temp file next to ``path`` and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if private and os.name != "nt":
+            os.chmod(tmp_name, stat.S_IRUSR | stat.S_IWUSR)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class SessionStore:
+    """Session file guarded by an advisory lock on a sibling ``.lock`` file.
+
+    Writes go through a temp file and ``os.replace`` so readers never see a
+    partially written session; the lock serializes logins across processes.
+    """
+
+    def __init__(self, path: Any, lock_timeout: float = 120.0) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.lock_timeout = lock_timeout
+        self._lock_handle = None
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        return data
+
+    def write(self, data: Dict[str, Any]) -> None:
+        atomic_write_text(self.path, json.dumps(data, indent=2), private=True)
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _try_lock(self, handle) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self) -> None:
+        if self._lock_handle is not None:
+            raise RuntimeError("SessionStore lock is already held")
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_path, "a+")
+        deadline = time.monotonic() + self.lock_timeout
+        while not self._try_lock(handle):
+            if time.monotonic() >= deadline:
+                handle.close()
+                raise TimeoutError(f"Timed out waiting for {self.lock_path}")
+            time.sleep(0.05)
+        self._lock_handle = handle
+
+    def release(self) -> None:
+        handle = self._lock_handle
+        if handle is None:
+            return
+        self._lock_handle = None
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            handle.close()
+
+    @contextmanager
+    def lock(self) -> Iterator["SessionStore"]:
+        self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
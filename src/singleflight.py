@@ -0,0 +1,96 @@
+"""Single-flight coalescing of identical in-flight fetches."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run ``fn`` once per key; concurrent callers with that key share the result."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        assert call is not None
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """asyncio variant of SingleFlight; callers share one task per key."""
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _done: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(
+            sorted((str(key), _canonical(item)) for key, item in value.items())
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(item) for item in value)
+    return value if value is None else str(value)
+
+
+def flight_key(client: Any, kind: str, url: str, *parts: Any) -> Tuple[Any, ...]:
+    account_key = getattr(client, "_account_key", None)
+    account = account_key() if callable(account_key) else id(client)
+    return (kind, account, url) + tuple(_canonical(part) for part in parts)
+
+
+def coalesce(client: Any, key: Hashable, fn: Callable[[], T]) -> T:
+    flights = getattr(client, "flights", None)
+    if not isinstance(flights, SingleFlight):
+        return fn()
+    return flights.do(key, fn)
+
+
+async def coalesce_async(
+    client: Any, key: Hashable, fn: Callable[[], Awaitable[T]]
+) -> T:
+    flights = getattr(client, "flights", None)
+    if not isinstance(flights, AsyncSingleFlight):
+        return await fn()
+    return await flights.do(key, fn)
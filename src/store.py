@@ -0,0 +1,514 @@
+"""Local SQLite store of parsed grades, schedules, terms and proofs."""
+
+import json
+from pathlib import Path
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.grades import _normalize_term  # type: ignore[reportMissingImports]
+from src.local_files import (  # type: ignore[reportMissingImports]
+    _config_file_path,
+    _connect_sqlite,
+)
+from src.models import (  # type: ignore[reportMissingImports]
+    Course,
+    Grade,
+    GradeDetail,
+    ProofRecord,
+    ProofTemplate,
+    Term,
+)
+
+DEFAULT_STORE_FILE = Path.home() / ".gsau_store.sqlite3"
+
+# Version 2 keys grades by list position, so rows sharing a course are kept.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS grades (
+    account TEXT NOT NULL,
+    year TEXT NOT NULL,
+    term TEXT NOT NULL,
+    course_name TEXT NOT NULL,
+    detail_url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    score TEXT,
+    credits REAL,
+    grade_point REAL,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (account, year, term, position)
+);
+CREATE INDEX IF NOT EXISTS grades_lookup ON grades (account, year, term, course_name);
+CREATE TABLE IF NOT EXISTS grade_details (
+    account TEXT NOT NULL,
+    year TEXT NOT NULL,
+    term TEXT NOT NULL,
+    course_name TEXT NOT NULL,
+    breakdown TEXT NOT NULL,
+    PRIMARY KEY (account, year, term, course_name)
+);
+CREATE TABLE IF NOT EXISTS courses (
+    account TEXT NOT NULL,
+    year TEXT NOT NULL,
+    term TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    teacher TEXT,
+    location TEXT,
+    day TEXT,
+    sections TEXT NOT NULL,
+    weeks TEXT NOT NULL,
+    time TEXT,
+    PRIMARY KEY (account, year, term, position)
+);
+CREATE INDEX IF NOT EXISTS courses_lookup ON courses (account, year, term, name);
+CREATE TABLE IF NOT EXISTS terms (
+    account TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    year TEXT NOT NULL,
+    term TEXT NOT NULL,
+    label TEXT,
+    PRIMARY KEY (account, position)
+);
+CREATE TABLE IF NOT EXISTS proof_templates (
+    account TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    manage_id TEXT,
+    action TEXT,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (account, position)
+);
+CREATE TABLE IF NOT EXISTS proof_records (
+    account TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    generated_at TEXT,
+    preview_url TEXT,
+    download_url TEXT,
+    generation_id TEXT,
+    manage_id TEXT,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (account, position)
+);
+"""
+
+
+def default_store_path() -> Path:
+    return _config_file_path("store", "GSAU_STORE_FILE", DEFAULT_STORE_FILE)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(dict(value), ensure_ascii=False, separators=(",", ":"))
+
+
+def _scope(year: Any, term: Any) -> Tuple[str, str]:
+    year_text = "" if year is None else str(year).strip()
+    return year_text, _normalize_term(term)
+
+
+def _scope_filter(year: Any, term: Any) -> Tuple[str, List[str]]:
+    """SQL condition and arguments narrowing a query to ``year``/``term``."""
+    year_text, term_text = _scope(year, term)
+    clauses, args = ["account = ?"], []
+    if year_text:
+        clauses.append("year = ?")
+        args.append(year_text)
+    if term_text:
+        clauses.append("term = ?")
+        args.append(term_text)
+    return " AND ".join(clauses), args
+
+
+class LocalStore:
+    """Parsed rows per account, replaced in bulk and queried through indexes.
+
+    Each ``save_*`` call runs in one transaction and replaces the rows of the
+    scope it covers (one term's grades or schedule, an account's terms or
+    proofs), so the store always mirrors the latest successful fetch.
+    """
+
+    def __init__(self, path: Any = None) -> None:
+        self.path = Path(path) if path else default_store_path()
+        self._lock = threading.Lock()
+        self._conn = _connect_sqlite(
+            self.path, _SCHEMA, _SCHEMA_VERSION, stale_tables=("grades",)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _replace(
+        self,
+        table: str,
+        columns: Sequence[str],
+        where: str,
+        where_args: Sequence[Any],
+        rows: Iterable[Sequence[Any]],
+    ) -> None:
+        placeholders = ", ".join("?" for _column in columns)
+        with self._lock, self._conn:
+            if where:
+                self._conn.execute(f"DELETE FROM {table} WHERE {where}", where_args)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+
+    def _select(self, sql: str, args: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def save_grades(
+        self,
+        account: str,
+        grades: Sequence[Grade],
+        year: Any = None,
+        term: Any = None,
+        replace: bool = True,
+    ) -> None:
+        """Store a grade list; ``replace`` drops the scope's older rows first.
+
+        Pass ``replace=False`` for server-filtered lists, which only upsert
+        the rows they contain: each row overwrites the next stored row with
+        the same course and detail url in its term, or is appended after the
+        term's last row.
+        """
+        where, args = _scope_filter(year, term)
+        if replace:
+            positions = list(range(len(grades)))
+        else:
+            positions = self._upsert_positions(account, grades)
+        rows = []
+        for position, grade in zip(positions, grades):
+            raw = dict(grade.raw)
+            rows.append(
+                (
+                    account,
+                    grade.year or "",
+                    grade.term or "",
+                    grade.course_name,
+                    str(raw.get("detail_url", "")).strip(),
+                    position,
+                    grade.score,
+                    grade.credits,
+                    grade.grade_point,
+                    _dumps(raw),
+                )
+            )
+        self._replace(
+            "grades",
+            (
+                "account",
+                "year",
+                "term",
+                "course_name",
+                "detail_url",
+                "position",
+                "score",
+                "credits",
+                "grade_point",
+                "raw",
+            ),
+            where if replace else "",
+            [account, *args] if replace else [],
+            rows,
+        )
+
+    def _upsert_positions(self, account: str, grades: Sequence[Grade]) -> List[int]:
+        slots: Dict[Tuple[str, ...], List[int]] = {}
+        next_position: Dict[Tuple[str, str], int] = {}
+        for position, year, term, course_name, detail_url in self._select(
+            "SELECT position, year, term, course_name, detail_url FROM grades "
+            "WHERE account = ? ORDER BY position DESC",
+            [account],
+        ):
+            slots.setdefault((year, term, course_name, detail_url), []).append(position)
+            next_position.setdefault((year, term), position + 1)
+
+        positions = []
+        for grade in grades:
+            scope = (grade.year or "", grade.term or "")
+            detail_url = str(grade.raw.get("detail_url", "")).strip()
+            free = slots.get((*scope, grade.course_name, detail_url))
+            if free:
+                positions.append(free.pop())
+                continue
+            position = next_position.get(scope, 0)
+            next_position[scope] = position + 1
+            positions.append(position)
+        return positions
+
+    def grades(
+        self,
+        account: str,
+        year: Any = None,
+        term: Any = None,
+        course_name: Optional[str] = None,
+    ) -> List[Grade]:
+        where, args = _scope_filter(year, term)
+        if course_name:
+            where += " AND course_name LIKE ?"
+            args.append(f"%{course_name.strip()}%")
+        rows = self._select(
+            "SELECT course_name, score, credits, grade_point, year, term, raw "
+            f"FROM grades WHERE {where} ORDER BY year, term, position",
+            [account, *args],
+        )
+        return [
+            Grade(
+                course_name=course_name,
+                score=score,
+                credits=credits,
+                grade_point=grade_point,
+                year=year or None,
+                term=term or None,
+                raw=json.loads(raw),
+            )
+            for course_name, score, credits, grade_point, year, term, raw in rows
+        ]
+
+    def save_grade_detail(
+        self, account: str, year: Any, term: Any, detail: GradeDetail
+    ) -> None:
+        year_text, term_text = _scope(year, term)
+        self._replace(
+            "grade_details",
+            ("account", "year", "term", "course_name", "breakdown"),
+            "",
+            [],
+            [
+                (
+                    account,
+                    year_text,
+                    term_text,
+                    detail.course_name,
+                    _dumps(detail.breakdown),
+                )
+            ],
+        )
+
+    def grade_details(
+        self,
+        account: str,
+        year: Any = None,
+        term: Any = None,
+        course_name: Optional[str] = None,
+    ) -> List[GradeDetail]:
+        where, args = _scope_filter(year, term)
+        if course_name:
+            where += " AND course_name = ?"
+            args.append(course_name.strip())
+        rows = self._select(
+            f"SELECT course_name, breakdown FROM grade_details WHERE {where} "
+            "ORDER BY year, term, course_name",
+            [account, *args],
+        )
+        return [
+            GradeDetail(course_name=name, breakdown=json.loads(breakdown))
+            for name, breakdown in rows
+        ]
+
+    def save_schedule(
+        self, account: str, year: Any, term: Any, courses: Sequence[Course]
+    ) -> None:
+        year_text, term_text = _scope(year, term)
+        self._replace(
+            "courses",
+            (
+                "account",
+                "year",
+                "term",
+                "position",
+                "name",
+                "teacher",
+                "location",
+                "day",
+                "sections",
+                "weeks",
+                "time",
+            ),
+            "account = ? AND year = ? AND term = ?",
+            [account, year_text, term_text],
+            [
+                (
+                    account,
+                    year_text,
+                    term_text,
+                    position,
+                    course.name,
+                    course.teacher,
+                    course.location,
+                    course.day,
+                    json.dumps(course.sections, ensure_ascii=False),
+                    json.dumps(course.weeks, ensure_ascii=False),
+                    course.time,
+                )
+                for position, course in enumerate(courses)
+            ],
+        )
+
+    def schedule(self, account: str, year: Any, term: Any) -> List[Course]:
+        year_text, term_text = _scope(year, term)
+        rows = self._select(
+            "SELECT name, teacher, location, day, sections, weeks, time FROM courses "
+            "WHERE account = ? AND year = ? AND term = ? ORDER BY position",
+            [account, year_text, term_text],
+        )
+        return [
+            Course(
+                name=name,
+                teacher=teacher,
+                location=location,
+                day=day,
+                sections=json.loads(sections),
+                weeks=json.loads(weeks),
+                time=time,
+            )
+            for name, teacher, location, day, sections, weeks, time in rows
+        ]
+
+    def schedules(self, year: Any, term: Any) -> Dict[str, List[Course]]:
+        """Stored schedules of every account for one term, keyed by account."""
+        year_text, term_text = _scope(year, term)
+        accounts = self._select(
+            "SELECT DISTINCT account FROM courses WHERE year = ? AND term = ? "
+            "ORDER BY account",
+            [year_text, term_text],
+        )
+        return {
+            account: self.schedule(account, year_text, term_text)
+            for (account,) in accounts
+        }
+
+    def save_terms(self, account: str, terms: Sequence[Term]) -> None:
+        self._replace(
+            "terms",
+            ("account", "position", "year", "term", "label"),
+            "account = ?",
+            [account],
+            [
+                (account, position, term.year, term.term, term.label)
+                for position, term in enumerate(terms)
+            ],
+        )
+
+    def terms(self, account: str) -> List[Term]:
+        rows = self._select(
+            "SELECT year, term, label FROM terms WHERE account = ? ORDER BY position",
+            [account],
+        )
+        return [Term(year=year, term=term, label=label) for year, term, label in rows]
+
+    def save_proof_templates(
+        self, account: str, templates: Sequence[ProofTemplate]
+    ) -> None:
+        self._replace(
+            "proof_templates",
+            ("account", "position", "name", "manage_id", "action", "raw"),
+            "account = ?",
+            [account],
+            [
+                (
+                    account,
+                    position,
+                    template.name,
+                    template.manage_id,
+                    template.action,
+                    _dumps(template.raw),
+                )
+                for position, template in enumerate(templates)
+            ],
+        )
+
+    def proof_templates(self, account: str) -> List[ProofTemplate]:
+        rows = self._select(
+            "SELECT name, manage_id, action, raw FROM proof_templates "
+            "WHERE account = ? ORDER BY position",
+            [account],
+        )
+        return [
+            ProofTemplate(
+                name=name, manage_id=manage_id, action=action, raw=json.loads(raw)
+            )
+            for name, manage_id, action, raw in rows
+        ]
+
+    def save_proof_records(self, account: str, records: Sequence[ProofRecord]) -> None:
+        self._replace(
+            "proof_records",
+            (
+                "account",
+                "position",
+                "name",
+                "generated_at",
+                "preview_url",
+                "download_url",
+                "generation_id",
+                "manage_id",
+                "raw",
+            ),
+            "account = ?",
+            [account],
+            [
+                (
+                    account,
+                    position,
+                    record.name,
+                    record.generated_at,
+                    record.preview_url,
+                    record.download_url,
+                    record.generation_id,
+                    record.manage_id,
+                    _dumps(record.raw),
+                )
+                for position, record in enumerate(records)
+            ],
+        )
+
+    def proof_records(self, account: str) -> List[ProofRecord]:
+        rows = self._select(
+            "SELECT name, generated_at, preview_url, download_url, generation_id, "
+            "manage_id, raw FROM proof_records WHERE account = ? ORDER BY position",
+            [account],
+        )
+        return [
+            ProofRecord(
+                name=name,
+                generated_at=generated_at,
+                preview_url=preview_url,
+                download_url=download_url,
+                generation_id=generation_id,
+                manage_id=manage_id,
+                raw=json.loads(raw),
+            )
+            for (
+                name,
+                generated_at,
+                preview_url,
+                download_url,
+                generation_id,
+                manage_id,
+                raw,
+            ) in rows
+        ]
+
+    def clear(self, account: Optional[str] = None) -> None:
+        tables = (
+            "grades",
+            "grade_details",
+            "courses",
+            "terms",
+            "proof_templates",
+            "proof_records",
+        )
+        with self._lock, self._conn:
+            for table in tables:
+                if account is None:
+                    self._conn.execute(f"DELETE FROM {table}")
+                else:
+                    self._conn.execute(
+                        f"DELETE FROM {table} WHERE account = ?", (account,)
+                    )
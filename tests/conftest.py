@@ -0,0 +1,10 @@
+import pytest
+
+from src.parse_cache import PARSE_CACHE
+
+
+@pytest.fixture(autouse=True)
+def _clear_parse_cache():
+    PARSE_CACHE.clear()
+    yield
+    PARSE_CACHE.clear()
@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+
+from src.async_client import AsyncGSAUClient
+
+LOGIN_PAGE = """
+<html><body>
+<input type="hidden" id="pwdEncryptSalt" value="abcdefghijklmnop" />
+<div id="pwdLoginDiv">
+  <input type="hidden" name="execution" value="EXEC123" />
+</div>
+</body></html>
+"""
+
+
+def _login_handler(calls):
+    def handler(request):
+        calls.append((request.method, str(request.url)))
+        url = str(request.url)
+        if request.method == "GET" and url == AsyncGSAUClient.LOGIN_ENTRY_URL:
+            return httpx.Response(200, text=LOGIN_PAGE)
+        if request.method == "POST" and url == AsyncGSAUClient.LOGIN_POST_URL:
+            body = request.content.decode("utf-8")
+            assert "execution=EXEC123" in body
+            assert "username=20240001" in body
+            return httpx.Response(
+                200,
+                text="<script>window.location.href='https://jwgl.gsau.edu.cn/jsxsd/'</script>",
+                headers={"Set-Cookie": "JSESSIONID=abc; Path=/"},
+            )
+        if url == AsyncGSAUClient.AUTH_TEST_URL:
+            return httpx.Response(200, text="<html>main</html>")
+        return httpx.Response(200, text="<html>ok</html>")
+
+    return handler
+
+
+def _make_client(handler, **kwargs):
+    client = AsyncGSAUClient(prompt=False, **kwargs)
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_async_login_follows_cas_flow_and_saves_session(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+    calls = []
+
+    async def run():
+        async with _make_client(
+            _login_handler(calls), username="20240001", password="secret"
+        ) as client:
+            return await client.login()
+
+    assert asyncio.run(run()) is True
+    assert ("POST", AsyncGSAUClient.LOGIN_POST_URL) in calls
+    assert ("GET", "https://jwgl.gsau.edu.cn/jsxsd/") in calls
+    assert session_file.exists()
+
+
+def test_async_client_restores_session_lazily(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    session_file.write_text('{"cookies": {"JSESSIONID": "abc"}}', encoding="utf-8")
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        assert request.headers.get("Cookie") == "JSESSIONID=abc"
+        return httpx.Response(200, text="<html>data</html>")
+
+    async def run():
+        client = _make_client(handler)
+        assert calls == []
+        response = await client.get("https://jwgl.gsau.edu.cn/jsxsd/kxzm/kxzm_manage")
+        await client.aclose()
+        return response
+
+    response = asyncio.run(run())
+
+    assert response.text == "<html>data</html>"
+    assert calls == [
+        AsyncGSAUClient.AUTH_TEST_URL,
+        "https://jwgl.gsau.edu.cn/jsxsd/kxzm/kxzm_manage",
+    ]
+
+
+def test_async_login_fails_without_credentials(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(tmp_path / "session"))
+    monkeypatch.delenv("GSAU_USERNAME", raising=False)
+    monkeypatch.delenv("GSAU_PASSWORD", raising=False)
+    monkeypatch.setattr(AsyncGSAUClient, "_config_credentials", lambda self: ("", ""))
+
+    async def run():
+        client = _make_client(_login_handler([]))
+        try:
+            return await client.ensure_login()
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) is False
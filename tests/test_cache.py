@@ -0,0 +1,138 @@
+from datetime import date
+import time
+
+from src.cache import (
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+    current_term,
+    is_past_term,
+)
+from src.client import GSAUClient
+
+GRADES_URL = "https://jwgl.gsau.edu.cn/jsxsd/kscj/cjcx_list"
+TERMS_URL = "https://jwgl.gsau.edu.cn/jsxsd/xskb/xskb_list.do"
+
+
+class FakeHTTPResponse:
+    def __init__(self, url, content=b"<html>ok</html>", status_code=200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.headers = {
+            "Content-Type": "text/html;charset=UTF-8",
+            "Set-Cookie": "JSESSIONID=secret",
+        }
+        self.history = []
+
+
+def test_cache_key_ignores_payload_order_but_not_account():
+    first = cache_key("post", GRADES_URL, data={"kksj": "2024-2025-1", "kcxz": ""})
+    second = cache_key("POST", GRADES_URL, data={"kcxz": "", "kksj": "2024-2025-1"})
+    other = cache_key(
+        "POST", GRADES_URL, data={"kksj": "2024-2025-1", "kcxz": ""}, account="u2"
+    )
+
+    assert first == second
+    assert first != other
+
+
+def test_cache_roundtrip_and_ttl_expiry(tmp_path):
+    cache = ResponseCache(
+        tmp_path / "cache.sqlite3", ttls={"/jsxsd/kscj/cjcx_list": 60}
+    )
+
+    assert cache.ttl_for(GRADES_URL, {"kksj": "2020-2021-1"}) == 60
+    assert cache.ttl_for("https://jwgl.gsau.edu.cn/jsxsd/other") is None
+
+    cache.set("k", FakeHTTPResponse(GRADES_URL, "成绩".encode("utf-8")), ttl=60)
+    cached = cache.get("k")
+
+    assert isinstance(cached, CachedResponse)
+    assert cached.text == "成绩"
+    assert cached.headers.get("content-type") == "text/html;charset=UTF-8"
+    assert cached.headers.get("Set-Cookie") is None
+
+    cache.set("stale", FakeHTTPResponse(GRADES_URL), ttl=-1)
+    assert cache.get("stale") is None
+
+
+def test_grade_lists_are_cached_for_past_terms_only(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    year, term = current_term()
+    current = f"{year}-{year + 1}-{term}"
+
+    assert cache.ttl_for(GRADES_URL, {"kksj": "2020-2021-2"}) == 15 * 60
+    assert cache.ttl_for(GRADES_URL, {"kksj": current}) is None
+    assert cache.ttl_for(GRADES_URL, {"kksj": ""}) is None
+    assert cache.ttl_for(GRADES_URL) is None
+    assert cache.ttl_for(TERMS_URL) == 6 * 60 * 60
+
+
+def test_current_term_boundaries():
+    assert current_term(date(2024, 9, 1)) == (2024, 1)
+    assert current_term(date(2025, 1, 20)) == (2024, 1)
+    assert current_term(date(2025, 2, 20)) == (2024, 2)
+    assert current_term(date(2025, 8, 31)) == (2024, 2)
+    assert is_past_term("2024-2025-1", date(2025, 3, 1))
+    assert not is_past_term("2024-2025-2", date(2025, 3, 1))
+    assert not is_past_term("2025-2026-1", date(2025, 3, 1))
+    assert not is_past_term("全部", date(2025, 3, 1))
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=25)
+    cache.set("a", FakeHTTPResponse(GRADES_URL, b"x" * 10), ttl=60)
+    time.sleep(0.01)
+    cache.set("b", FakeHTTPResponse(GRADES_URL, b"y" * 10), ttl=60)
+    time.sleep(0.01)
+    assert cache.get("a") is not None
+    time.sleep(0.01)
+    cache.set("c", FakeHTTPResponse(GRADES_URL, b"z" * 10), ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_client_serves_cached_response_without_login(monkeypatch, tmp_path):
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(tmp_path / "session"))
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    client = GSAUClient(username="20240001", prompt=False, cache=cache)
+    client._logged_in = True
+    sent = []
+
+    def fake_request(method, url, **kwargs):
+        sent.append((method, url, kwargs.get("data")))
+        return FakeHTTPResponse(url, b"<html>grades</html>")
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+
+    first = client.post(GRADES_URL, data={"kksj": "2024-2025-1"})
+    client._logged_in = False
+    monkeypatch.setattr(client, "login", lambda: False)
+    second = client.post(GRADES_URL, data={"kksj": "2024-2025-1"})
+
+    assert len(sent) == 1
+    assert first.content == second.content == b"<html>grades</html>"
+    assert second.from_cache is True
+
+
+def test_client_bypass_refetches_and_refreshes_entry(monkeypatch, tmp_path):
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(tmp_path / "session"))
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    client = GSAUClient(username="20240001", prompt=False, cache=cache)
+    client._logged_in = True
+    bodies = [b"<html>old</html>", b"<html>new</html>"]
+    monkeypatch.setattr(
+        client.session,
+        "request",
+        lambda method, url, **kwargs: FakeHTTPResponse(url, bodies.pop(0)),
+    )
+
+    client.get(TERMS_URL)
+    fresh = client.get(TERMS_URL, bypass_cache=True)
+    replay = client.get(TERMS_URL)
+
+    assert fresh.content == b"<html>new</html>"
+    assert replay.content == b"<html>new</html>"
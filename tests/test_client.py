@@ -1,6 +1,11 @@
+import json
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
-from src.client import GSAUClient
+import pytest
+
+from src.client import GSAUClient, _ClientBase, _is_expired_response
 
 
 def test_resolve_credentials_prefers_env_then_config(monkeypatch, tmp_path):
@@ -133,3 +138,198 @@ def test_load_session_returns_false_on_invalid_json(monkeypatch, tmp_path):
     loaded = client._load_session()
 
     assert loaded is False
+
+
+class FakeHTTPResponse:
+    def __init__(self, *, status_code=200, url="", content=b"", headers=None):
+        self.status_code = status_code
+        self.url = url
+        self.content = content
+        self.headers = headers or {"Content-Type": "text/html;charset=UTF-8"}
+        self.history = []
+
+
+def _write_session(path, saved_at, ttl=None):
+    data = {"cookies": {"JSESSIONID": "abc"}, "saved_at": saved_at.isoformat()}
+    if ttl is not None:
+        data["ttl"] = ttl
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def _no_network(*args, **kwargs):
+    raise AssertionError("unexpected network round-trip")
+
+
+def test_recent_session_is_trusted_without_validation(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    _write_session(session_file, datetime.now() - timedelta(seconds=30))
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+    monkeypatch.setattr(GSAUClient, "_validate_session", _no_network)
+
+    client = GSAUClient(prompt=False)
+
+    assert client._logged_in is True
+    assert client.ensure_login() is True
+
+
+def test_stale_session_is_validated_on_first_request(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    _write_session(session_file, datetime.now() - timedelta(hours=2), ttl=600)
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+    calls = []
+
+    def fake_validate(self):
+        calls.append("validate")
+        return True
+
+    monkeypatch.setattr(GSAUClient, "_validate_session", fake_validate)
+
+    client = GSAUClient(prompt=False)
+    assert calls == []
+    assert client._logged_in is False
+
+    assert client.ensure_login() is True
+    assert calls == ["validate"]
+    assert client._session_ttl >= 2 * 60 * 60 - 1
+    saved = json.loads(session_file.read_text(encoding="utf-8"))
+    assert saved["ttl"] == client._session_ttl
+
+
+def test_expired_response_triggers_relogin_and_single_retry(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    _write_session(session_file, datetime.now() - timedelta(seconds=900))
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+
+    client = GSAUClient(prompt=False)
+    responses = [
+        FakeHTTPResponse(
+            url="https://authserver.gsau.edu.cn/authserver/login",
+            content=b'<div id="pwdLoginDiv"></div>',
+        ),
+        FakeHTTPResponse(url="https://jwgl.gsau.edu.cn/jsxsd/kscj/cjcx_list"),
+    ]
+    requests_made = []
+
+    def fake_request(method, url, **kwargs):
+        requests_made.append((method, url))
+        return responses.pop(0)
+
+    logins = []
+
+    def fake_login():
+        logins.append(True)
+        client._logged_in = True
+        return True
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    monkeypatch.setattr(client, "login", fake_login)
+
+    response = client.post("https://jwgl.gsau.edu.cn/jsxsd/kscj/cjcx_list", data={})
+
+    assert response.url == "https://jwgl.gsau.edu.cn/jsxsd/kscj/cjcx_list"
+    assert len(requests_made) == 2
+    assert logins == [True]
+    assert client._session_ttl < 900
+
+
+def test_expired_redirect_in_history_is_detected():
+    redirect = FakeHTTPResponse(
+        status_code=302,
+        headers={"Location": "https://authserver.gsau.edu.cn/authserver/login"},
+    )
+    final = FakeHTTPResponse(url="https://web.gsau.edu.cn/login", content=b"ok")
+    final.history = [redirect]
+
+    assert _is_expired_response(final) is True
+    assert _is_expired_response(FakeHTTPResponse(content=b"<html>ok</html>")) is False
+
+
+def test_session_roundtrip_keeps_cookie_domain_path_and_flags(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+    expires = int(time.time()) + 3600
+
+    client = GSAUClient(prompt=False)
+    client._username = "testuser"
+    client.session.cookies.set(
+        "JSESSIONID", "auth", domain="authserver.gsau.edu.cn", path="/authserver"
+    )
+    client.session.cookies.set(
+        "JSESSIONID",
+        "jwgl",
+        domain="jwgl.gsau.edu.cn",
+        path="/jsxsd",
+        secure=True,
+        expires=expires,
+        rest={"HttpOnly": None},
+    )
+    client._save_session()
+
+    saved = json.loads(session_file.read_text(encoding="utf-8"))
+    assert saved["version"] == 2
+
+    client2 = GSAUClient(prompt=False)
+    client2.session.cookies.clear()
+    assert client2._load_session() is True
+
+    restored = {cookie.domain: cookie for cookie in client2.session.cookies}
+    assert restored["authserver.gsau.edu.cn"].value == "auth"
+    assert restored["authserver.gsau.edu.cn"].path == "/authserver"
+    jwgl = restored["jwgl.gsau.edu.cn"]
+    assert jwgl.value == "jwgl"
+    assert jwgl.path == "/jsxsd"
+    assert jwgl.secure is True
+    assert jwgl.expires == expires
+    assert jwgl.has_nonstandard_attr("HttpOnly")
+
+
+def test_load_session_drops_expired_cookies(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    now = int(time.time())
+    data = {
+        "version": 2,
+        "cookies": [
+            {
+                "name": "old",
+                "value": "1",
+                "domain": "jwgl.gsau.edu.cn",
+                "expires": now - 10,
+            },
+            {
+                "name": "live",
+                "value": "2",
+                "domain": "jwgl.gsau.edu.cn",
+                "expires": now + 600,
+            },
+        ],
+    }
+    session_file.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+
+    client = GSAUClient(prompt=False)
+
+    names = [cookie.name for cookie in client.session.cookies]
+    assert names == ["live"]
+
+
+def test_load_session_rejects_file_with_only_expired_cookies(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    data = {
+        "version": 2,
+        "cookies": [{"name": "old", "value": "1", "expires": int(time.time()) - 10}],
+    }
+    session_file.write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+
+    client = GSAUClient(prompt=False)
+
+    assert client._load_session() is False
+
+
+def test_client_base_requires_cookie_hooks():
+    class Incomplete(_ClientBase):
+        def _cookie_jar(self):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
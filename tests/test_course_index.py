@@ -0,0 +1,87 @@
+from src.course_index import (  # type: ignore[reportMissingImports]
+    CourseIndex,
+    normalize_course_name,
+)
+from src.models import Grade  # type: ignore[reportMissingImports]
+
+
+def _grade(name, detail_url=None):
+    raw = {"detail_url": detail_url} if detail_url else {}
+    return Grade(course_name=name, raw=raw)
+
+
+def _index():
+    return CourseIndex(
+        [
+            _grade("高等数学（一）", "/pscj_list.do?jx0404id=M1"),
+            _grade("高等数学（二）", "/pscj_list.do?jx0404id=M2"),
+            _grade("数学建模"),
+            _grade("Linear  Algebra"),
+            _grade("C语言程序设计"),
+            _grade("体育"),
+            _grade("大学英语", "/pscj_list.do?jx0404id=E1"),
+            _grade("大学英语", "/pscj_list.do?jx0404id=E2"),
+        ]
+    )
+
+
+def test_normalize_course_name_ignores_width_case_and_punctuation():
+    assert normalize_course_name(" 高等数学（一） ") == "高等数学一"
+    assert normalize_course_name("Linear  Algebra") == "linearalgebra"
+    assert normalize_course_name("Ｃ语言·程序设计") == "c语言程序设计"
+
+
+def test_exact_match_beats_containment():
+    index = _index()
+
+    assert index.match("高等数学(一)").course_name == "高等数学（一）"
+    assert index.match("linear algebra").course_name == "Linear  Algebra"
+
+
+def test_containment_candidates_rank_by_similarity_then_order():
+    index = _index()
+
+    names = [grade.course_name for grade in index.candidates("数学")]
+
+    assert names == ["数学建模", "高等数学（一）", "高等数学（二）"]
+    assert index.match("C 语言程序设计基础").course_name == "C语言程序设计"
+    assert index.match("体").course_name == "体育"
+
+
+def test_similarity_tier_only_suggests_candidates():
+    index = _index()
+
+    assert index.match("程序设计C语言") is None
+    assert [grade.course_name for grade in index.candidates("程序设计C语言")] == [
+        "C语言程序设计"
+    ]
+    assert index.match("大学物理") is None
+    assert index.match("") is None
+
+
+def test_numbered_courses_never_match_each_other():
+    index = CourseIndex([_grade("高等数学A(2)"), _grade("大学英语4")])
+
+    assert index.match("高等数学A(1)") is None
+    assert index.match("大学英语3") is None
+    assert [grade.course_name for grade in index.candidates("大学英语3")] == [
+        "大学英语4"
+    ]
+    assert index.match("高等数学A（2）").course_name == "高等数学A(2)"
+
+
+def test_jxb_hint_breaks_ties_between_duplicates():
+    index = _index()
+
+    assert index.match("大学英语").raw["detail_url"].endswith("E1")
+    assert index.match("大学英语", jxb_hint="E2").raw["detail_url"].endswith("E2")
+    assert index.match("高等数学", jxb_hint="M2").course_name == "高等数学（二）"
+
+
+def test_index_is_reusable_for_bulk_lookups():
+    grades = [_grade(f"课程{number}") for number in range(500)]
+    index = CourseIndex(grades)
+
+    matches = [index.match(f"课程{number}") for number in range(500)]
+
+    assert matches == grades
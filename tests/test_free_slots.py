@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from src.free_slots import (  # type: ignore[reportMissingImports]
+    CohortSchedule,
+    parse_number_ranges,
+)
+from src.models import Course  # type: ignore[reportMissingImports]
+from src.schedule_index import ScheduleIndex  # type: ignore[reportMissingImports]
+
+
+def _schedules():
+    return {
+        "s1": [Course("高等数学", day="1", sections=["1-2"], weeks=["1-16"])],
+        "s2": [
+            Course("大学英语", day="1", sections=["3-4"], weeks=["1-8"]),
+            Course("体育", day="2", sections=["1-2"], weeks=["1-16"]),
+        ],
+    }
+
+
+def test_free_slots_are_free_for_everyone():
+    cohort = CohortSchedule(_schedules(), weeks=16, sections=4)
+
+    monday = [slot.section for slot in cohort.free_slots(weeks=[1], days=[1], length=1)]
+    assert monday == []
+    week9 = [slot.section for slot in cohort.free_slots(weeks=[9], days=[1])]
+    assert week9 == [3, 4]
+    tuesday = cohort.free_slots(weeks=[1], days=[2], length=2)
+    assert [(slot.week, slot.day, slot.section) for slot in tuesday] == [(1, 2, 3)]
+
+
+def test_least_conflict_ranks_by_busy_students():
+    cohort = CohortSchedule(_schedules(), weeks=16, sections=4)
+
+    ranked = cohort.least_conflict(limit=3, weeks=[1], days=[1, 2], length=2)
+
+    assert [(slot.day, slot.section, slot.busy) for slot in ranked] == [
+        (2, 3, 0),
+        (1, 1, 1),
+        (1, 3, 1),
+    ]
+    assert ranked[0].students == []
+    assert ranked[2].students == ["s2"]
+
+
+@pytest.mark.parametrize("length", [0, -3, 5])
+def test_rejects_lengths_outside_the_day(length):
+    cohort = CohortSchedule(_schedules(), weeks=16, sections=4)
+
+    with pytest.raises(ValueError):
+        cohort.free_slots(weeks=[1], days=[1], length=length)
+    with pytest.raises(ValueError):
+        cohort.least_conflict(weeks=[1], days=[1], length=length)
+
+
+def test_bitset_counts_match_brute_force():
+    rng = random.Random(7)
+    schedules = {}
+    for student in range(60):
+        courses = []
+        for _course in range(rng.randint(0, 8)):
+            first = rng.randint(1, 11)
+            start_week = rng.randint(1, 10)
+            courses.append(
+                Course(
+                    f"c{_course}",
+                    day=str(rng.randint(1, 7)),
+                    sections=[f"{first}-{first + 1}"],
+                    weeks=[f"{start_week}-{start_week + rng.randint(0, 8)}"],
+                )
+            )
+        schedules[f"s{student}"] = courses
+    cohort = CohortSchedule(schedules)
+    indexes = {
+        name: ScheduleIndex(courses, weeks=20) for name, courses in schedules.items()
+    }
+
+    def busy(week, day, section, length):
+        return sorted(
+            name
+            for name, index in indexes.items()
+            if any(
+                index.is_busy(week, day, section + offset) for offset in range(length)
+            )
+        )
+
+    for length in (1, 2):
+        ranked = cohort.least_conflict(limit=25, length=length)
+        counts = [slot.busy for slot in ranked]
+        assert counts == sorted(counts)
+        for slot in ranked:
+            assert sorted(slot.students) == busy(
+                slot.week, slot.day, slot.section, length
+            )
+            assert slot.busy == len(slot.students)
+        free = cohort.free_slots(weeks=[3], length=length)
+        expected = [
+            (3, day, section)
+            for day in range(1, 8)
+            for section in range(1, 13 - length + 1)
+            if not busy(3, day, section, length)
+        ]
+        assert [(slot.week, slot.day, slot.section) for slot in free] == expected
+
+
+def test_parse_number_ranges():
+    assert parse_number_ranges("1-3,5") == [1, 2, 3, 5]
+    assert parse_number_ranges("") is None
@@ -0,0 +1,179 @@
+import sqlite3
+
+from src.grade_sync import GradeSync  # type: ignore[reportMissingImports]
+
+
+class FakeResponse:
+    def __init__(self, text=""):
+        self.text = text
+        self.encoding = None
+
+
+def _list_html(rows):
+    body = "".join(
+        f"<tr><td>2024-2025-1</td><td>{name}</td><td>{score}</td>"
+        f"<td><a href=\"javascript:openWindow('/jsxsd/kscj/pscj_list.do?jx0404id={jxb}')\">详情</a></td></tr>"
+        for name, score, jxb in rows
+    )
+    return (
+        "<table><tr><th>学年学期</th><th>课程名称</th><th>成绩</th><th>详情</th></tr>"
+        f"{body}</table>"
+    )
+
+
+class SyncClient:
+    def __init__(self, account="20240001"):
+        self.account = account
+        self.rows = []
+        self.posts = 0
+        self.gets = []
+
+    def _account_key(self):
+        return self.account
+
+    def post(self, url, data=None):
+        self.posts += 1
+        return FakeResponse(_list_html(self.rows))
+
+    def get(self, url, params=None):
+        self.gets.append(url)
+        return FakeResponse(
+            "<table><tr><th>平时</th><th>期末</th></tr><tr><td>90</td><td>80</td></tr></table>"
+        )
+
+
+def test_first_sync_records_baseline_without_fetching_details(tmp_path):
+    sync = GradeSync(tmp_path / "sync.sqlite3")
+    client = SyncClient()
+    client.rows = [("高等数学", "90", "A"), ("大学英语", "80", "B")]
+
+    result = sync.sync(client)
+
+    assert result.initial
+    assert [change.grade.course_name for change in result.added] == [
+        "高等数学",
+        "大学英语",
+    ]
+    assert client.gets == []
+    assert [grade.course_name for grade in sync.known_grades("20240001")] == [
+        "大学英语",
+        "高等数学",
+    ]
+
+
+def test_sync_reports_added_and_changed_and_fetches_new_details(tmp_path):
+    sync = GradeSync(tmp_path / "sync.sqlite3")
+    client = SyncClient()
+    client.rows = [("高等数学", "", "A"), ("大学英语", "80", "B")]
+    sync.sync(client)
+
+    client.rows = [
+        ("高等数学", "92", "A"),
+        ("大学英语", "80", "B"),
+        ("体育", "85", "C"),
+    ]
+    result = sync.sync(client)
+
+    assert not result.initial
+    assert [change.grade.course_name for change in result.added] == ["体育"]
+    assert result.added[0].detail.breakdown == {"平时": "90", "期末": "80"}
+    assert len(result.changed) == 1
+    changed = result.changed[0]
+    assert changed.grade.score == "92"
+    assert changed.previous.score is None
+    assert client.gets == [
+        "https://jwgl.gsau.edu.cn/jsxsd/kscj/pscj_list.do?jx0404id=C"
+    ]
+
+
+def test_unchanged_list_skips_diff_and_min_interval_skips_request(tmp_path):
+    sync = GradeSync(tmp_path / "sync.sqlite3")
+    client = SyncClient()
+    client.rows = [("高等数学", "90", "A")]
+    sync.sync(client)
+
+    again = sync.sync(client)
+
+    assert again.fetched
+    assert again.added == [] and again.changed == []
+    assert client.posts == 2
+
+    throttled = GradeSync(tmp_path / "sync.sqlite3", min_interval=3600)
+    skipped = throttled.sync(client)
+
+    assert not skipped.fetched
+    assert client.posts == 2
+
+
+def test_sync_state_is_per_account_and_can_be_forgotten(tmp_path):
+    sync = GradeSync(tmp_path / "sync.sqlite3")
+    first, second = SyncClient("s1"), SyncClient("s2")
+    first.rows = second.rows = [("高等数学", "90", "A")]
+
+    sync.sync(first)
+    result = sync.sync(second)
+
+    assert result.initial
+    sync.forget("s1")
+    assert sync.known_grades("s1") == []
+    assert len(sync.known_grades("s2")) == 1
+
+
+def test_duplicate_course_rows_are_tracked_separately(tmp_path):
+    sync = GradeSync(tmp_path / "sync.sqlite3")
+    client = SyncClient()
+    client.rows = [("体育", "55", "P"), ("体育", "70", "P"), ("高等数学", "", "A")]
+
+    first = sync.sync(client)
+
+    assert [change.grade.score for change in first.added] == ["55", "70", None]
+    assert first.changed == []
+
+    client.rows = [("体育", "55", "P"), ("体育", "70", "P"), ("高等数学", "90", "A")]
+    second = sync.sync(client)
+
+    assert second.added == []
+    assert [change.grade.course_name for change in second.changed] == ["高等数学"]
+    assert sorted(grade.score for grade in sync.known_grades("20240001")) == [
+        "55",
+        "70",
+        "90",
+    ]
+
+
+def test_older_state_layout_is_reset(tmp_path):
+    path = tmp_path / "sync.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE grade_state (account TEXT, course_name TEXT, year TEXT, "
+        "term TEXT, detail_url TEXT, score TEXT, credits REAL, grade_point REAL, "
+        "seen_at REAL)"
+    )
+    conn.commit()
+    conn.close()
+
+    sync = GradeSync(path)
+    client = SyncClient()
+    client.rows = [("体育", "55", "P")]
+
+    assert sync.sync(client).initial
+
+
+def test_first_sync_of_another_scope_is_a_baseline(tmp_path):
+    sync = GradeSync(tmp_path / "sync.sqlite3")
+    client = SyncClient()
+    client.rows = [("高等数学", "90", "A")]
+    sync.sync(client, "2024-2025", "1")
+
+    client.rows = [("线性代数", "85", "B"), ("体育", "70", "C")]
+    result = sync.sync(client, "2024-2025", "2")
+
+    assert result.initial
+    assert client.gets == []
+
+    client.rows.append(("物理", "75", "D"))
+    later = sync.sync(client, "2024-2025", "2")
+
+    assert not later.initial
+    assert [change.grade.course_name for change in later.added] == ["物理"]
+    assert len(client.gets) == 1
@@ -0,0 +1,88 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.grade_table import GradeTable  # noqa: E402
+from src.models import Grade  # noqa: E402
+
+
+def _grades():
+    return [
+        Grade("高等数学", "90", 4.0, 4.0, "2023-2024", "1"),
+        Grade("大学英语", "55", 2.0, 0.0, "2023-2024", "1"),
+        Grade("线性代数", "良好", 3.0, 3.0, "2023-2024", "2"),
+        Grade("体育", "不及格", 1.0, None, "2024-2025", "1"),
+        Grade("形势与政策", "通过", None, None, "2024-2025", "1"),
+    ]
+
+
+def test_grade_table_stores_columns_as_arrays():
+    table = GradeTable.from_grades(_grades())
+
+    assert len(table) == 5
+    assert table.credits.dtype == np.float64
+    assert math.isnan(table.credits[4])
+    assert table.terms == ["2023-2024-1", "2023-2024-2", "2024-2025-1"]
+    assert table.term_codes.tolist() == [0, 0, 1, 2, 2]
+
+
+def test_grade_table_weighted_gpa_aggregates():
+    table = GradeTable.from_grades(_grades())
+
+    assert table.gpa() == pytest.approx((16 + 0 + 9) / 9)
+    assert table.gpa_by_term() == {
+        "2023-2024-1": pytest.approx(16 / 6),
+        "2023-2024-2": pytest.approx(3.0),
+        "2024-2025-1": None,
+    }
+    assert table.cumulative_gpa() == {
+        "2023-2024-1": pytest.approx(16 / 6),
+        "2023-2024-2": pytest.approx(25 / 9),
+        "2024-2025-1": pytest.approx(25 / 9),
+    }
+
+
+def test_grade_table_credit_totals_and_failures():
+    table = GradeTable.from_grades(_grades())
+
+    assert table.credits_by_term() == {
+        "2023-2024-1": 6.0,
+        "2023-2024-2": 3.0,
+        "2024-2025-1": 1.0,
+    }
+    assert table.credit_sum() == 10.0
+    assert table.credit_sum(passed_only=True) == 7.0
+    assert table.failed_mask().tolist() == [False, True, False, True, False]
+    assert [grade.course_name for grade in table.failed()] == ["大学英语", "体育"]
+    assert table.pass_rate() == pytest.approx(3 / 5)
+
+
+def test_grade_table_from_cohort_groups_by_student():
+    table = GradeTable.from_cohort(
+        {
+            "s2": [Grade("高等数学", "80", 4.0, 3.0, "2023-2024", "1")],
+            "s1": _grades()[:2],
+        }
+    )
+
+    assert table.students == ["s1", "s2"]
+    assert table.gpa_by_student() == {
+        "s1": pytest.approx(16 / 6),
+        "s2": pytest.approx(3.0),
+    }
+
+
+def test_grade_table_handles_empty_input():
+    table = GradeTable.from_grades([])
+
+    assert table.gpa() is None
+    assert table.gpa_by_term() == {}
+    assert table.pass_rate() is None
+    assert table.credit_sum() == 0.0
+
+
+def test_grade_table_rejects_mismatched_students():
+    with pytest.raises(ValueError):
+        GradeTable(_grades(), students=["s1"])
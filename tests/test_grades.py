@@ -1,3 +1,9 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
 from src import grades
 
 
@@ -78,6 +84,8 @@ def test_get_grades_parses_items_and_payload():
         "kcxz": "",
         "kcmc": "",
         "xsfs": "",
+        "pageIndex": "2",
+        "showCount": "50",
     }
     assert len(grades_list) == 1
     grade = grades_list[0]
@@ -177,3 +185,474 @@ def test_get_grade_detail_auto_resolves_from_grade_list():
 
     assert detail.course_name == "Linear Algebra"
     assert detail.breakdown == {"平时成绩": "90", "期末成绩": "80"}
+
+
+class FakeAsyncClient(FakeClient):
+    async def post(self, url, data=None):
+        return FakeClient.post(self, url, data=data)
+
+    async def get(self, url, params=None):
+        return FakeClient.get(self, url, params=params)
+
+
+def test_get_grade_detail_async_auto_resolves_from_grade_list():
+    list_html = """
+    <table>
+      <tr><th>课程名称</th><th>成绩</th><th>详情</th></tr>
+      <tr>
+        <td>Linear Algebra</td>
+        <td>95</td>
+        <td><a href="javascript:openWindow('/jsxsd/kscj/pscj_list.do?jx0404id=JXB001&xs0101id=20240001',1000,750)">Detail</a></td>
+      </tr>
+    </table>
+    """
+    detail_html = """
+    <table>
+      <tr><th>平时成绩</th><th>期末成绩</th></tr>
+      <tr><td>90</td><td>80</td></tr>
+    </table>
+    """
+    client = FakeAsyncClient()
+    client.post_responses[f"{grades.BASE_URL}/jsxsd/kscj/cjcx_list"] = FakeResponse(
+        text=list_html
+    )
+    client.get_responses[
+        f"{grades.BASE_URL}/jsxsd/kscj/pscj_list.do?jx0404id=JXB001&xs0101id=20240001"
+    ] = FakeResponse(text=detail_html)
+
+    detail = asyncio.run(
+        grades.get_grade_detail_async(
+            client,
+            jxb_id="",
+            year="2024-2025",
+            term="1",
+            course_name="Linear Algebra",
+            student_id="",
+            student_name="",
+        )
+    )
+
+    assert client.last_data["kksj"] == "2024-2025-1"
+    assert detail.breakdown == {"平时成绩": "90", "期末成绩": "80"}
+
+
+class FakeStreamingResponse:
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.closed = False
+        self.requested_chunk_size = None
+
+    def iter_content(self, chunk_size=1):
+        self.requested_chunk_size = chunk_size
+        yield from self._chunks
+
+    def close(self):
+        self.closed = True
+
+
+class FakeStreamingClient:
+    def __init__(self, response):
+        self._response = response
+        self.last_kwargs = None
+
+    def post(self, url, **kwargs):
+        self.last_kwargs = kwargs
+        return self._response
+
+
+def _grade_rows_html(count):
+    rows = "".join(
+        f"<tr><td>2024-2025-1</td><td>课程{index}</td><td>2</td><td>{80 + index}</td></tr>"
+        for index in range(count)
+    )
+    return (
+        "<html><body><table>"
+        "<tr><th>学年学期</th><th>课程名称</th><th>学分</th><th>成绩</th></tr>"
+        f"{rows}</table></body></html>"
+    )
+
+
+def test_iter_grades_matches_full_parse_for_any_chunking():
+    body = _grade_rows_html(5).encode("utf-8")
+    expected = grades._parse_grade_table_lxml(body.decode("utf-8"), "2024-2025", "1")
+
+    for size in (1, 5, 64, len(body)):
+        chunks = [body[i : i + size] for i in range(0, len(body), size)]
+        response = FakeStreamingResponse(chunks)
+        client = FakeStreamingClient(response)
+
+        stream = grades.iter_grades(client, year="2024-2025", term="1")
+
+        assert list(stream) == expected
+        assert client.last_kwargs["stream"] is True
+        assert client.last_kwargs["data"]["kksj"] == "2024-2025-1"
+        assert response.closed
+
+
+def test_iter_grades_yields_rows_before_download_finishes():
+    html = _grade_rows_html(3)
+    head = html.split("<tr><td>2024-2025-1</td><td>课程1", 1)[0]
+
+    def chunks():
+        yield head.encode("utf-8")
+        yield b"<tr><td>2024-2025-1</td><td>"
+        raise ConnectionError("download interrupted")
+
+    response = FakeStreamingResponse(chunks())
+    stream = grades.iter_grades(FakeStreamingClient(response))
+
+    first = next(stream)
+
+    assert first.course_name == "课程0"
+    assert first.score == "80"
+    with pytest.raises(ConnectionError):
+        next(stream)
+    assert response.closed
+
+
+def test_grade_columns_resolve_aliases_once_per_table():
+    columns = grades._GradeColumns(["课程名", "成绩", "总评成绩", "学分", "", "成绩"])
+
+    grade = columns.build(
+        ["高等数学", "", "88", "3", "备注", "", "多余"], [], "2024-2025", "2"
+    )
+
+    assert grade.course_name == "高等数学"
+    assert grade.score == "88"
+    assert grade.credits == 3.0
+    assert grade.year == "2024-2025"
+    assert grade.term == "2"
+    assert grade.raw == {
+        "课程名": "高等数学",
+        "成绩": "",
+        "总评成绩": "88",
+        "学分": "3",
+        "col_5": "备注",
+        "col_7": "多余",
+    }
+
+
+def test_grade_columns_handle_short_rows_and_missing_names():
+    columns = grades._GradeColumns(["课程名称", "学年学期", "成绩"])
+
+    short = columns.build(["线性代数", "2023-2024-1"], [], None, None)
+
+    assert short.year == "2023-2024"
+    assert short.term == "1"
+    assert short.score is None
+    assert columns.build(["", "2023-2024-1", "90"], [], None, None) is None
+
+
+TERM_LIST_HTML = """
+<table>
+  <tr><th>课程名称</th><th>成绩</th><th>详情</th></tr>
+  <tr>
+    <td>Linear Algebra</td><td>95</td>
+    <td><a href="javascript:openWindow('/jsxsd/kscj/pscj_list.do?jx0404id=A',1000,750)">Detail</a></td>
+  </tr>
+  <tr>
+    <td>Calculus</td><td>88</td>
+    <td><a href="javascript:openWindow('/jsxsd/kscj/pscj_list.do?jx0404id=B',1000,750)">Detail</a></td>
+  </tr>
+  <tr><td>Physical Education</td><td>通过</td><td></td></tr>
+</table>
+"""
+
+
+class CountingClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.posts = []
+        self.gets = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, data=None):
+        self.posts.append((url, data))
+        return FakeResponse(text=TERM_LIST_HTML)
+
+    def get(self, url, params=None):
+        with self._lock:
+            self.gets.append(url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        score = "90" if url.endswith("=A") else "70"
+        return FakeResponse(
+            text=f"<table><tr><th>平时</th><th>期末</th></tr><tr><td>{score}</td><td>80</td></tr></table>"
+        )
+
+
+def test_get_grade_details_fetches_grade_list_once():
+    client = CountingClient()
+
+    details = grades.get_grade_details(client, "2024-2025", "1")
+
+    assert len(client.posts) == 1
+    assert sorted(client.gets) == [
+        f"{grades.BASE_URL}/jsxsd/kscj/pscj_list.do?jx0404id=A",
+        f"{grades.BASE_URL}/jsxsd/kscj/pscj_list.do?jx0404id=B",
+    ]
+    assert list(details) == ["Linear Algebra", "Calculus"]
+    assert details["Linear Algebra"].breakdown == {"平时": "90", "期末": "80"}
+    assert details["Calculus"].course_name == "Calculus"
+
+
+def test_get_grade_details_bounds_concurrency_and_filters_courses():
+    client = CountingClient(delay=0.02)
+
+    details = grades.get_grade_details(
+        client,
+        "2024-2025",
+        "1",
+        courses=["Calculus", "Physical Education", "Unknown", "Linear Algebra"],
+        max_workers=1,
+    )
+
+    assert list(details) == ["Calculus", "Linear Algebra"]
+    assert client.max_in_flight == 1
+    assert len(client.posts) == 1
+
+
+def test_get_grade_details_async_fetches_grade_list_once():
+    class AsyncCountingClient(CountingClient):
+        async def post(self, url, data=None):
+            return CountingClient.post(self, url, data=data)
+
+        async def get(self, url, params=None):
+            return CountingClient.get(self, url, params=params)
+
+    client = AsyncCountingClient()
+
+    details = asyncio.run(
+        grades.get_grade_details_async(client, "2024-2025", "1", max_workers=2)
+    )
+
+    assert len(client.posts) == 1
+    assert len(client.gets) == 2
+    assert details["Calculus"].breakdown == {"平时": "70", "期末": "80"}
+
+
+def _paged_html(rows, pager=""):
+    body = "".join(
+        f"<tr><td>2024-2025-1</td><td>{name}</td><td>{score}</td></tr>"
+        for name, score in rows
+    )
+    return (
+        "<table><tr><th>学年学期</th><th>课程名称</th><th>成绩</th></tr>"
+        f"{body}</table><div class='pager'>{pager}</div>"
+    )
+
+
+class PagedClient:
+    def __init__(self, pages, pager=None, delay=0.0):
+        self.pages = pages
+        self.pager = pager
+        self.delay = delay
+        self.posts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, data=None):
+        with self._lock:
+            self.posts.append(data)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        index = int(data.get("pageIndex", 1))
+        rows = self.pages[min(index, len(self.pages)) - 1]
+        pager = self.pager.format(index) if self.pager else ""
+        return FakeResponse(text=_paged_html(rows, pager))
+
+
+def test_get_grades_fetches_remaining_pages_in_parallel_and_dedupes():
+    client = PagedClient(
+        [
+            [("高等数学", "90"), ("大学英语", "80")],
+            [("大学英语", "80"), ("线性代数", "85")],
+            [("体育", "通过")],
+        ],
+        pager="第 {} / 3 页",
+        delay=0.02,
+    )
+
+    result = grades.get_grades(
+        client, year="2024-2025", term="1", show_count=2, max_workers=2
+    )
+
+    assert [grade.course_name for grade in result] == [
+        "高等数学",
+        "大学英语",
+        "线性代数",
+        "体育",
+    ]
+    assert sorted(data["pageIndex"] for data in client.posts) == ["1", "2", "3"]
+    assert {data["showCount"] for data in client.posts} == {"2"}
+    assert client.max_in_flight == 2
+
+
+def test_iter_grade_pages_without_pager_walks_until_short_page():
+    client = PagedClient(
+        [
+            [("高等数学", "90"), ("大学英语", "80")],
+            [("线性代数", "85"), ("体育", "通过")],
+            [("物理", "70")],
+        ]
+    )
+
+    result = list(grades.iter_grade_pages(client, show_count=2))
+
+    assert [grade.course_name for grade in result] == [
+        "高等数学",
+        "大学英语",
+        "线性代数",
+        "体育",
+        "物理",
+    ]
+    assert [data["pageIndex"] for data in client.posts] == ["1", "2", "3"]
+
+
+def test_get_grades_stops_when_server_ignores_paging():
+    client = PagedClient([[("高等数学", "90"), ("大学英语", "80")]])
+
+    result = grades.get_grades(client, show_count=2)
+
+    assert len(result) == 2
+    assert len(client.posts) == 2
+
+
+def test_identical_rows_on_one_page_are_all_kept():
+    rows = [("体育", "60"), ("体育", "60"), ("高等数学", "90")]
+
+    assert len(grades.get_grades(PagedClient([rows]), show_count=100)) == 3
+    assert len(list(grades.iter_grade_pages(PagedClient([rows]), show_count=3))) == 3
+    assert (
+        len(list(grades.iter_grades(StreamingPagedClient([rows]), show_count=100))) == 3
+    )
+
+    repeated = PagedClient([rows, rows + [("物理", "70")]], pager="第 {} / 2 页")
+    assert [
+        grade.course_name for grade in grades.get_grades(repeated, show_count=3)
+    ] == [
+        "体育",
+        "体育",
+        "高等数学",
+        "物理",
+    ]
+
+
+def test_page_count_reads_pager_or_record_total():
+    assert grades._page_count("<div>共 4 页</div>", 100) == 4
+    assert grades._page_count("共 250 条记录".encode("utf-8"), 100) == 3
+    assert grades._page_count(memoryview("第1/2页".encode("utf-8")), 100) == 2
+    assert grades._page_count("<table></table>", 100) is None
+
+
+class StreamingPagedClient(PagedClient):
+    def post(self, url, data=None, stream=False):
+        body = PagedClient.post(self, url, data=data).text.encode("utf-8")
+        # Small chunks split the pager text across chunk borders.
+        return FakeStreamingResponse([body[i : i + 7] for i in range(0, len(body), 7)])
+
+
+def test_iter_grades_streams_every_page_from_the_pager():
+    client = StreamingPagedClient(
+        [
+            [("高等数学", "90"), ("大学英语", "80")],
+            [("大学英语", "80"), ("线性代数", "85")],
+            [("体育", "通过")],
+        ],
+        pager="第 {} / 3 页",
+    )
+
+    result = list(grades.iter_grades(client, show_count=2))
+
+    assert [grade.course_name for grade in result] == [
+        "高等数学",
+        "大学英语",
+        "线性代数",
+        "体育",
+    ]
+    assert [data["pageIndex"] for data in client.posts] == ["1", "2", "3"]
+    assert {data["showCount"] for data in client.posts} == {"2"}
+
+
+def test_iter_grades_without_pager_walks_until_short_page():
+    client = StreamingPagedClient(
+        [
+            [("高等数学", "90"), ("大学英语", "80")],
+            [("物理", "70")],
+        ]
+    )
+
+    result = list(grades.iter_grades(client, show_count=2))
+
+    assert [grade.course_name for grade in result] == ["高等数学", "大学英语", "物理"]
+    assert [data["pageIndex"] for data in client.posts] == ["1", "2"]
+
+
+def test_get_grades_async_merges_pages_in_order():
+    class AsyncPagedClient(PagedClient):
+        async def post(self, url, data=None):
+            return PagedClient.post(self, url, data=data)
+
+    client = AsyncPagedClient(
+        [
+            [("高等数学", "90")],
+            [("高等数学", "90"), ("大学英语", "80")],
+            [("线性代数", "85")],
+        ],
+        pager="共 3 页",
+    )
+
+    result = asyncio.run(grades.get_grades_async(client, show_count=1))
+
+    assert [grade.course_name for grade in result] == [
+        "高等数学",
+        "大学英语",
+        "线性代数",
+    ]
+    assert len(client.posts) == 3
+
+
+def test_get_grades_sends_filters_server_side():
+    client = PagedClient([[("线性代数", "85")]])
+
+    result = grades.get_grades(
+        client,
+        year="2024-2025",
+        term="1",
+        page=1,
+        course_type=" 01 ",
+        course_name="线性代数",
+        display="max",
+    )
+
+    assert [grade.course_name for grade in result] == ["线性代数"]
+    assert client.posts == [
+        {
+            "kksj": "2024-2025-1",
+            "kcxz": "01",
+            "kcmc": "线性代数",
+            "xsfs": "max",
+            "pageIndex": "1",
+            "showCount": "100",
+        }
+    ]
+
+
+def test_iter_grades_sends_filters_server_side():
+    body = _grade_rows_html(1).encode("utf-8")
+    client = FakeStreamingClient(FakeStreamingResponse([body]))
+
+    list(grades.iter_grades(client, course_name="课程0", display="all"))
+
+    assert client.last_kwargs["data"]["kcmc"] == "课程0"
+    assert client.last_kwargs["data"]["xsfs"] == "all"
+    assert client.last_kwargs["data"]["kcxz"] == ""
@@ -0,0 +1,45 @@
+import os
+import stat
+
+from src.local_files import (  # type: ignore[reportMissingImports]
+    _config_file_path,
+    _connect_sqlite,
+)
+
+
+def test_config_file_path_prefers_env_then_config_section(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GSAU_DEMO_FILE", raising=False)
+    default = tmp_path / "default.sqlite3"
+
+    assert _config_file_path("demo", "GSAU_DEMO_FILE", default) == default
+
+    (tmp_path / "config.ini").write_text(
+        "[demo]\nfile = from_config.sqlite3\n", encoding="utf-8"
+    )
+    assert _config_file_path("demo", "GSAU_DEMO_FILE", default).name == (
+        "from_config.sqlite3"
+    )
+
+    monkeypatch.setenv("GSAU_DEMO_FILE", str(tmp_path / "env.sqlite3"))
+    assert _config_file_path("demo", "GSAU_DEMO_FILE", default) == (
+        tmp_path / "env.sqlite3"
+    )
+
+
+def test_connect_sqlite_drops_stale_tables_on_version_change(tmp_path):
+    path = tmp_path / "nested" / "demo.sqlite3"
+    schema = "CREATE TABLE IF NOT EXISTS items (name TEXT);"
+    conn = _connect_sqlite(path, schema, 1, stale_tables=("items",))
+    conn.execute("INSERT INTO items VALUES ('kept')")
+    conn.commit()
+    conn.close()
+
+    same = _connect_sqlite(path, schema, 1, stale_tables=("items",))
+    assert same.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+    same.close()
+
+    upgraded = _connect_sqlite(path, schema, 2, stale_tables=("items",))
+    assert upgraded.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    if os.name != "nt":
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
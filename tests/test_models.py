@@ -1,4 +1,11 @@
-from src.models import Course, Grade, GradeDetail, Term
+import pickle
+import sys
+import tracemalloc
+from dataclasses import asdict
+
+import pytest
+
+from src.models import Course, Grade, GradeDetail, RowLayout, RowView, Term
 
 
 def test_course_defaults():
@@ -34,3 +41,93 @@ def test_term_defaults():
     term = Term(year="2024-2025", term="1")
 
     assert term.label is None
+
+
+def test_terms_are_hashable_values():
+    term = Term(year="2024-2025", term="1")
+
+    assert {term: 1}[Term(year="2024-2025", term="1")] == 1
+    assert pickle.loads(pickle.dumps(term)) == term
+    with pytest.raises(AttributeError):
+        term.term = "2"
+
+
+def test_models_are_slotted():
+    grade = Grade(course_name="Linear Algebra")
+
+    assert not hasattr(grade, "__dict__")
+    assert not hasattr(Course(name="Linear Algebra"), "__dict__")
+
+
+def test_row_view_reads_like_the_row_dict():
+    layout = RowLayout(["课程名称", "成绩", "col_3", "成绩"])
+    view = RowView(layout, ("线性代数", "80", "备注", "95"), (("detail_url", "/d"),))
+
+    assert view == {
+        "课程名称": "线性代数",
+        "成绩": "95",
+        "col_3": "备注",
+        "detail_url": "/d",
+    }
+    assert list(view) == ["课程名称", "成绩", "col_3", "detail_url"]
+    assert len(view) == 4
+    assert "detail_url" in view
+    assert view.get("学分") is None
+
+
+def test_row_view_materializes_on_write_without_touching_shared_layout():
+    layout = RowLayout(["课程名称", "成绩"])
+    first = RowView(layout, ("线性代数", "80"))
+    second = RowView(layout, ("高等数学", "90"))
+
+    first["成绩"] = "mutated"
+    del first["课程名称"]
+
+    assert first == {"成绩": "mutated"}
+    assert second == {"课程名称": "高等数学", "成绩": "90"}
+    assert layout.keys == ("课程名称", "成绩")
+
+
+def test_grade_with_row_view_converts_and_pickles_as_plain_data():
+    layout = RowLayout(["课程名称", "成绩"])
+    grade = Grade(course_name="线性代数", raw=RowView(layout, ("线性代数", "80")))
+
+    as_dict = asdict(grade)
+    restored = pickle.loads(pickle.dumps(grade))
+
+    assert type(as_dict["raw"]) is dict
+    assert as_dict["raw"] == {"课程名称": "线性代数", "成绩": "80"}
+    assert restored == grade
+
+
+def test_row_layout_interns_header_keys():
+    header = "".join(["课程", "名称"])
+    layout = RowLayout([header])
+
+    assert layout.keys[0] is sys.intern("课程名称")
+
+
+def test_grade_record_footprint_stays_compact():
+    headers = [f"列{index}" for index in range(15)]
+    rows = [[f"{row}-{col}" for col in range(15)] for row in range(2000)]
+    layout = RowLayout(headers)
+
+    tracemalloc.start()
+    try:
+        grades = [
+            Grade(
+                course_name=values[3],
+                score=values[5],
+                year=values[1],
+                raw=RowView(layout, tuple(values)),
+            )
+            for values in rows
+        ]
+        allocated, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    per_record = allocated / len(grades)
+    dict_row = sys.getsizeof(dict(zip(headers, rows[0])))
+    assert per_record < 400
+    assert per_record < dict_row
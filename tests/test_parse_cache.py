@@ -0,0 +1,77 @@
+from src import html_backend
+from src.grades import _parse_grade_table
+from src.parse_cache import PARSE_CACHE, ParseCache
+from src.schedule import _parse_term_options
+
+GRADE_HTML = """
+<table>
+  <tr><th>课程名称</th><th>成绩</th><th>学分</th></tr>
+  <tr><td>Linear Algebra</td><td>95</td><td>3</td></tr>
+</table>
+"""
+
+
+def test_identical_body_is_parsed_once():
+    calls = []
+
+    def parse(body, suffix):
+        calls.append(body)
+        return [body.upper() + suffix]
+
+    cache = ParseCache()
+
+    first = cache.get_or_parse("demo", "abc", parse, "!")
+    second = cache.get_or_parse("demo", b"abc", parse, "!")
+    other_args = cache.get_or_parse("demo", "abc", parse, "?")
+
+    assert first == second == ["ABC!"]
+    assert other_args == ["ABC?"]
+    assert calls == ["abc", "abc"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_hits_return_independent_copies():
+    first = _parse_grade_table(GRADE_HTML, "2024-2025", "1")
+    first[0].raw["成绩"] = "mutated"
+    second = _parse_grade_table(GRADE_HTML, "2024-2025", "1")
+
+    assert second[0].raw["成绩"] == "95"
+    assert second[0].course_name == "Linear Algebra"
+    assert PARSE_CACHE.hits == 1
+    assert PARSE_CACHE.misses == 1
+
+
+def test_fallback_arguments_are_part_of_the_key():
+    first = _parse_grade_table(GRADE_HTML, "2024-2025", "1")
+    second = _parse_grade_table(GRADE_HTML, "2023-2024", "2")
+
+    assert first[0].year == "2024-2025"
+    assert second[0].year == "2023-2024"
+    assert PARSE_CACHE.hits == 0
+
+
+def test_parser_backend_is_part_of_the_key():
+    try:
+        html_backend.set_parser_backend("lxml")
+        _parse_grade_table(GRADE_HTML, "2024-2025", "1")
+        html_backend.set_parser_backend("bs4")
+        _parse_grade_table(GRADE_HTML, "2024-2025", "1")
+    finally:
+        html_backend.set_parser_backend(None)
+
+    assert PARSE_CACHE.hits == 0
+    assert PARSE_CACHE.misses == 2
+
+
+def test_lru_eviction_and_empty_bodies_skip_cache():
+    cache = ParseCache(max_entries=1)
+    cache.get_or_parse("demo", "a", lambda body: body)
+    cache.get_or_parse("demo", "b", lambda body: body)
+    cache.get_or_parse("demo", "", lambda body: body)
+
+    assert cache.stats()["entries"] == 1
+    assert cache.get_or_parse("demo", "a", lambda body: body) == "a"
+    assert cache.hits == 0
+
+    assert _parse_term_options("<html></html>") == []
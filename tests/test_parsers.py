@@ -0,0 +1,273 @@
+import pytest
+
+from src import html_backend  # type: ignore[reportMissingImports]
+from src.grades import (  # type: ignore[reportMissingImports]
+    _parse_breakdown_table,
+    _parse_breakdown_table_bs4,
+    _parse_breakdown_table_lxml,
+    _parse_grade_table_bs4,
+    _parse_grade_table_lxml,
+)
+from src.proofs import (  # type: ignore[reportMissingImports]
+    _parse_proof_history_bs4,
+    _parse_proof_history_lxml,
+    _parse_proof_templates_bs4,
+    _parse_proof_templates_lxml,
+)
+from src.schedule import (  # type: ignore[reportMissingImports]
+    _parse_schedule_html_bs4,
+    _parse_schedule_html_lxml,
+    _parse_term_options_bs4,
+    _parse_term_options_lxml,
+)
+
+GRADE_TABLE_HTML = """
+<html><body>
+  <table id="empty"></table>
+  <table id="dataList">
+    <tr><th>序号</th><th>学年学期</th><th>课程名称</th><th>学分</th><th>成绩</th><th>绩点</th></tr>
+    <tr>
+      <td>1</td>
+      <td>2024-2025-1</td>
+      <td>高等 数学<script>var x = 1;</script></td>
+      <td>4</td>
+      <td><a href="javascript:openWindow('/jsxsd/kscj/pscj_list.do?xs0101id=1&amp;jx0404id=A',700,500)">92</a></td>
+      <td>4.2</td>
+    </tr>
+    <tr>
+      <td>2</td>
+      <td>2024-2025-2</td>
+      <td>大学&nbsp;英语<!-- note --></td>
+      <td></td>
+      <td>良好</td>
+    </tr>
+    <tr><td></td><td></td><td></td></tr>
+  </table>
+</body></html>
+"""
+
+BREAKDOWN_HEADER_HTML = """
+<html><body><table>
+  <tr><th>平时成绩</th><th>期末成绩</th><th>总评</th></tr>
+  <tr><td>90</td><td>85</td></tr>
+</table></body></html>
+"""
+
+BREAKDOWN_PAIRS_HTML = """
+<html><body><table>
+  <tr><td>平时成绩</td><td>90</td><td>期末成绩</td><td>80</td></tr>
+  <tr><td>总评</td><td>84</td></tr>
+</table></body></html>
+"""
+
+SCHEDULE_HTML = """
+<html><body><table>
+  <tr><th>星期一</th><th>星期二</th></tr>
+  <tr>
+    <th>第一大节</th>
+    <td>
+      <div class="kbcontent1">hidden</div>
+      <div class="kbcontent sykb">
+        高等数学<br/>
+        <font title="老师">张三</font><br/>
+        <font title="周次(节次)">1-8,10(周)[01-02节]</font><br/>
+        <font title="教室">教101</font><br/>
+        ---------------------<br/>
+        大学英语<br/>李四<br/>9-16 周 3-4 节<br/>外语楼 202
+      </div>
+    </td>
+    <td><div class="kbcontent">&nbsp;</div></td>
+    <td><div class="kbcontent">体育&nbsp;(篮球)<br/>1,3,5周<br/>操场</div></td>
+  </tr>
+</table></body></html>
+"""
+
+TERM_SELECT_HTML = """
+<html><body>
+  <select id="xnxq01id">
+    <option value="">--请选择--</option>
+    <option value="2024-2025-1" selected>2024-2025<b>学年</b>第一学期</option>
+    <option value="2024-2025-2"> 2024-2025学年第二学期 </option>
+  </select>
+</body></html>
+"""
+
+PROOF_TEMPLATES_HTML = """
+<html><body><table>
+  <tr><th>序号</th><th>证明名称</th><th>操作</th></tr>
+  <tr>
+    <td>1</td>
+    <td> 在读 证明 </td>
+    <td><a href="javascript:void(0);" onclick="operate('/kxzm/kxzm_generation?manageid=05')">生成并签章</a></td>
+  </tr>
+  <tr><td>2</td><td>成绩卡</td><td>暂不可用</td></tr>
+  <tr><td>3</td><td></td><td></td></tr>
+</table></body></html>
+"""
+
+PROOF_HISTORY_HTML = """
+<html><body><table>
+  <tr><th>序号</th><th>证明名称</th><th>生成时间</th><th>生成人</th><th>状态</th><th>操作</th></tr>
+  <tr>
+    <td>1</td>
+    <td>在读证明</td>
+    <td>2026-02-08 17:25:27</td>
+    <td>本人</td>
+    <td>已签章</td>
+    <td>
+      <a href="javascript:openWindow('/jsxsd/kxzm/kxzmView?generationid=AAA',1000,750)">预览</a>
+      <a href="javascript:void(0);" onclick="operate('/kxzm/kxzmDownload?generationid=AAA&amp;manageid=05')">下载</a>
+    </td>
+  </tr>
+  <tr><td>2</td><td>成绩卡</td><td></td><td></td><td></td><td></td></tr>
+</table></body></html>
+"""
+
+PARSER_PAIRS = [
+    pytest.param(
+        _parse_grade_table_bs4,
+        _parse_grade_table_lxml,
+        (GRADE_TABLE_HTML, "2023-2024", "2"),
+        id="grade-table",
+    ),
+    pytest.param(
+        _parse_breakdown_table_bs4,
+        _parse_breakdown_table_lxml,
+        (BREAKDOWN_HEADER_HTML,),
+        id="breakdown-headers",
+    ),
+    pytest.param(
+        _parse_breakdown_table_bs4,
+        _parse_breakdown_table_lxml,
+        (BREAKDOWN_PAIRS_HTML,),
+        id="breakdown-pairs",
+    ),
+    pytest.param(
+        _parse_schedule_html_bs4,
+        _parse_schedule_html_lxml,
+        (SCHEDULE_HTML,),
+        id="schedule",
+    ),
+    pytest.param(
+        _parse_term_options_bs4,
+        _parse_term_options_lxml,
+        (TERM_SELECT_HTML,),
+        id="terms",
+    ),
+    pytest.param(
+        _parse_proof_templates_bs4,
+        _parse_proof_templates_lxml,
+        (PROOF_TEMPLATES_HTML,),
+        id="proof-templates",
+    ),
+    pytest.param(
+        _parse_proof_history_bs4,
+        _parse_proof_history_lxml,
+        (PROOF_HISTORY_HTML,),
+        id="proof-history",
+    ),
+]
+
+
+@pytest.fixture(autouse=True)
+def _reset_backend():
+    yield
+    html_backend.set_parser_backend(None)
+
+
+@pytest.mark.parametrize("bs4_parse, lxml_parse, args", PARSER_PAIRS)
+def test_backends_produce_identical_models(bs4_parse, lxml_parse, args):
+    expected = bs4_parse(*args)
+
+    assert expected
+    assert lxml_parse(*args) == expected
+
+
+@pytest.mark.parametrize("bs4_parse, lxml_parse, args", PARSER_PAIRS)
+def test_backends_agree_on_empty_documents(bs4_parse, lxml_parse, args):
+    for html in ("", "<html><body></body></html>"):
+        empty_args = (html,) + tuple(args[1:])
+        assert lxml_parse(*empty_args) == bs4_parse(*empty_args)
+
+
+def test_schedule_backends_split_dash_separated_entries():
+    courses = _parse_schedule_html_lxml(SCHEDULE_HTML)
+
+    assert [course.name for course in courses] == [
+        "高等数学",
+        "大学英语",
+        "体育 (篮球)",
+    ]
+    assert courses[1].weeks == ["9-16"]
+    assert courses[1].sections == ["3-4"]
+    assert courses[2].day == "3"
+
+
+def test_parser_backend_defaults_to_lxml(monkeypatch):
+    monkeypatch.delenv("GSAU_PARSER_BACKEND", raising=False)
+
+    assert html_backend.get_parser_backend() == "lxml"
+
+
+def test_parser_backend_reads_environment(monkeypatch):
+    monkeypatch.setenv("GSAU_PARSER_BACKEND", "BS4")
+
+    assert html_backend.get_parser_backend() == "bs4"
+
+    monkeypatch.setenv("GSAU_PARSER_BACKEND", "unknown")
+
+    assert html_backend.get_parser_backend() == html_backend.DEFAULT_BACKEND
+
+
+def test_set_parser_backend_routes_dispatchers(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "src.grades._parse_breakdown_table_bs4",
+        lambda html: calls.append("bs4") or {},
+    )
+    monkeypatch.setattr(
+        "src.grades._parse_breakdown_table_lxml",
+        lambda html: calls.append("lxml") or {},
+    )
+
+    html_backend.set_parser_backend("bs4")
+    _parse_breakdown_table("<table></table>")
+    html_backend.set_parser_backend("lxml")
+    _parse_breakdown_table("<table></table>")
+
+    assert calls == ["bs4", "lxml"]
+
+
+def test_set_parser_backend_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        html_backend.set_parser_backend("html5lib")
+
+
+@pytest.mark.parametrize("bs4_parse, lxml_parse, args", PARSER_PAIRS)
+def test_backends_accept_undecoded_bytes(bs4_parse, lxml_parse, args):
+    expected = lxml_parse(*args)
+    body = args[0].encode("utf-8")
+
+    for markup in (body, memoryview(body)):
+        byte_args = (markup,) + tuple(args[1:])
+        assert lxml_parse(*byte_args) == expected
+        assert bs4_parse(*byte_args) == expected
+
+
+def test_response_body_prefers_raw_content():
+    class BytesResponse:
+        content = "课程".encode("utf-8")
+
+        @property
+        def text(self):
+            raise AssertionError("text should not be decoded")
+
+    class TextResponse:
+        encoding = None
+        text = "课程"
+
+    text_response = TextResponse()
+
+    assert html_backend.response_body(BytesResponse()) == "课程".encode("utf-8")
+    assert html_backend.response_body(text_response) == "课程"
+    assert text_response.encoding == "utf-8"
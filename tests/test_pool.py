@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+import json
+import threading
+import time
+
+import pytest
+
+from src.client import GSAUClient
+from src.pool import SessionPool
+
+
+class FakeCookies:
+    def __init__(self):
+        self.cleared = False
+
+    def clear(self):
+        self.cleared = True
+
+
+class FakeSession:
+    def __init__(self):
+        self.cookies = FakeCookies()
+
+
+class FakeClient:
+    instances = []
+
+    def __init__(self, username, password, prompt, timeout, session_file):
+        self.username = username
+        self.password = password
+        self.session_file = session_file
+        self.session = FakeSession()
+        self._logged_in = username.endswith("fresh")
+        self.login_calls = 0
+        FakeClient.instances.append(self)
+
+    def _validate_session(self):
+        return self.username.endswith("fresh")
+
+    def login(self):
+        self.login_calls += 1
+        self._logged_in = self.password != "bad"
+        return self._logged_in
+
+    def ensure_login(self):
+        if self._logged_in:
+            return True
+        return self.login()
+
+
+@pytest.fixture(autouse=True)
+def _reset_instances():
+    FakeClient.instances = []
+
+
+def test_pool_assigns_separate_session_files(tmp_path):
+    pool = SessionPool(session_dir=tmp_path, client_factory=FakeClient)
+    pool.add_account("2024001", "pwd")
+    pool.add_account("2024/002", "pwd")
+
+    with pool.acquire("2024001") as first:
+        pass
+    with pool.acquire("2024/002") as second:
+        pass
+
+    assert first.session_file == tmp_path / "2024001.session"
+    assert second.session_file == tmp_path / "2024_002.session"
+    assert first is not second
+    with pool.acquire("2024001") as again:
+        assert again is first
+
+
+def test_pool_acquire_raises_when_login_fails(tmp_path):
+    pool = SessionPool(session_dir=tmp_path, client_factory=FakeClient)
+    pool.add_account("u1", "bad")
+
+    with pytest.raises(RuntimeError):
+        with pool.acquire("u1"):
+            pass
+
+
+def test_pool_refresh_relogins_only_stale_accounts(tmp_path):
+    pool = SessionPool(session_dir=tmp_path, client_factory=FakeClient)
+    pool.add_account("a-fresh", "pwd")
+    pool.add_account("b-stale", "pwd")
+
+    refreshed = pool.refresh_stale()
+
+    assert refreshed == ["b-stale"]
+    by_name = {client.username: client for client in FakeClient.instances}
+    assert by_name["a-fresh"].login_calls == 0
+    assert by_name["b-stale"].login_calls == 1
+    assert by_name["b-stale"].session.cookies.cleared is True
+
+
+def _stale_real_client(monkeypatch, tmp_path, valid):
+    session_file = tmp_path / "u1.session"
+    saved_at = datetime.now() - timedelta(hours=2)
+    session_file.write_text(
+        json.dumps(
+            {
+                "cookies": {"JSESSIONID": "abc"},
+                "saved_at": saved_at.isoformat(),
+                "ttl": 600,
+            }
+        ),
+        encoding="utf-8",
+    )
+    calls = []
+
+    def fake_validate(self):
+        calls.append("validate")
+        return valid
+
+    def fake_login(self):
+        calls.append("login")
+        self._logged_in = True
+        self._login_generation += 1
+        return True
+
+    monkeypatch.setattr(GSAUClient, "_validate_session", fake_validate)
+    monkeypatch.setattr(GSAUClient, "login", fake_login)
+    return calls
+
+
+def test_pool_refresh_validates_real_client_past_its_ttl(monkeypatch, tmp_path):
+    calls = _stale_real_client(monkeypatch, tmp_path, valid=True)
+    pool = SessionPool(session_dir=tmp_path)
+    pool.add_account("u1", "pwd")
+
+    assert pool.refresh_stale() == []
+    assert calls == ["validate"]
+
+
+def test_pool_refresh_relogins_real_client_with_invalid_session(monkeypatch, tmp_path):
+    calls = _stale_real_client(monkeypatch, tmp_path, valid=False)
+    pool = SessionPool(session_dir=tmp_path)
+    pool.add_account("u1", "pwd")
+
+    assert pool.refresh_stale() == ["u1"]
+    assert calls == ["validate", "login"]
+
+
+def test_pool_map_respects_concurrency_limit(tmp_path):
+    pool = SessionPool(
+        session_dir=tmp_path, max_concurrency=2, client_factory=FakeClient
+    )
+    for index in range(6):
+        pool.add_account(f"user{index}", "pwd")
+
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work(client):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return client.username.upper()
+
+    results = pool.map(work)
+
+    assert results == {f"user{index}": f"USER{index}" for index in range(6)}
+    assert active["peak"] <= 2
@@ -1,6 +1,9 @@
+import asyncio
+
 from src.cli import _build_parser, _handle_proof_download  # type: ignore[reportMissingImports]
 from src.proofs import (  # type: ignore[reportMissingImports]
     download_proof,
+    download_proof_async,
     get_proof_history,
     get_proof_templates,
 )
@@ -120,6 +123,38 @@ def test_download_proof_falls_back_to_output_path_when_no_header(tmp_path):
     assert output_file.read_bytes() == b"proof-data"
 
 
+class FakeStreamingResponse:
+    def __init__(self, headers, chunks):
+        self.headers = headers
+        self._chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        yield from self._chunks
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingClient(FakeClient):
+    def get(self, url, **kwargs):
+        self.last_kwargs = kwargs
+        return super().get(url, **kwargs)
+
+
+def test_download_proof_streams_chunks_to_disk(tmp_path):
+    output_file = tmp_path / "streamed.pdf"
+    response = FakeStreamingResponse({}, [b"%PDF-", b"", b"body"])
+    download_url = "/kxzm/kxzmDownload?generationid=AAA"
+    client = RecordingClient({"https://jwgl.gsau.edu.cn" + download_url: response})
+
+    download_proof(client, download_url, str(output_file))
+
+    assert client.last_kwargs == {"stream": True}
+    assert output_file.read_bytes() == b"%PDF-body"
+    assert response.closed
+
+
 def test_proof_download_parser_sets_handler_and_args():
     parser = _build_parser()
     args = parser.parse_args(["proof-download", "--id", "123", "--output", "out.pdf"])
@@ -127,3 +162,22 @@ def test_proof_download_parser_sets_handler_and_args():
     assert args.handler is _handle_proof_download
     assert args.id == "123"
     assert args.output == "out.pdf"
+
+
+class FakeAsyncClient(FakeClient):
+    async def get(self, url, **kwargs):
+        return FakeClient.get(self, url, **kwargs)
+
+
+def test_download_proof_async_writes_content(tmp_path):
+    output_file = tmp_path / "async.pdf"
+    response = FakeBinaryResponse(headers={}, content=b"async-data")
+    download_url = "/kxzm/kxzmDownload?generationid=BBB"
+    client = FakeAsyncClient({"https://jwgl.gsau.edu.cn" + download_url: response})
+
+    saved_path = asyncio.run(
+        download_proof_async(client, download_url, str(output_file))
+    )
+
+    assert saved_path == str(output_file)
+    assert output_file.read_bytes() == b"async-data"
@@ -1,5 +1,17 @@
+import asyncio
+import threading
+import time
+
 from src.models import Course, Term
-from src.schedule import get_schedule, get_terms
+from src.schedule import (
+    get_all_schedules,
+    get_all_schedules_async,
+    get_schedule,
+    get_schedule_page,
+    get_schedule_page_async,
+    get_terms,
+    get_terms_async,
+)
 
 
 class FakeResponse:
@@ -97,3 +109,198 @@ def test_get_terms_parses_options():
         Term(year="2024-2025", term="1", label="2024-2025学年第一学期"),
         Term(year="2024-2025", term="2", label="2024-2025学年第二学期"),
     ]
+
+
+class FakeAsyncClient(FakeClient):
+    async def post(self, url, data=None):
+        return FakeClient.post(self, url, data=data)
+
+    async def get(self, url, data=None):
+        return FakeClient.get(self, url, data=data)
+
+
+def test_get_terms_async_parses_options():
+    html = """
+    <select id="xnxq01id">
+      <option value="2023-2024-2">2023-2024学年第二学期</option>
+    </select>
+    """
+    client = FakeAsyncClient(FakeResponse(html))
+
+    terms = asyncio.run(get_terms_async(client))
+
+    assert terms == [Term(year="2023-2024", term="2", label="2023-2024学年第二学期")]
+
+
+def test_bs4_schedule_parser_builds_one_soup_per_page(monkeypatch):
+    import src.html_backend as html_backend
+    from src.schedule import _parse_schedule_html_bs4
+
+    html = """
+    <table><tr><th>第一大节</th>
+      <td><div class="kbcontent">
+        高等数学<br/>张三<br/>1-8周 1-2节<br/>教101<br/>
+        ---------------------<br/>
+        大学英语<br/>李四<br/>9-16周 3-4节<br/>教102
+      </div></td>
+    </tr></table>
+    """
+    constructed = []
+    real_soup = html_backend.BeautifulSoup
+
+    def counting_soup(*args, **kwargs):
+        constructed.append(args)
+        return real_soup(*args, **kwargs)
+
+    monkeypatch.setattr(html_backend, "BeautifulSoup", counting_soup)
+
+    courses = _parse_schedule_html_bs4(html)
+
+    assert len(constructed) == 1
+    assert [course.name for course in courses] == ["高等数学", "大学英语"]
+    assert courses[1].weeks == ["9-16"]
+
+
+TERMS_HTML = """
+<select name="xnxq01id">
+  <option value="2023-2024-2">2023-2024学年第二学期</option>
+  <option value="2024-2025-1">2024-2025学年第一学期</option>
+  <option value="2024-2025-2">2024-2025学年第二学期</option>
+</select>
+"""
+
+
+class TermScheduleClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.gets = 0
+        self.posted = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, data=None):
+        self.gets += 1
+        return FakeResponse(TERMS_HTML)
+
+    def post(self, url, data=None):
+        with self._lock:
+            self.posted.append(data["xnxq01id"])
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return FakeResponse(
+            "<table><tr><th>1</th><td><div class='kbcontent'>"
+            f"课程{data['xnxq01id']}<br/>教师<br/>1-16周 1-2节"
+            "</div></td></tr></table>"
+        )
+
+
+def test_get_all_schedules_fans_out_over_terms():
+    client = TermScheduleClient(delay=0.02)
+
+    schedules = get_all_schedules(client, max_workers=2)
+
+    assert client.gets == 1
+    assert sorted(client.posted) == ["2023-2024-2", "2024-2025-1", "2024-2025-2"]
+    assert client.max_in_flight == 2
+    assert [f"{term.year}-{term.term}" for term in schedules] == [
+        "2023-2024-2",
+        "2024-2025-1",
+        "2024-2025-2",
+    ]
+    term = Term(year="2024-2025", term="1", label="2024-2025学年第一学期")
+    assert [course.name for course in schedules[term]] == ["课程2024-2025-1"]
+
+
+def test_get_all_schedules_accepts_explicit_terms():
+    client = TermScheduleClient()
+    term = Term(year="2024-2025", term="2")
+
+    schedules = get_all_schedules(client, terms=[term, term])
+
+    assert client.gets == 0
+    assert client.posted == ["2024-2025-2"]
+    assert list(schedules) == [term]
+    assert get_all_schedules(client, terms=[]) == {}
+
+
+def test_get_all_schedules_async_fans_out_over_terms():
+    class AsyncTermScheduleClient(TermScheduleClient):
+        async def get(self, url, data=None):
+            return TermScheduleClient.get(self, url, data=data)
+
+        async def post(self, url, data=None):
+            return TermScheduleClient.post(self, url, data=data)
+
+    client = AsyncTermScheduleClient()
+
+    schedules = asyncio.run(get_all_schedules_async(client, max_workers=2))
+
+    assert len(schedules) == 3
+    assert sorted(client.posted) == ["2023-2024-2", "2024-2025-1", "2024-2025-2"]
+
+
+CURRENT_PAGE_HTML = """
+<select name="xnxq01id">
+  <option value="2023-2024-2">2023-2024学年第二学期</option>
+  <option value="2024-2025-1" selected="selected">2024-2025学年第一学期</option>
+</select>
+<table><tr><th>1</th><td><div class="kbcontent">
+高等数学<br/>张老师<br/>1-16周(1-2节) 教1-101
+</div></td></tr></table>
+"""
+
+
+def test_get_schedule_page_reads_terms_and_courses_from_one_response():
+    client = FakeClient(FakeResponse(CURRENT_PAGE_HTML))
+
+    page = get_schedule_page(client)
+
+    assert client.last_url == "https://jwgl.gsau.edu.cn/jsxsd/xskb/xskb_list.do"
+    assert client.last_data is None
+    assert [f"{term.year}-{term.term}" for term in page.terms] == [
+        "2023-2024-2",
+        "2024-2025-1",
+    ]
+    assert page.current == page.terms[1]
+    assert [course.name for course in page.courses] == ["高等数学"]
+
+
+def test_get_schedule_page_posts_requested_term():
+    client = FakeClient(FakeResponse(TERMS_HTML))
+
+    page = get_schedule_page(client, "2024-2025", "2")
+
+    assert client.last_data == {"xnxq01id": "2024-2025-2"}
+    assert page.current == page.terms[2]
+    assert page.courses == []
+
+
+def test_get_schedule_page_async_detects_current_term():
+    client = FakeAsyncClient(FakeResponse(CURRENT_PAGE_HTML))
+
+    page = asyncio.run(get_schedule_page_async(client))
+
+    assert page.current.year == "2024-2025" and page.current.term == "1"
+    assert len(page.courses) == 1
+
+
+def test_get_all_schedules_reuses_current_term_from_term_page():
+    class CurrentTermClient(TermScheduleClient):
+        def get(self, url, data=None):
+            self.gets += 1
+            return FakeResponse(CURRENT_PAGE_HTML)
+
+    client = CurrentTermClient()
+
+    schedules = get_all_schedules(client)
+
+    assert client.gets == 1
+    assert client.posted == ["2023-2024-2"]
+    assert [[course.name for course in courses] for courses in schedules.values()] == [
+        ["课程2023-2024-2"],
+        ["高等数学"],
+    ]
@@ -0,0 +1,62 @@
+from src.models import Course  # type: ignore[reportMissingImports]
+from src.schedule_index import (  # type: ignore[reportMissingImports]
+    ScheduleIndex,
+    mask_values,
+    range_mask,
+)
+
+
+def _courses():
+    return [
+        Course("高等数学", day="1", sections=["1-2"], weeks=["1-16"]),
+        Course("大学英语", day="1", sections=["3-4"], weeks=["1-8", "10"]),
+        Course("线性代数", day="3", sections=["5", "6"], weeks=["9-16"]),
+        Course("体育", day="1", sections=["2-3"], weeks=["8"]),
+        Course("讲座", day="5", sections=["7-8"], weeks=[]),
+        Course("未排课", day=None, sections=["1-2"], weeks=["1-16"]),
+    ]
+
+
+def test_range_mask_expands_tokens():
+    assert mask_values(range_mask(["1-3", "5", "07-08"])) == [1, 2, 3, 5, 7, 8]
+    assert mask_values(range_mask(["4-2"])) == [2, 3, 4]
+    assert range_mask(["", "单", "0"]) == 0
+
+
+def test_slot_lookups():
+    index = ScheduleIndex(_courses())
+
+    assert index.is_busy(1, 1, 1)
+    assert not index.is_busy(17, 1, 1)
+    assert not index.is_busy(9, 1, 3)
+    assert [course.name for course in index.at(10, 1, 3)] == ["大学英语"]
+    assert [course.name for course in index.at(8, 1, 2)] == ["高等数学", "体育"]
+    assert index.at(1, 2, 1) == []
+    assert mask_values(index.sections_busy(9, 3)) == [5, 6]
+
+
+def test_courses_without_weeks_meet_every_week():
+    index = ScheduleIndex(_courses())
+
+    assert index.weeks == 20
+    assert index.is_busy(20, 5, 8)
+    assert not index.is_busy(21, 5, 8)
+
+
+def test_week_view_orders_by_first_section():
+    index = ScheduleIndex(_courses())
+
+    view = index.week_view(8)
+
+    assert [course.name for course in view[1]] == ["高等数学", "体育", "大学英语"]
+    assert view[3] == []
+    assert [course.name for course in view[5]] == ["讲座"]
+
+
+def test_conflicts_need_shared_day_week_and_section():
+    index = ScheduleIndex(_courses())
+
+    assert [(a.name, b.name) for a, b in index.conflicts()] == [
+        ("高等数学", "体育"),
+        ("大学英语", "体育"),
+    ]
@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src.client import GSAUClient
+from src.session_store import SessionStore, atomic_write_text
+
+
+def test_atomic_write_replaces_file_without_leftovers(tmp_path):
+    target = tmp_path / "nested" / "session"
+
+    atomic_write_text(target, "first")
+    atomic_write_text(target, "second")
+
+    assert target.read_text(encoding="utf-8") == "second"
+    assert sorted(path.name for path in target.parent.iterdir()) == ["session"]
+
+
+def test_read_returns_none_for_partial_or_missing_file(tmp_path):
+    store = SessionStore(tmp_path / "session")
+    assert store.read() is None
+
+    store.path.write_text('{"cookies": [', encoding="utf-8")
+    assert store.read() is None
+
+    store.write({"cookies": []})
+    assert store.read() == {"cookies": []}
+
+
+def test_lock_excludes_other_holders(tmp_path):
+    first = SessionStore(tmp_path / "session")
+    second = SessionStore(tmp_path / "session", lock_timeout=0.1)
+
+    with first.lock():
+        with pytest.raises(TimeoutError):
+            second.acquire()
+
+    with second.lock():
+        pass
+
+
+def test_waiting_login_reuses_cookies_from_concurrent_login(monkeypatch, tmp_path):
+    session_file = tmp_path / "session"
+    monkeypatch.setenv("GSAU_SESSION_FILE", str(session_file))
+    monkeypatch.setattr(
+        GSAUClient, "_resolve_credentials", lambda self: ("20240001", "secret")
+    )
+    cas_logins = []
+    first_entered = threading.Event()
+
+    def fake_cas_login(self, username, password):
+        cas_logins.append(username)
+        first_entered.set()
+        time.sleep(0.2)
+        self.session.cookies.set("CASTGC", "ticket", domain="authserver.gsau.edu.cn")
+        self._logged_in = True
+        self._login_generation += 1
+        self._username = username
+        self._save_session()
+        return True
+
+    monkeypatch.setattr(GSAUClient, "_cas_login", fake_cas_login)
+
+    first = GSAUClient(prompt=False)
+    second = GSAUClient(prompt=False)
+    results = {}
+
+    thread = threading.Thread(target=lambda: results.update(first=first.login()))
+    thread.start()
+    first_entered.wait(timeout=5)
+    results["second"] = second.login()
+    thread.join()
+
+    assert results == {"first": True, "second": True}
+    assert cas_logins == ["20240001"]
+    assert second.session.cookies.get("CASTGC") == "ticket"
+    saved = json.loads(session_file.read_text(encoding="utf-8"))
+    assert saved["cookies"][0]["name"] == "CASTGC"
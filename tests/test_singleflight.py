@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src import grades
+from src.singleflight import AsyncSingleFlight, SingleFlight
+
+GRADE_HTML = """
+<table>
+  <tr><th>课程名称</th><th>成绩</th></tr>
+  <tr><td>Linear Algebra</td><td>95</td></tr>
+</table>
+"""
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.encoding = None
+
+
+class SlowClient:
+    def __init__(self, delay=0.1):
+        self.flights = SingleFlight()
+        self.delay = delay
+        self.posts = []
+        self._lock = threading.Lock()
+
+    def _account_key(self):
+        return "20240001"
+
+    def post(self, url, data=None):
+        with self._lock:
+            self.posts.append(dict(data))
+        time.sleep(self.delay)
+        return FakeResponse(GRADE_HTML)
+
+
+def _run_concurrently(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_shares_one_call_and_propagates_errors():
+    flights = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results = _run_concurrently(5, lambda: flights.do("key", slow))
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+
+    def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("key", failing)
+    assert flights.do("key", lambda: "again") == "again"
+
+
+def test_concurrent_identical_get_grades_share_one_post():
+    client = SlowClient()
+
+    results = _run_concurrently(
+        4, lambda: grades.get_grades(client, year="2024-2025", term="1")
+    )
+
+    assert len(client.posts) == 1
+    assert all(result is results[0] for result in results)
+    assert results[0][0].course_name == "Linear Algebra"
+
+
+def test_different_payloads_are_not_coalesced():
+    client = SlowClient(delay=0.05)
+    years = iter(["2023-2024", "2024-2025"])
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            year = next(years)
+        return grades.get_grades(client, year=year, term="1")
+
+    _run_concurrently(2, fetch)
+
+    assert sorted(post["kksj"] for post in client.posts) == [
+        "2023-2024-1",
+        "2024-2025-1",
+    ]
+
+
+def test_async_single_flight_shares_one_task():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(flights.do("key", slow) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(calls) == 1
@@ -0,0 +1,158 @@
+import sqlite3
+
+from src.models import (  # type: ignore[reportMissingImports]
+    Course,
+    Grade,
+    GradeDetail,
+    ProofRecord,
+    ProofTemplate,
+    Term,
+)
+from src.store import LocalStore  # type: ignore[reportMissingImports]
+
+
+def _grade(name, score, year="2024-2025", term="1", detail_url=None):
+    raw = {"课程名称": name, "成绩": score}
+    if detail_url:
+        raw["detail_url"] = detail_url
+    return Grade(name, score, 3.0, 4.0, year, term, raw)
+
+
+def test_grades_round_trip_and_filter_by_scope_and_name(tmp_path):
+    store = LocalStore(tmp_path / "store.sqlite3")
+    store.save_grades(
+        "u1",
+        [_grade("高等数学", "90", detail_url="/d?id=1"), _grade("大学英语", "80")],
+        "2024-2025",
+        "1",
+    )
+    store.save_grades("u1", [_grade("线性代数", "85", term="2")], "2024-2025", "2")
+
+    assert [grade.course_name for grade in store.grades("u1")] == [
+        "高等数学",
+        "大学英语",
+        "线性代数",
+    ]
+    first = store.grades("u1", "2024-2025", "1")[0]
+    assert first == _grade("高等数学", "90", detail_url="/d?id=1")
+    assert [grade.course_name for grade in store.grades("u1", course_name="英语")] == [
+        "大学英语"
+    ]
+    assert store.grades("u2") == []
+
+
+def test_save_grades_replaces_scope_unless_filtered(tmp_path):
+    store = LocalStore(tmp_path / "store.sqlite3")
+    store.save_grades(
+        "u1", [_grade("高等数学", ""), _grade("大学英语", "80")], "2024-2025", "1"
+    )
+
+    store.save_grades("u1", [_grade("高等数学", "92")], "2024-2025", "1", replace=False)
+    assert [(grade.course_name, grade.score) for grade in store.grades("u1")] == [
+        ("高等数学", "92"),
+        ("大学英语", "80"),
+    ]
+
+    store.save_grades("u1", [_grade("体育", "85")], "2024-2025", "1")
+    assert [grade.course_name for grade in store.grades("u1")] == ["体育"]
+
+
+def test_schedule_terms_and_proofs_round_trip(tmp_path):
+    store = LocalStore(tmp_path / "store.sqlite3")
+    course = Course(
+        "高等数学", "张老师", "A101", "星期一", ["1-2节"], ["1-16"], "08:00"
+    )
+    terms = [Term("2024-2025", "1", "2024-2025-1"), Term("2024-2025", "2")]
+    template = ProofTemplate("在校证明", "M1", "/print", {"id": "M1"})
+    record = ProofRecord("在校证明", "2024-09-01", download_url="/dl", raw={"k": "v"})
+
+    store.save_schedule("u1", "2024-2025", "01", [course])
+    store.save_terms("u1", terms)
+    store.save_proof_templates("u1", [template])
+    store.save_proof_records("u1", [record])
+
+    assert store.schedule("u1", "2024-2025", "1") == [course]
+    assert store.schedule("u1", "2024-2025", "2") == []
+    assert store.terms("u1") == terms
+    assert store.proof_templates("u1") == [template]
+    assert store.proof_records("u1") == [record]
+
+
+def test_grade_details_and_clear(tmp_path):
+    path = tmp_path / "store.sqlite3"
+    store = LocalStore(path)
+    store.save_grade_detail(
+        "u1", "2024-2025", "1", GradeDetail("高等数学", {"平时": "90"}, "<html>")
+    )
+    store.save_grades("u2", [_grade("高等数学", "90")])
+
+    reopened = LocalStore(path)
+    assert reopened.grade_details("u1", "2024-2025", "1", "高等数学") == [
+        GradeDetail("高等数学", {"平时": "90"})
+    ]
+
+    reopened.clear("u1")
+    assert reopened.grade_details("u1") == []
+    assert len(reopened.grades("u2")) == 1
+    reopened.clear()
+    assert reopened.grades("u2") == []
+
+
+def test_schedules_for_a_term_across_accounts(tmp_path):
+    store = LocalStore(tmp_path / "store.sqlite3")
+    course = Course("高等数学", day="1", sections=["1-2"], weeks=["1-16"])
+    store.save_schedule("s2", "2024-2025", "1", [course])
+    store.save_schedule("s1", "2024-2025", "1", [])
+    store.save_schedule("s3", "2024-2025", "2", [course])
+
+    assert store.schedules("2024-2025", "1") == {"s2": [course]}
+
+
+def test_rows_sharing_a_course_are_all_kept(tmp_path):
+    store = LocalStore(tmp_path / "store.sqlite3")
+    store.save_grades(
+        "u1",
+        [_grade("体育", "55"), _grade("体育", "72"), _grade("高等数学", "90")],
+        "2024-2025",
+        "1",
+    )
+
+    assert [grade.score for grade in store.grades("u1", "2024-2025", "1")] == [
+        "55",
+        "72",
+        "90",
+    ]
+
+    store.save_grades(
+        "u1",
+        [_grade("体育", "60"), _grade("体育", "72"), _grade("物理", "70")],
+        "2024-2025",
+        "1",
+        replace=False,
+    )
+
+    assert [
+        (grade.course_name, grade.score) for grade in store.grades("u1", "2024-2025")
+    ] == [("体育", "60"), ("体育", "72"), ("高等数学", "90"), ("物理", "70")]
+    assert [grade.score for grade in store.grades("u1", course_name="体育")] == [
+        "60",
+        "72",
+    ]
+
+
+def test_older_grades_layout_is_rebuilt(tmp_path):
+    path = tmp_path / "store.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE grades (account TEXT, year TEXT, term TEXT, course_name TEXT, "
+        "detail_url TEXT, position INTEGER, score TEXT, credits REAL, "
+        "grade_point REAL, raw TEXT, "
+        "PRIMARY KEY (account, year, term, course_name, detail_url))"
+    )
+    conn.commit()
+    conn.close()
+
+    store = LocalStore(path)
+    store.save_grades("u1", [_grade("体育", "55"), _grade("体育", "72")])
+
+    assert len(store.grades("u1")) == 2